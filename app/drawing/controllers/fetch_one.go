@@ -4,12 +4,181 @@ import (
 	"github.com/labstack/echo/v4"
 	"net/http"
 	"strconv"
+	"strings"
+	"time"
 
+	"api/app/drawing/processing"
 	"api/app/drawing/store"
+	"api/app/drawing/types"
 )
 
+// The fields ?fields= can ask for, "state" only being available that way
+var drawingFields = []string{"id", "featured", "originalPoints", "drawVectors", "createdAt", "lastDrawVectorCalculatedAt", "state"}
+
+// The longest ?wait= in seconds
+const maxWait = 30
+
+// fieldSet has bit i set when drawingFields[i] was asked for.
+type fieldSet uint
+
+func (fields fieldSet) has(field string) bool {
+	for i, name := range drawingFields {
+		if name == field {
+			return fields&(1<<uint(i)) != 0
+		}
+	}
+
+	return false
+}
+
+// FetchOne answers GET /drawing/:id with the whole drawing, or with the
+// fields listed in ?fields= (only the vectors, say, while waiting for them).
+// With ?wait=N it holds on for up to N seconds until the drawing is processed.
+// Its ETag changes when the drawing is processed or changes state, so a poll
+// sending it back in If-None-Match is answered 304 Not Modified without
+// reading the points or vectors.
 func FetchOne(c echo.Context) error {
 	id, _ := strconv.Atoi(c.Param("id"))
+	fields, fieldsOk := parseFields(c.QueryParam("fields"))
+	wait, waitOk := parseWait(c.QueryParam("wait"))
+
+	if !fieldsOk || !waitOk {
+		return echo.NewHTTPError(http.StatusBadRequest, "The request is not properly formatted.")
+	}
+
+	drawingStore := store.New()
+	metadata, found := drawingStore.GetMetadata(id)
+
+	if !found {
+		return echo.NewHTTPError(http.StatusNotFound, "This drawing doesn't exist.")
+	}
+
+	if wait > 0 && !isFinished(metadata.State) {
+		processing.WaitUntilProcessed(id, wait)
+		metadata, _ = drawingStore.GetMetadata(id)
+	}
+
+	etag := drawingETag(metadata, fields)
+	c.Response().Header().Set("ETag", etag)
+	c.Response().Header().Set("Cache-Control", "no-cache")
+
+	if etagMatches(c.Request().Header.Get("If-None-Match"), etag) {
+		return c.NoContent(http.StatusNotModified)
+	}
+
+	if c.QueryParam("fields") == "" {
+		return c.JSON(http.StatusOK, drawingStore.Get(id))
+	}
+
+	return c.JSON(http.StatusOK, buildPartialDrawing(drawingStore, metadata, fields))
+}
+
+func parseFields(param string) (fieldSet, bool) {
+	if param == "" {
+		return 1<<uint(len(drawingFields)) - 1, true
+	}
+
+	var fields fieldSet
+
+	for _, field := range strings.Split(param, ",") {
+		known := false
+
+		for i, name := range drawingFields {
+			if name == strings.TrimSpace(field) {
+				fields |= 1 << uint(i)
+				known = true
+			}
+		}
+
+		if !known {
+			return 0, false
+		}
+	}
+
+	return fields, true
+}
+
+func parseWait(param string) (time.Duration, bool) {
+	if param == "" {
+		return 0, true
+	}
+
+	seconds, err := strconv.Atoi(param)
+
+	if err != nil || seconds < 0 {
+		return 0, false
+	}
+
+	if seconds > maxWait {
+		seconds = maxWait
+	}
+
+	return time.Duration(seconds) * time.Second, true
+}
+
+func isFinished(state string) bool {
+	return state == types.StateDone || state == types.StateFailed
+}
+
+// drawingETag is keyed on everything a response can show that changes: the
+// vectors, through lastDrawVectorCalculatedAt, and the state. The fields are
+// part of it as every selection is a different representation.
+func drawingETag(metadata types.DrawingMetadata, fields fieldSet) string {
+	calculatedAt := time.Time(metadata.LastDrawVectorCalculatedAt)
+	var calculated int64
+
+	if !calculatedAt.IsZero() {
+		calculated = calculatedAt.Unix()
+	}
+
+	return `"` + strconv.Itoa(metadata.Id) + "-" + strconv.FormatInt(calculated, 10) + "-" + metadata.State + "-" + strconv.FormatUint(uint64(fields), 16) + `"`
+}
+
+// etagMatches reads If-None-Match: "*" or a list of tags, weak or not.
+func etagMatches(ifNoneMatch string, etag string) bool {
+	for _, tag := range strings.Split(ifNoneMatch, ",") {
+		tag = strings.TrimPrefix(strings.TrimSpace(tag), "W/")
+
+		if tag == "*" || tag == etag {
+			return true
+		}
+	}
+
+	return false
+}
+
+func buildPartialDrawing(drawingStore store.Store, metadata types.DrawingMetadata, fields fieldSet) types.PartialDrawing {
+	drawing := types.PartialDrawing{}
+
+	if fields.has("id") {
+		drawing.Id = &metadata.Id
+	}
+
+	if fields.has("featured") {
+		drawing.Featured = &metadata.Featured
+	}
+
+	if fields.has("originalPoints") {
+		points := drawingStore.GetPoints(metadata.Id)
+		drawing.OriginalPoints = &points
+	}
+
+	if fields.has("drawVectors") {
+		vectors := drawingStore.GetVectors(metadata.Id)
+		drawing.DrawVectors = &vectors
+	}
+
+	if fields.has("createdAt") {
+		drawing.CreatedAt = &metadata.CreatedAt
+	}
+
+	if fields.has("lastDrawVectorCalculatedAt") {
+		drawing.LastDrawVectorCalculatedAt = &metadata.LastDrawVectorCalculatedAt
+	}
+
+	if fields.has("state") {
+		drawing.State = &metadata.State
+	}
 
-	return c.JSON(http.StatusOK, store.New().Get(id))
+	return drawing
 }
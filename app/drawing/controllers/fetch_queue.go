@@ -0,0 +1,16 @@
+package controllers
+
+import (
+	"github.com/labstack/echo/v4"
+	"net/http"
+
+	"api/app/drawing/processing"
+	"api/app/drawing/store"
+)
+
+func FetchQueue(c echo.Context) error {
+	stats := store.New().GetQueueStats()
+	stats.Workers = processing.WorkerCount()
+
+	return c.JSON(http.StatusOK, stats)
+}
@@ -0,0 +1,17 @@
+package controllers
+
+import (
+	"github.com/labstack/echo/v4"
+	"net/http"
+	"strconv"
+
+	"api/app/drawing/store"
+)
+
+// FetchStatus answers where a drawing is in the queue without reading its
+// points or vectors, for clients waiting for it to be processed.
+func FetchStatus(c echo.Context) error {
+	id, _ := strconv.Atoi(c.Param("id"))
+
+	return c.JSON(http.StatusOK, store.New().GetStatus(id))
+}
@@ -13,10 +13,19 @@ func Submit(c echo.Context) error {
 	points, _ := c.Get("points").([]types.OriginalPoint)
 	maxVectors, _ := c.Get("maxVectors").(int)
 
-	id := store.New().Create(points)
+	drawingStore := store.New()
+	hash := store.PointsHash(points, maxVectors)
 
-	// Pass max vectors parameter to the processing system
-	processing.AddToQueueWithOptions(id, maxVectors)
+	// An identical drawing was submitted before, its vectors are or will be the
+	// same. Should it have failed, it gets another go.
+	if id, found := drawingStore.FindByHashes([]string{hash})[hash]; found {
+		processing.Wake(drawingStore.RequeueFailed([]int{id}))
+
+		return c.JSON(http.StatusOK, Response{id})
+	}
+
+	id := drawingStore.Create(points, hash, maxVectors)
+	processing.Wake(1)
 
 	return c.JSON(http.StatusOK, Response{id})
 }
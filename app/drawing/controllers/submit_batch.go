@@ -0,0 +1,73 @@
+package controllers
+
+import (
+	"github.com/labstack/echo/v4"
+	"net/http"
+
+	"api/app/drawing/processing"
+	"api/app/drawing/store"
+	"api/app/drawing/types"
+)
+
+// SubmitBatch only stores and queues the drawings that were never submitted
+// before, duplicates (including ones within the batch) get the existing id.
+// Duplicates of failed drawings queue those again.
+func SubmitBatch(c echo.Context) error {
+	drawings, _ := c.Get("drawings").([]types.SubmitInput)
+
+	drawingStore := store.New()
+	hashes := make([]string, len(drawings))
+
+	for i, drawing := range drawings {
+		hashes[i] = store.PointsHash(drawing.Points, drawing.MaxVectors)
+	}
+
+	existing := drawingStore.FindByHashes(hashes)
+	existingIds := []int{}
+
+	for _, id := range existing {
+		existingIds = append(existingIds, id)
+	}
+
+	processing.Wake(drawingStore.RequeueFailed(existingIds))
+
+	newDrawings := map[string]int{}
+	points := [][]types.OriginalPoint{}
+	newHashes := []string{}
+	maxVectors := []int{}
+
+	for i, hash := range hashes {
+		if _, found := existing[hash]; found {
+			continue
+		}
+
+		if _, found := newDrawings[hash]; found {
+			continue
+		}
+
+		newDrawings[hash] = i
+		points = append(points, drawings[i].Points)
+		newHashes = append(newHashes, hash)
+		maxVectors = append(maxVectors, drawings[i].MaxVectors)
+	}
+
+	if len(points) > 0 {
+		for i, id := range drawingStore.CreateMany(points, newHashes, maxVectors) {
+			existing[newHashes[i]] = id
+		}
+
+		processing.Wake(len(points))
+	}
+
+	ids := make([]int, len(drawings))
+
+	for i, hash := range hashes {
+		ids[i] = existing[hash]
+	}
+
+	return c.JSON(http.StatusOK, BatchResponse{ids})
+}
+
+type BatchResponse struct {
+	Ids []int `json:"ids"`
+}
@@ -0,0 +1,72 @@
+package middleware
+
+import (
+	"fmt"
+	"github.com/labstack/echo/v4"
+	"mime"
+	"net/http"
+
+	"api/app/drawing/types"
+	"api/app/drawing/wire"
+	apphttp "api/app/http"
+)
+
+const maxBatchSize = 1000
+
+func BatchIsValid(next echo.HandlerFunc) echo.HandlerFunc {
+	return func(c echo.Context) error {
+		batch := &types.BatchSubmitInput{}
+		err := buildBatchInput(c, batch)
+
+		if err == apphttp.ErrBodyTooLarge {
+			return echo.NewHTTPError(http.StatusRequestEntityTooLarge, "The request body is too large.")
+		}
+
+		if (err != nil) || (batch.Drawings == nil) {
+			return echo.NewHTTPError(http.StatusBadRequest, "The request is not properly formatted.")
+		}
+
+		if len(batch.Drawings) == 0 {
+			return echo.NewHTTPError(http.StatusBadRequest, "There needs to be at least 1 drawing.")
+		}
+
+		if len(batch.Drawings) > maxBatchSize {
+			return echo.NewHTTPError(http.StatusBadRequest, fmt.Sprintf("A batch can contain at most %d drawings.", maxBatchSize))
+		}
+
+		for i := range batch.Drawings {
+			if batch.Drawings[i].Points == nil {
+				return echo.NewHTTPError(http.StatusBadRequest, "The request is not properly formatted.")
+			}
+
+			if message := validateSubmitInput(&batch.Drawings[i]); message != "" {
+				return echo.NewHTTPError(http.StatusBadRequest, fmt.Sprintf("Drawing %d: %s", i, message))
+			}
+		}
+
+		c.Set("drawings", batch.Drawings)
+
+		return next(c)
+	}
+}
+
+func buildBatchInput(c echo.Context, batch *types.BatchSubmitInput) error {
+	mediaType, _, _ := mime.ParseMediaType(c.Request().Header.Get(echo.HeaderContentType))
+
+	switch mediaType {
+	case wire.ColumnsContentType, wire.BinaryContentType:
+		body, err := apphttp.ReadBody(c)
+
+		if err != nil {
+			return err
+		}
+
+		if mediaType == wire.ColumnsContentType {
+			return wire.DecodeColumnsBatch(body, batch)
+		}
+
+		return wire.DecodeBinaryBatch(body, batch)
+	default:
+		return apphttp.BuildJson(c, batch)
+	}
+}
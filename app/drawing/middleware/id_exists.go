@@ -8,18 +8,26 @@ import (
 	"api/app/drawing/store"
 )
 
-func IdExists(next echo.HandlerFunc) echo.HandlerFunc {
+// IdIsValid rejects a request whose :id is not an integer, leaving it to the
+// handler to find out whether the drawing exists.
+func IdIsValid(next echo.HandlerFunc) echo.HandlerFunc {
 	return func(c echo.Context) error {
-		id, err := strconv.Atoi(c.Param("id"))
-
-		if err != nil {
+		if _, err := strconv.Atoi(c.Param("id")); err != nil {
 			return echo.NewHTTPError(http.StatusBadRequest, "The request is not properly formatted.")
 		}
 
+		return next(c)
+	}
+}
+
+func IdExists(next echo.HandlerFunc) echo.HandlerFunc {
+	return IdIsValid(func(c echo.Context) error {
+		id, _ := strconv.Atoi(c.Param("id"))
+
 		if store.New().Exists(id) != true {
 			return echo.NewHTTPError(http.StatusNotFound, "This drawing doesn't exist.")
 		}
 
 		return next(c)
-	}
+	})
 }
@@ -2,45 +2,89 @@ package middleware
 
 import (
 	"github.com/labstack/echo/v4"
+	"mime"
 	"net/http"
 
+	"api/app/drawing/store/blob"
 	"api/app/drawing/types"
+	"api/app/drawing/wire"
 	apphttp "api/app/http"
 )
 
 func SubmissionIsValid(next echo.HandlerFunc) echo.HandlerFunc {
 	return func(c echo.Context) error {
 		input := &types.SubmitInput{}
-		err := apphttp.BuildJson(c, input)
+		err := buildSubmitInput(c, input)
+
+		if err == apphttp.ErrBodyTooLarge {
+			return echo.NewHTTPError(http.StatusRequestEntityTooLarge, "The request body is too large.")
+		}
 
 		if (err != nil) || (input.Points == nil) {
 			return echo.NewHTTPError(http.StatusBadRequest, "The request is not properly formatted.")
 		}
 
-		if len(input.Points) == 0 {
-			return echo.NewHTTPError(http.StatusBadRequest, "There needs to be at least 1 point.")
+		if message := validateSubmitInput(input); message != "" {
+			return echo.NewHTTPError(http.StatusBadRequest, message)
 		}
 
-		if input.Points[0].Time != 0 {
-			return echo.NewHTTPError(http.StatusBadRequest, "The first point's time must be zero.")
-		}
+		c.Set("points", input.Points)
+		c.Set("maxVectors", input.MaxVectors)
+
+		return next(c)
+	}
+}
+
+// buildSubmitInput decodes the body according to its content type. Anything
+// that isn't one of the compact wire formats is treated as JSON.
+func buildSubmitInput(c echo.Context, input *types.SubmitInput) error {
+	mediaType, _, _ := mime.ParseMediaType(c.Request().Header.Get(echo.HeaderContentType))
 
-		if pointsAreSequential(input.Points) == false {
-			return echo.NewHTTPError(http.StatusBadRequest, "Each point's time should be equal to or greater than the previous point.")
+	switch mediaType {
+	case wire.ColumnsContentType, wire.BinaryContentType:
+		body, err := apphttp.ReadBody(c)
+
+		if err != nil {
+			return err
 		}
 
-		// Set default for maxVectors if not provided or invalid
-		if input.MaxVectors <= 0 {
-			input.MaxVectors = 100 // Default to 100 vectors
-		} else if input.MaxVectors > 500 {
-			input.MaxVectors = 500 // Cap at 500 vectors for performance reasons
+		if mediaType == wire.ColumnsContentType {
+			return wire.DecodeColumns(body, input)
 		}
 
-		c.Set("points", input.Points)
-		c.Set("maxVectors", input.MaxVectors)
+		return wire.DecodeBinary(body, input)
+	default:
+		return apphttp.BuildJson(c, input)
+	}
+}
 
-		return next(c)
+// validateSubmitInput returns the reason a decoded drawing is rejected, or ""
+// when it is valid. It also applies the maxVectors default and cap.
+func validateSubmitInput(input *types.SubmitInput) string {
+	if len(input.Points) == 0 {
+		return "There needs to be at least 1 point."
 	}
+
+	if input.Points[0].Time != 0 {
+		return "The first point's time must be zero."
+	}
+
+	if pointsAreSequential(input.Points) == false {
+		return "Each point's time should be equal to or greater than the previous point."
+	}
+
+	if pointsAreInRange(input.Points) == false {
+		return "Each point's x and y must be between -2147483648 and 2147483647."
+	}
+
+	// Set default for maxVectors if not provided or invalid
+	if input.MaxVectors <= 0 {
+		input.MaxVectors = 100 // Default to 100 vectors
+	} else if input.MaxVectors > 500 {
+		input.MaxVectors = 500 // Cap at 500 vectors for performance reasons
+	}
+
+	return ""
 }
 
 func pointsAreSequential(points []types.OriginalPoint) bool {
@@ -56,3 +100,13 @@ func pointsAreSequential(points []types.OriginalPoint) bool {
 
 	return true
 }
+
+func pointsAreInRange(points []types.OriginalPoint) bool {
+	for _, point := range points {
+		if !blob.PointInRange(point) {
+			return false
+		}
+	}
+
+	return true
+}
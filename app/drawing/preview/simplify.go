@@ -0,0 +1,99 @@
+package preview
+
+import (
+	"container/heap"
+	"math"
+	"sort"
+
+	"api/app/drawing/types"
+)
+
+// simplify returns the indexes, in order, of the points a preview keeps: the
+// first and the last point, then over and over the point farthest from the
+// path kept so far. That is Ramer-Douglas-Peucker refined one point at a time,
+// so it can stop at a point budget as well as at a distance tolerance.
+func simplify(points []types.OriginalPoint, maxPoints int, tolerance float64) []int {
+	if len(points) <= 2 || len(points) <= maxPoints {
+		kept := make([]int, len(points))
+
+		for i := range kept {
+			kept[i] = i
+		}
+
+		return kept
+	}
+
+	kept := []int{0, len(points) - 1}
+	segments := &segmentHeap{newSegment(points, 0, len(points)-1)}
+
+	for len(kept) < maxPoints && segments.Len() > 0 {
+		farthest := heap.Pop(segments).(segment)
+
+		if farthest.distanceSquared <= tolerance*tolerance {
+			break
+		}
+
+		kept = append(kept, farthest.farthest)
+
+		for _, part := range []segment{
+			newSegment(points, farthest.first, farthest.farthest),
+			newSegment(points, farthest.farthest, farthest.last),
+		} {
+			if part.last-part.first > 1 {
+				heap.Push(segments, part)
+			}
+		}
+	}
+
+	sort.Ints(kept)
+
+	return kept
+}
+
+// segment is a stretch of the drawing between two kept points, with the point
+// in between that is farthest from the line joining them.
+type segment struct {
+	first           int
+	last            int
+	farthest        int
+	distanceSquared float64
+}
+
+func newSegment(points []types.OriginalPoint, first int, last int) segment {
+	found := segment{first: first, last: last, farthest: first, distanceSquared: -1}
+	ax, ay := float64(points[first].X), float64(points[first].Y)
+	dx, dy := float64(points[last].X)-ax, float64(points[last].Y)-ay
+	lengthSquared := dx*dx + dy*dy
+
+	for i := first + 1; i < last; i++ {
+		px, py := float64(points[i].X)-ax, float64(points[i].Y)-ay
+
+		// Distance to the segment, or to its only point for a closed stroke
+		if lengthSquared > 0 {
+			along := math.Max(0, math.Min(1, (px*dx+py*dy)/lengthSquared))
+			px, py = px-along*dx, py-along*dy
+		}
+
+		if distanceSquared := px*px + py*py; distanceSquared > found.distanceSquared {
+			found.farthest, found.distanceSquared = i, distanceSquared
+		}
+	}
+
+	return found
+}
+
+// segmentHeap pops the segment with the farthest point first.
+type segmentHeap []segment
+
+func (h segmentHeap) Len() int            { return len(h) }
+func (h segmentHeap) Less(i, j int) bool  { return h[i].distanceSquared > h[j].distanceSquared }
+func (h segmentHeap) Swap(i, j int)       { h[i], h[j] = h[j], h[i] }
+func (h *segmentHeap) Push(x interface{}) { *h = append(*h, x.(segment)) }
+
+func (h *segmentHeap) Pop() interface{} {
+	old := *h
+	last := old[len(old)-1]
+	*h = old[:len(old)-1]
+
+	return last
+}
@@ -0,0 +1,39 @@
+package preview
+
+import (
+	"strconv"
+
+	"api/app/drawing/types"
+)
+
+// MaxPoints bounds the points of a gallery preview, whatever the size of the
+// drawing it shows.
+const MaxPoints = 500
+
+// Tolerance is how far, in drawing units, a left out point may be from the
+// simplified path. Below it the preview looks the same as the full drawing.
+const Tolerance = 0.5
+
+// SvgPath builds the "M x y L x y ..." path of a drawing's preview from at
+// most MaxPoints of its points.
+func SvgPath(points []types.OriginalPoint) string {
+	kept := simplify(points, MaxPoints, Tolerance)
+
+	// "L " plus two coordinates of up to 11 characters, each with a trailing space
+	path := make([]byte, 0, len(kept)*26)
+
+	for i, index := range kept {
+		if i == 0 {
+			path = append(path, "M "...)
+		} else {
+			path = append(path, "L "...)
+		}
+
+		path = strconv.AppendInt(path, int64(points[index].X), 10)
+		path = append(path, ' ')
+		path = strconv.AppendInt(path, int64(points[index].Y), 10)
+		path = append(path, ' ')
+	}
+
+	return string(path)
+}
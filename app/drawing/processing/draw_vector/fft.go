@@ -0,0 +1,71 @@
+package draw_vector
+
+import (
+	"math"
+	"math/cmplx"
+)
+
+// fft returns the discrete Fourier transform of values, the sum over k of
+// values[k] * e^(-2*pi*i*j*k/N) for every j. It is a mixed radix Cooley-Tukey
+// transform, so any length works: the 1000 samples of a drawing split into
+// radix 2 and radix 5 passes.
+func fft(values []complex128) []complex128 {
+	count := len(values)
+	roots := make([]complex128, count)
+
+	for k := 0; k < count; k++ {
+		roots[k] = cmplx.Rect(1, -2.0*math.Pi*float64(k)/float64(count))
+	}
+
+	return transform(values, 0, 1, count, roots)
+}
+
+// transform computes the length count transform of values[offset],
+// values[offset+stride], ... where roots holds the len(roots)-th roots of unity.
+func transform(values []complex128, offset, stride, count int, roots []complex128) []complex128 {
+	result := make([]complex128, count)
+
+	if count == 1 {
+		result[0] = values[offset]
+
+		return result
+	}
+
+	radix := smallestFactor(count)
+	rootStep := len(roots) / count
+
+	if radix == count {
+		for j := 0; j < count; j++ {
+			for k := 0; k < count; k++ {
+				result[j] += values[offset+k*stride] * roots[(j*k%count)*rootStep]
+			}
+		}
+
+		return result
+	}
+
+	partLength := count / radix
+	parts := make([][]complex128, radix)
+
+	for r := 0; r < radix; r++ {
+		parts[r] = transform(values, offset+r*stride, stride*radix, partLength, roots)
+	}
+
+	for j := 0; j < count; j++ {
+		for r := 0; r < radix; r++ {
+			result[j] += parts[r][j%partLength] * roots[(r*j%count)*rootStep]
+		}
+	}
+
+	return result
+}
+
+func smallestFactor(n int) int {
+	for factor := 2; factor*factor <= n; factor++ {
+		if n%factor == 0 {
+			return factor
+		}
+	}
+
+	return n
+}
@@ -0,0 +1,86 @@
+package draw_vector
+
+import (
+	"math"
+	"math/cmplx"
+
+	"api/app/drawing/types"
+)
+
+// reconstruction keeps the series built so far evaluated at every original
+// point, so adding a vector costs one pass over the points instead of
+// re-evaluating every vector added before it.
+type reconstruction struct {
+	originalPoints []types.OriginalPoint
+	estimates      []complex128
+	// turns[i] is e^(2*pi*i*t) at original point i, powers[i] its power-th power
+	turns  []complex128
+	powers []complex128
+	power  int
+}
+
+func newReconstruction(originalPoints []types.OriginalPoint) *reconstruction {
+	turns := make([]complex128, len(originalPoints))
+	powers := make([]complex128, len(originalPoints))
+
+	for i, original := range originalPoints {
+		turns[i] = cmplx.Exp(complex(0.00, 2.00*math.Pi*original.Time))
+		powers[i] = 1
+	}
+
+	return &reconstruction{
+		originalPoints: originalPoints,
+		estimates:      make([]complex128, len(originalPoints)),
+		turns:          turns,
+		powers:         powers,
+	}
+}
+
+// add adds the vector to every estimate and returns the new average distance
+// between the estimates and the original points.
+func (reconstruction *reconstruction) add(vector types.DrawVector) float64 {
+	reconstruction.advance(abs(vector.N))
+
+	c := complex(vector.Real, vector.Imaginary)
+	distance := 0.00
+
+	for i, original := range reconstruction.originalPoints {
+		rotation := reconstruction.powers[i]
+
+		// e^(-n*2*pi*i*t) is the conjugate of e^(n*2*pi*i*t)
+		if vector.N < 0 {
+			rotation = cmplx.Conj(rotation)
+		}
+
+		reconstruction.estimates[i] += c * rotation
+		distance += cmplx.Abs(reconstruction.estimates[i] - complex(float64(original.X), float64(original.Y)))
+	}
+
+	return distance / float64(len(reconstruction.originalPoints))
+}
+
+// advance moves the powers to n. getNextN only ever asks for the same n or the
+// next one, which is a single multiplication per point.
+func (reconstruction *reconstruction) advance(n int) {
+	if n == reconstruction.power {
+		return
+	}
+
+	for i, original := range reconstruction.originalPoints {
+		if n == reconstruction.power+1 {
+			reconstruction.powers[i] *= reconstruction.turns[i]
+		} else {
+			reconstruction.powers[i] = cmplx.Exp(complex(0.00, float64(n)*2.00*math.Pi*original.Time))
+		}
+	}
+
+	reconstruction.power = n
+}
+
+func abs(n int) int {
+	if n < 0 {
+		return -n
+	}
+
+	return n
+}
@@ -1,22 +1,46 @@
 package draw_vector
 
 import (
-	"math"
-	"math/cmplx"
-
 	"api/app/drawing/types"
 )
 
+// Progress describes the series after a vector was added to it.
+type Progress struct {
+	N               int
+	Vectors         int
+	AverageDistance float64
+}
+
+// ProgressReporter receives a Progress after every vector BuildSeries adds.
+type ProgressReporter func(Progress)
+
 func BuildSeries(originalPoints []types.OriginalPoint, maxVectors int) []types.DrawVector {
+	return BuildSeriesWithProgress(originalPoints, maxVectors, nil)
+}
+
+// BuildSeriesWithProgress adds vectors in getNextN order until there are
+// maxVectors of them or their average distance to the original points is
+// below 1, reporting each step to report when it is not nil.
+func BuildSeriesWithProgress(originalPoints []types.OriginalPoint, maxVectors int, report ProgressReporter) []types.DrawVector {
 	n := 0
 	vectors := []types.DrawVector{}
-	vectorBuilder := VectorBuilder{}
+	vectorBuilder := NewVectorBuilder(originalPoints)
+	reconstruction := newReconstruction(originalPoints)
 
-	for (len(vectors) < maxVectors) && !vectorsAproximateOriginal(vectors, originalPoints) {
-		vectors = append(vectors, vectorBuilder.Build(n, originalPoints))
+	for len(vectors) < maxVectors {
+		vector := vectorBuilder.Build(n)
+		vectors = append(vectors, vector)
+		averageDistance := reconstruction.add(vector)
+
+		if report != nil {
+			report(Progress{N: n, Vectors: len(vectors), AverageDistance: averageDistance})
+		}
+
+		if averageDistance < 1 {
+			break
+		}
 
 		n = getNextN(n)
-		print("n: ", n, " len: ", len(vectors), " average distance: ", getAverageDistance(originalPoints, vectors), "\n")
 	}
 
 	return vectors
@@ -29,37 +53,3 @@ func getNextN(n int) int {
 
 	return (-1 * n) + 1
 }
-
-func vectorsAproximateOriginal(vectors []types.DrawVector, originalPoints []types.OriginalPoint) bool {
-	if len(vectors) == 0 {
-		return false
-	}
-
-	averageDistance := getAverageDistance(originalPoints, vectors)
-
-	return averageDistance < 1
-}
-
-func getAverageDistance(originalPoints []types.OriginalPoint, vectors []types.DrawVector) float64 {
-	distance := 0.00
-
-	for i := 0; i < len(originalPoints); i++ {
-		original := originalPoints[i]
-		estimate := calculateOutput(originalPoints[i].Time, vectors)
-		distance += math.Sqrt(math.Pow(real(estimate)-float64(original.X), 2) + math.Pow(imag(estimate)-float64(original.Y), 2))
-	}
-
-	return distance / float64(len(originalPoints))
-}
-
-func calculateOutput(time float64, vectors []types.DrawVector) complex128 {
-	sum := complex(0, 0)
-
-	for _, vector := range vectors {
-		c := complex(vector.Real, vector.Imaginary)
-		power := complex(0.00, float64(vector.N)*2.00*math.Pi*time)
-		sum += c * cmplx.Exp(power)
-	}
-
-	return sum
-}
@@ -1,35 +1,52 @@
 package draw_vector
 
 import (
-	"math"
-	"math/cmplx"
-
 	"api/app/drawing/types"
 	"api/app/util"
 )
 
+const timeDelta = 0.001
+
 type VectorBuilder struct {
 	currentOriginalPointsIndex int
 	originalPoints             []types.OriginalPoint
+	coefficients               []complex128
 }
 
-func (vectorBuilder *VectorBuilder) Build(n int, providedOriginalPoints []types.OriginalPoint) types.DrawVector {
-	vectorBuilder.originalPoints = providedOriginalPoints
-	currentTime := 0.00
-	timeDelta := 0.001
-	vectorBuilder.currentOriginalPointsIndex = 0
-	cumulativeValue := 0 + 0i
-	originalPoint := types.OriginalPoint{}
+// NewVectorBuilder samples the original points on the time grid once and
+// transforms the samples, after which every vector is a lookup.
+func NewVectorBuilder(originalPoints []types.OriginalPoint) *VectorBuilder {
+	vectorBuilder := &VectorBuilder{originalPoints: originalPoints}
+	samples := vectorBuilder.sample()
+	vectorBuilder.coefficients = fft(samples)
 
-	for util.FloatCompare(currentTime, 1.00, 0.0001) < 0 {
-		originalPoint = vectorBuilder.findOriginalPoint(currentTime)
-		originalComplexValue := complex(float64(originalPoint.X), float64(originalPoint.Y))
-		cumulativeValue += originalComplexValue * cmplx.Exp(complex(0.00, float64(-n)*2.0*math.Pi*currentTime)) * complex(timeDelta, 0)
+	for i := range vectorBuilder.coefficients {
+		vectorBuilder.coefficients[i] *= complex(timeDelta, 0)
+	}
+
+	return vectorBuilder
+}
+
+// Build returns the vector for frequency n: the integral of the drawing times
+// e^(-n*2*pi*i*t) over the time grid, which is coefficient n (modulo the
+// sample count) of the transform.
+func (vectorBuilder *VectorBuilder) Build(n int) types.DrawVector {
+	count := len(vectorBuilder.coefficients)
+	coefficient := vectorBuilder.coefficients[((n%count)+count)%count]
+
+	return types.DrawVector{N: n, Real: real(coefficient), Imaginary: imag(coefficient)}
+}
+
+func (vectorBuilder *VectorBuilder) sample() []complex128 {
+	samples := []complex128{}
+	vectorBuilder.currentOriginalPointsIndex = 0
 
-		currentTime += timeDelta
+	for currentTime := 0.00; util.FloatCompare(currentTime, 1.00, 0.0001) < 0; currentTime += timeDelta {
+		originalPoint := vectorBuilder.findOriginalPoint(currentTime)
+		samples = append(samples, complex(float64(originalPoint.X), float64(originalPoint.Y)))
 	}
 
-	return types.DrawVector{N: n, Real: real(cumulativeValue), Imaginary: imag(cumulativeValue)}
+	return samples
 }
 
 func (vectorBuilder *VectorBuilder) findOriginalPoint(time float64) types.OriginalPoint {
@@ -8,21 +8,21 @@ import (
 type OriginalPointsFactory struct{}
 
 func (factory OriginalPointsFactory) Build(drawingId int) []types.OriginalPoint {
-	drawing := factory.getDrawing(drawingId)
-	factory.normalizeTime(drawing.OriginalPoints)
+	originalPoints := factory.getPoints(drawingId)
+	factory.normalizeTime(originalPoints)
 
-	return drawing.OriginalPoints
+	return originalPoints
 }
 
-func (factory OriginalPointsFactory) getDrawing(drawingId int) types.Drawing {
+func (factory OriginalPointsFactory) getPoints(drawingId int) []types.OriginalPoint {
 	store := store.New()
-	drawing := store.Get(drawingId)
+	originalPoints := store.GetPoints(drawingId)
 
-	if drawing.Id == 0 {
+	if len(originalPoints) == 0 {
 		panic("The drawing could not be found in storage.")
 	}
 
-	return drawing
+	return originalPoints
 }
 
 func (factory OriginalPointsFactory) normalizeTime(originalPoints []types.OriginalPoint) {
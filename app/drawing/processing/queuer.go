@@ -1,51 +1,201 @@
 package processing
 
-type ProcessingOptions struct {
-	DrawingId  int
-	MaxVectors int
-}
+import (
+	"log"
+	"os"
+	"runtime"
+	"strconv"
+	"sync"
+	"time"
+
+	"api/app/drawing/store"
+	"api/app/drawing/types"
+)
+
+// The queue is the drawings table: a drawing is stored pending, a worker
+// claims it (processing) and stores its vectors (done). Work therefore
+// survives a restart, and several API processes can share one database.
+
+// A drawing whose processing panics this many times is marked failed
+const maxAttempts = 3
+
+// Workers look for pending drawings this often when nothing woke them,
+// picking up retries and drawings queued by other API processes.
+const pollInterval = time.Second
+
+// A failed drawing is not claimed again before this long, times its attempts
+// so far, passed. The worker moves on to other drawings meanwhile.
+const retryDelay = 250 * time.Millisecond
 
-var creationQueue chan ProcessingOptions
-var workQueue chan ProcessingOptions
+// A drawing claimed this long ago is taken for abandoned by an API process
+// that stopped, and put back in the queue. Checked every staleCheckInterval.
+const staleAfter = 10 * time.Minute
+const staleCheckInterval = time.Minute
 
+var prepareOnce sync.Once
+
+// The workers running in this process, started by StartWorkers
+var workers = struct {
+	sync.Mutex
+	count int
+	wake  chan struct{}
+	stop  chan struct{}
+	done  sync.WaitGroup
+}{}
+
+// PrepareQueues starts the workers once per process, however many times it
+// is called. Their number is PROCESSING_WORKERS, or the number of CPUs when
+// it is not set; PROCESSING_WORKERS=0 leaves drawings to other API processes.
 func PrepareQueues() {
-	processorCount := 5
-	creationQueue = make(chan ProcessingOptions)
-	workQueue = make(chan ProcessingOptions, processorCount)
+	prepareOnce.Do(func() {
+		StartWorkers(configuredWorkerCount())
+	})
+}
+
+// StartWorkers starts count workers, unless workers are running already.
+func StartWorkers(count int) {
+	workers.Lock()
+	defer workers.Unlock()
+
+	if workers.count > 0 || count <= 0 {
+		return
+	}
 
-	go processCreationQueue()
+	workers.count = count
+	workers.wake = make(chan struct{}, count)
+	workers.stop = make(chan struct{})
+	workers.done.Add(count + 1)
 
-	for i := 0; i < processorCount; i++ {
-		go processWorkQueue()
+	for i := 0; i < count; i++ {
+		go work(workers.wake, workers.stop)
 	}
+
+	go requeueStale(workers.stop)
 }
 
-func AddToQueue(id int) {
-	// Maintain backward compatibility with default value
-	AddToQueueWithOptions(id, 100)
+// StopWorkers stops the workers once they are done with the drawing they are
+// on, and returns when they all stopped.
+func StopWorkers() {
+	workers.Lock()
+
+	if workers.count == 0 {
+		workers.Unlock()
+		return
+	}
+
+	close(workers.stop)
+	workers.count = 0
+	workers.Unlock()
+
+	workers.done.Wait()
+}
+
+func WorkerCount() int {
+	workers.Lock()
+	defer workers.Unlock()
+
+	return workers.count
+}
+
+// Wake tells up to count idle workers that drawings were just queued, rather
+// than leaving them to find out within pollInterval.
+func Wake(count int) {
+	workers.Lock()
+	defer workers.Unlock()
+
+	for i := 0; i < count && i < workers.count; i++ {
+		select {
+		case workers.wake <- struct{}{}:
+		default:
+			return
+		}
+	}
 }
 
-func AddToQueueWithOptions(id int, maxVectors int) {
-	creationQueue <- ProcessingOptions{
-		DrawingId:  id,
-		MaxVectors: maxVectors,
+func configuredWorkerCount() int {
+	count, err := strconv.Atoi(os.Getenv("PROCESSING_WORKERS"))
+
+	if err != nil || count < 0 {
+		return runtime.NumCPU()
 	}
+
+	return count
 }
 
-func processCreationQueue() {
+// requeueStale puts back whatever a stopped API process, this one or
+// another, was processing.
+func requeueStale(stop chan struct{}) {
+	defer workers.done.Done()
+
 	for {
+		safely(func() {
+			if requeued := store.New().RequeueStale(staleAfter, maxAttempts); requeued > 0 {
+				log.Printf("processing: requeued %d stale drawings", requeued)
+			}
+		})
+
 		select {
-		case options := <-creationQueue:
-			workQueue <- options
+		case <-stop:
+			return
+		case <-time.After(staleCheckInterval):
 		}
 	}
 }
 
-func processWorkQueue() {
+func work(wake chan struct{}, stop chan struct{}) {
+	defer workers.done.Done()
+
 	for {
+		var job types.ProcessingJob
+		var found bool
+
 		select {
-		case options := <-workQueue:
-			Process(options.DrawingId, options.MaxVectors)
+		case <-stop:
+			return
+		default:
 		}
+
+		safely(func() {
+			job, found = store.New().ClaimNext(maxAttempts)
+		})
+
+		if !found {
+			select {
+			case <-stop:
+				return
+			case <-wake:
+			case <-time.After(pollInterval):
+			}
+
+			continue
+		}
+
+		if !safely(func() { Process(job.DrawingId, job.MaxVectors) }) {
+			log.Printf("processing: drawing %d failed, attempt %d of %d", job.DrawingId, job.Attempts, maxAttempts)
+
+			safely(func() {
+				store.New().Retry(job.DrawingId, maxAttempts, retryDelay)
+			})
+
+			if job.Attempts < maxAttempts {
+				continue
+			}
+		}
+
+		notifyProcessed(job.DrawingId)
 	}
 }
+
+// safely runs f, logging instead of dying if it panics, and returns whether
+// it completed.
+func safely(f func()) (completed bool) {
+	defer func() {
+		if recovered := recover(); recovered != nil {
+			log.Printf("processing: %v", recovered)
+		}
+	}()
+
+	f()
+
+	return true
+}
@@ -0,0 +1,88 @@
+package processing
+
+import (
+	"sync"
+	"time"
+
+	"api/app/drawing/store"
+	"api/app/drawing/types"
+)
+
+// waiters holds, for every drawing a request is waiting on, the channels to
+// close once this process's workers are done with it.
+var waiters = struct {
+	sync.Mutex
+	channels map[int][]chan struct{}
+}{channels: map[int][]chan struct{}{}}
+
+// WaitUntilProcessed returns once a drawing is done or failed, or timeout
+// passed. Workers of this process wake it right away; drawings processed by
+// another API process are noticed by checking the store every pollInterval.
+func WaitUntilProcessed(drawingId int, timeout time.Duration) {
+	processed := make(chan struct{})
+
+	waiters.Lock()
+	waiters.channels[drawingId] = append(waiters.channels[drawingId], processed)
+	waiters.Unlock()
+
+	defer stopWaiting(drawingId, processed)
+
+	deadline := time.After(timeout)
+
+	// Checked once right away, for a drawing finished just before we started waiting
+	for check := time.After(0); ; check = time.After(pollInterval) {
+		select {
+		case <-processed:
+			return
+		case <-deadline:
+			return
+		case <-check:
+			if isProcessed(drawingId) {
+				return
+			}
+		}
+	}
+}
+
+func isProcessed(drawingId int) bool {
+	var state string
+
+	safely(func() {
+		metadata, _ := store.New().GetMetadata(drawingId)
+		state = metadata.State
+	})
+
+	return state == types.StateDone || state == types.StateFailed
+}
+
+func stopWaiting(drawingId int, processed chan struct{}) {
+	waiters.Lock()
+	defer waiters.Unlock()
+
+	channels := waiters.channels[drawingId]
+
+	for i, channel := range channels {
+		if channel == processed {
+			channels = append(channels[:i], channels[i+1:]...)
+			break
+		}
+	}
+
+	if len(channels) == 0 {
+		delete(waiters.channels, drawingId)
+	} else {
+		waiters.channels[drawingId] = channels
+	}
+}
+
+// notifyProcessed wakes every request waiting on a drawing.
+func notifyProcessed(drawingId int) {
+	waiters.Lock()
+	defer waiters.Unlock()
+
+	for _, processed := range waiters.channels[drawingId] {
+		close(processed)
+	}
+
+	delete(waiters.channels, drawingId)
+}
@@ -15,7 +15,10 @@ func Register(e *echo.Echo) {
 }
 
 func registerRoutes(e *echo.Echo) {
-	e.GET("drawing/:id", controllers.FetchOne, middleware.IdExists)
+	e.GET("drawing/:id", controllers.FetchOne, middleware.IdIsValid)
+	e.GET("drawing/:id/status", controllers.FetchStatus, middleware.IdExists)
 	e.GET("drawings/recent", controllers.FetchRecent)
+	e.GET("drawings/queue", controllers.FetchQueue)
 	e.POST("drawing", controllers.Submit, middleware.SubmissionIsValid)
+	e.POST("drawings/batch", controllers.SubmitBatch, middleware.BatchIsValid)
 }
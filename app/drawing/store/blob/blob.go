@@ -0,0 +1,100 @@
+package blob
+
+import (
+	"encoding/binary"
+	"errors"
+	"math"
+
+	"api/app/drawing/types"
+)
+
+// How drawings are packed into the points and vectors BLOB columns, every
+// field little-endian and the count implied by the length:
+//
+//	point   time (float64), x (int32), y (int32)
+//	vector  n (int32), real (float64), imaginary (float64)
+const (
+	PointSize  = 8 + 4 + 4
+	VectorSize = 4 + 8 + 8
+)
+
+var ErrCorrupt = errors.New("corrupt drawing column")
+
+// ErrOutOfRange is a point whose x or y does not fit in an int32.
+var ErrOutOfRange = errors.New("point coordinate outside the int32 range")
+
+// PointInRange reports whether a point's coordinates can be stored as they are.
+func PointInRange(point types.OriginalPoint) bool {
+	return point.X >= math.MinInt32 && point.X <= math.MaxInt32 && point.Y >= math.MinInt32 && point.Y <= math.MaxInt32
+}
+
+// EncodePoints returns ErrOutOfRange rather than storing a wrapped coordinate.
+func EncodePoints(points []types.OriginalPoint) ([]byte, error) {
+	encoded := make([]byte, len(points)*PointSize)
+
+	for i, point := range points {
+		if !PointInRange(point) {
+			return nil, ErrOutOfRange
+		}
+
+		record := encoded[i*PointSize:]
+		binary.LittleEndian.PutUint64(record, math.Float64bits(point.Time))
+		binary.LittleEndian.PutUint32(record[8:], uint32(int32(point.X)))
+		binary.LittleEndian.PutUint32(record[12:], uint32(int32(point.Y)))
+	}
+
+	return encoded, nil
+}
+
+func DecodePoints(encoded []byte) ([]types.OriginalPoint, error) {
+	if len(encoded)%PointSize != 0 {
+		return nil, ErrCorrupt
+	}
+
+	points := make([]types.OriginalPoint, len(encoded)/PointSize)
+
+	for i := range points {
+		record := encoded[i*PointSize:]
+		points[i] = types.OriginalPoint{
+			Time: math.Float64frombits(binary.LittleEndian.Uint64(record)),
+			X:    int(int32(binary.LittleEndian.Uint32(record[8:]))),
+			Y:    int(int32(binary.LittleEndian.Uint32(record[12:]))),
+		}
+	}
+
+	return points, nil
+}
+
+func EncodeVectors(vectors []types.DrawVector) []byte {
+	encoded := make([]byte, len(vectors)*VectorSize)
+
+	for i, vector := range vectors {
+		record := encoded[i*VectorSize:]
+		binary.LittleEndian.PutUint32(record, uint32(int32(vector.N)))
+		binary.LittleEndian.PutUint64(record[4:], math.Float64bits(vector.Real))
+		binary.LittleEndian.PutUint64(record[12:], math.Float64bits(vector.Imaginary))
+	}
+
+	return encoded
+}
+
+// DecodeVectors decodes a vectors column, where NULL (a nil slice) is a
+// drawing not processed yet and has no vectors.
+func DecodeVectors(encoded []byte) ([]types.DrawVector, error) {
+	if len(encoded)%VectorSize != 0 {
+		return nil, ErrCorrupt
+	}
+
+	vectors := make([]types.DrawVector, len(encoded)/VectorSize)
+
+	for i := range vectors {
+		record := encoded[i*VectorSize:]
+		vectors[i] = types.DrawVector{
+			N:         int(int32(binary.LittleEndian.Uint32(record))),
+			Real:      math.Float64frombits(binary.LittleEndian.Uint64(record[4:])),
+			Imaginary: math.Float64frombits(binary.LittleEndian.Uint64(record[12:])),
+		}
+	}
+
+	return vectors, nil
+}
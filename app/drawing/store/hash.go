@@ -0,0 +1,37 @@
+package store
+
+import (
+	"crypto/sha256"
+	"encoding/binary"
+	"encoding/hex"
+	"math"
+
+	"api/app/drawing/types"
+)
+
+// PointsHash identifies what processing a drawing computes: its points with
+// their times normalized the way OriginalPointsFactory normalizes them, and
+// maxVectors. Drawings with the same hash get the same vectors.
+func PointsHash(points []types.OriginalPoint, maxVectors int) string {
+	finalTime := points[len(points)-1].Time
+	record := make([]byte, 16)
+	hash := sha256.New()
+
+	binary.LittleEndian.PutUint32(record, uint32(maxVectors))
+	hash.Write(record[:4])
+
+	for _, point := range points {
+		time := point.Time
+
+		if finalTime != 0 {
+			time = time / finalTime
+		}
+
+		binary.LittleEndian.PutUint64(record[0:], math.Float64bits(time))
+		binary.LittleEndian.PutUint32(record[8:], uint32(int32(point.X)))
+		binary.LittleEndian.PutUint32(record[12:], uint32(int32(point.Y)))
+		hash.Write(record)
+	}
+
+	return hex.EncodeToString(hash.Sum(nil))
+}
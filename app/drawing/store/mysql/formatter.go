@@ -1,67 +1,72 @@
 package mysql
 
 import (
-	"encoding/json"
-	"fmt"
-	"strings"
 	"time"
 
+	"api/app/drawing/store/blob"
 	"api/app/drawing/types"
 	"api/app/formatting"
 )
 
 func formatSqlDrawing(sqlDrawing SqlDrawing) types.Drawing {
-	drawing := types.Drawing{
-		Id:        sqlDrawing.Id,
-		Featured:  sqlDrawing.Featured,
-		CreatedAt: formatting.JSONTime(sqlDrawing.CreatedAt),
-	}
+	metadata := formatSqlDrawingMetadata(sqlDrawing.SqlDrawingMetadata)
 
-	if sqlDrawing.LastDrawVectorCalculatedAt.Valid {
-		drawing.LastDrawVectorCalculatedAt = formatting.JSONTime(sqlDrawing.LastDrawVectorCalculatedAt.Time)
-	} else {
-		drawing.LastDrawVectorCalculatedAt = formatting.JSONTime(time.Time{})
+	return types.Drawing{
+		Id:                         metadata.Id,
+		Featured:                   metadata.Featured,
+		OriginalPoints:             decodePoints(sqlDrawing.Points),
+		DrawVectors:                decodeVectors(sqlDrawing.Vectors),
+		CreatedAt:                  metadata.CreatedAt,
+		LastDrawVectorCalculatedAt: metadata.LastDrawVectorCalculatedAt,
 	}
+}
 
-	json.Unmarshal([]byte(sqlDrawing.OriginalPoints), &drawing.OriginalPoints)
-	json.Unmarshal([]byte(sqlDrawing.DrawVectors), &drawing.DrawVectors)
-
-	return drawing
+func formatSqlDrawingMetadata(sqlMetadata SqlDrawingMetadata) types.DrawingMetadata {
+	return types.DrawingMetadata{
+		Id:                         sqlMetadata.Id,
+		Featured:                   sqlMetadata.Featured,
+		CreatedAt:                  formatting.JSONTime(sqlMetadata.CreatedAt),
+		LastDrawVectorCalculatedAt: formatNullTime(sqlMetadata.LastDrawVectorCalculatedAt),
+		State:                      sqlMetadata.State,
+	}
 }
 
-func formatSqlDrawingPreviews(sqlDrawings []SqlDrawing) []types.DrawingPreview {
-	drawings := []types.DrawingPreview{}
+func formatSqlDrawingStatus(sqlStatus SqlDrawingStatus) types.DrawingStatus {
+	return types.DrawingStatus{
+		Id:                         sqlStatus.Id,
+		State:                      sqlStatus.State,
+		Attempts:                   sqlStatus.Attempts,
+		CreatedAt:                  formatting.JSONTime(sqlStatus.CreatedAt),
+		ProcessingStartedAt:        formatNullTime(sqlStatus.ProcessingStartedAt),
+		LastDrawVectorCalculatedAt: formatNullTime(sqlStatus.LastDrawVectorCalculatedAt),
+	}
+}
 
-	for _, sqlDrawing := range sqlDrawings {
-		drawings = append(drawings, formatSqlDrawingPreview(sqlDrawing))
+// formatNullTime turns NULL into the zero time, which JSONTime writes as null.
+func formatNullTime(nullTime formatting.SQLNullTime) formatting.JSONTime {
+	if nullTime.Valid {
+		return formatting.JSONTime(nullTime.Time)
 	}
 
-	return drawings
+	return formatting.JSONTime(time.Time{})
 }
 
-func formatSqlDrawingPreview(sqlDrawing SqlDrawing) types.DrawingPreview {
-	drawingPreview := types.DrawingPreview{
-		Id:      sqlDrawing.Id,
-		SvgPath: buildSvgPath(sqlDrawing),
+func decodePoints(encoded []byte) []types.OriginalPoint {
+	points, err := blob.DecodePoints(encoded)
+
+	if err != nil {
+		panic(err)
 	}
 
-	return drawingPreview
+	return points
 }
 
-func buildSvgPath(sqlDrawing SqlDrawing) string {
-	var path strings.Builder
-	var originalPoints []types.OriginalPoint
-
-	path.Grow(len(originalPoints) * 10)
-	json.Unmarshal([]byte(sqlDrawing.OriginalPoints), &originalPoints)
+func decodeVectors(encoded []byte) []types.DrawVector {
+	vectors, err := blob.DecodeVectors(encoded)
 
-	for i, point := range originalPoints {
-		if i == 0 {
-			fmt.Fprintf(&path, "M %d %d ", point.X, point.Y)
-		} else {
-			fmt.Fprintf(&path, "L %d %d ", point.X, point.Y)
-		}
+	if err != nil {
+		panic(err)
 	}
 
-	return path.String()
+	return vectors
 }
@@ -0,0 +1,124 @@
+package mysql
+
+import (
+	"database/sql"
+	"github.com/jmoiron/sqlx"
+	"time"
+
+	"api/app/drawing/types"
+)
+
+// ClaimNext marks the oldest pending drawing attempted fewer than maxAttempts
+// times, and not waiting to be retried, as processing and returns it, or false
+// when there is none. Claiming is a conditional UPDATE, so two workers (or two
+// API processes) never get the same drawing.
+func (store *MySqlStore) ClaimNext(maxAttempts int) (types.ProcessingJob, bool) {
+	for {
+		var sqlJob SqlProcessingJob
+
+		err := store.DB.Get(&sqlJob, "SELECT id, maxVectors, attempts FROM drawings WHERE state = 'pending' AND attempts < ? AND (retryAfter IS NULL OR retryAfter <= NOW(3)) ORDER BY id LIMIT 1", maxAttempts)
+
+		if err == sql.ErrNoRows {
+			return types.ProcessingJob{}, false
+		}
+
+		if err != nil {
+			panic(err)
+		}
+
+		result := store.DB.MustExec("UPDATE drawings SET state = 'processing', attempts = attempts + 1, processingStartedAt = NOW() WHERE id = ? AND state = 'pending'", sqlJob.Id)
+
+		if claimed, _ := result.RowsAffected(); claimed == 1 {
+			return types.ProcessingJob{DrawingId: sqlJob.Id, MaxVectors: sqlJob.MaxVectors, Attempts: sqlJob.Attempts + 1}, true
+		}
+	}
+}
+
+// Retry puts a drawing whose processing failed back in the queue, not to be
+// claimed before delay times its attempts so far passed, or marks it failed
+// once it was attempted maxAttempts times.
+func (store *MySqlStore) Retry(drawingId int, maxAttempts int, delay time.Duration) {
+	store.DB.MustExec("UPDATE drawings SET state = IF(attempts >= ?, 'failed', 'pending'), retryAfter = NOW(3) + INTERVAL attempts * ? MICROSECOND WHERE id = ? AND state = 'processing'", maxAttempts, int64(delay/time.Microsecond), drawingId)
+}
+
+// RequeueStale puts back in the queue the drawings claimed longer than
+// olderThan ago, taking them for abandoned by an API process that stopped,
+// and returns how many there were. Drawings other processes are working on
+// are left alone as long as they finish within olderThan. Like Retry, it
+// marks failed the drawings already attempted maxAttempts times, so one that
+// kills the process processing it is not claimed forever.
+func (store *MySqlStore) RequeueStale(olderThan time.Duration, maxAttempts int) int {
+	result := store.DB.MustExec("UPDATE drawings SET state = IF(attempts >= ?, 'failed', 'pending') WHERE state = 'processing' AND processingStartedAt < NOW() - INTERVAL ? SECOND", maxAttempts, int(olderThan.Seconds()))
+	requeued, _ := result.RowsAffected()
+
+	return int(requeued)
+}
+
+// RequeueFailed puts the failed drawings among ids back in the queue with no
+// attempts, for submitting a failed drawing again to give it another go, and
+// returns how many there were.
+func (store *MySqlStore) RequeueFailed(ids []int) int {
+	if len(ids) == 0 {
+		return 0
+	}
+
+	query, args, err := sqlx.In("UPDATE drawings SET state = 'pending', attempts = 0, retryAfter = NULL WHERE id IN (?) AND state = 'failed'", ids)
+
+	if err != nil {
+		panic(err)
+	}
+
+	result := store.DB.MustExec(store.DB.Rebind(query), args...)
+	requeued, _ := result.RowsAffected()
+
+	return int(requeued)
+}
+
+func (store *MySqlStore) GetStatus(id int) types.DrawingStatus {
+	var sqlStatus SqlDrawingStatus
+
+	err := store.DB.Get(&sqlStatus, "SELECT id, state, attempts, createdAt, processingStartedAt, lastDrawVectorCalculatedAt FROM drawings WHERE id = ?", id)
+
+	if err != nil {
+		panic(err)
+	}
+
+	status := formatSqlDrawingStatus(sqlStatus)
+
+	if status.State == types.StatePending {
+		err = store.DB.Get(&status.Position, "SELECT COUNT(*) FROM drawings WHERE state = 'pending' AND id < ?", id)
+
+		if err != nil {
+			panic(err)
+		}
+	}
+
+	return status
+}
+
+// GetQueueStats counts the drawings in every state but done, leaving Workers
+// to the caller.
+func (store *MySqlStore) GetQueueStats() types.QueueStats {
+	var rows []SqlStateCount
+
+	err := store.DB.Select(&rows, "SELECT state, COUNT(*) AS count FROM drawings WHERE state IN ('pending', 'processing', 'failed') GROUP BY state")
+
+	if err != nil {
+		panic(err)
+	}
+
+	stats := types.QueueStats{}
+
+	for _, row := range rows {
+		switch row.State {
+		case types.StatePending:
+			stats.Pending = row.Count
+		case types.StateProcessing:
+			stats.Processing = row.Count
+		case types.StateFailed:
+			stats.Failed = row.Count
+		}
+	}
+
+	return stats
+}
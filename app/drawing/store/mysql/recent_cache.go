@@ -0,0 +1,48 @@
+package mysql
+
+import (
+	"sync"
+
+	"api/app/drawing/types"
+)
+
+// previewCache holds the latest GetRecent result with the newest drawing id
+// it was read at. Previews never change once stored, so the result holds
+// until a drawing is added: by this process, which invalidates it, or by
+// another one, which moves the newest id on.
+type previewCache struct {
+	mutex    sync.RWMutex
+	valid    bool
+	newestId int
+	previews []types.DrawingPreview
+}
+
+var recentPreviews = &previewCache{}
+
+func (cache *previewCache) get(newestId int) ([]types.DrawingPreview, bool) {
+	cache.mutex.RLock()
+	defer cache.mutex.RUnlock()
+
+	if !cache.valid || cache.newestId != newestId {
+		return nil, false
+	}
+
+	return cache.previews, true
+}
+
+func (cache *previewCache) set(newestId int, previews []types.DrawingPreview) {
+	cache.mutex.Lock()
+	defer cache.mutex.Unlock()
+
+	cache.valid = true
+	cache.newestId = newestId
+	cache.previews = previews
+}
+
+func (cache *previewCache) invalidate() {
+	cache.mutex.Lock()
+	defer cache.mutex.Unlock()
+
+	cache.valid = false
+	cache.previews = nil
+}
@@ -2,14 +2,52 @@ package mysql
 
 import (
 	"api/app/formatting"
+	"database/sql"
 	"time"
 )
 
-type SqlDrawing struct {
+type SqlDrawingMetadata struct {
 	Id                         int                    `db:"id"`
 	Featured                   bool                   `db:"featured"`
-	OriginalPoints             string                 `db:"originalPoints"`
-	DrawVectors                string                 `db:"drawVectors"`
 	CreatedAt                  time.Time              `db:"createdAt"`
 	LastDrawVectorCalculatedAt formatting.SQLNullTime `db:"lastDrawVectorCalculatedAt"`
+	State                      string                 `db:"state"`
+}
+
+// SqlDrawing holds the points and vectors columns as stored, see the blob
+// package.
+type SqlDrawing struct {
+	SqlDrawingMetadata
+	Points  []byte `db:"points"`
+	Vectors []byte `db:"vectors"`
+}
+
+type SqlDrawingPreview struct {
+	Id         int            `db:"id"`
+	SvgPreview sql.NullString `db:"svgPreview"`
+}
+
+type SqlHashedId struct {
+	PointsHash string `db:"pointsHash"`
+	Id         int    `db:"id"`
+}
+
+type SqlProcessingJob struct {
+	Id         int `db:"id"`
+	MaxVectors int `db:"maxVectors"`
+	Attempts   int `db:"attempts"`
+}
+
+type SqlDrawingStatus struct {
+	Id                         int                    `db:"id"`
+	State                      string                 `db:"state"`
+	Attempts                   int                    `db:"attempts"`
+	CreatedAt                  time.Time              `db:"createdAt"`
+	ProcessingStartedAt        formatting.SQLNullTime `db:"processingStartedAt"`
+	LastDrawVectorCalculatedAt formatting.SQLNullTime `db:"lastDrawVectorCalculatedAt"`
+}
+
+type SqlStateCount struct {
+	State string `db:"state"`
+	Count int    `db:"count"`
 }
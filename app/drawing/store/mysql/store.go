@@ -1,9 +1,13 @@
 package mysql
 
 import (
-	"encoding/json"
+	"database/sql"
+	"fmt"
 	"github.com/jmoiron/sqlx"
+	"strings"
 
+	"api/app/drawing/preview"
+	"api/app/drawing/store/blob"
 	"api/app/drawing/types"
 )
 
@@ -22,10 +26,12 @@ func (store *MySqlStore) Exists(id int) bool {
 	return count > 0
 }
 
+const metadataColumns = "id, featured, createdAt, lastDrawVectorCalculatedAt, state"
+
 func (store *MySqlStore) Get(id int) types.Drawing {
 	var sqlDrawing SqlDrawing
 
-	err := store.DB.Get(&sqlDrawing, "SELECT * FROM drawings WHERE id = ?", id)
+	err := store.DB.Get(&sqlDrawing, "SELECT "+metadataColumns+", points, vectors FROM drawings WHERE id = ?", id)
 
 	if err != nil {
 		panic(err)
@@ -34,29 +40,277 @@ func (store *MySqlStore) Get(id int) types.Drawing {
 	return formatSqlDrawing(sqlDrawing)
 }
 
+// GetMetadata reads a drawing's row without its points and vectors, or
+// returns false when there is no such drawing.
+func (store *MySqlStore) GetMetadata(id int) (types.DrawingMetadata, bool) {
+	var sqlMetadata SqlDrawingMetadata
+
+	err := store.DB.Get(&sqlMetadata, "SELECT "+metadataColumns+" FROM drawings WHERE id = ?", id)
+
+	if err == sql.ErrNoRows {
+		return types.DrawingMetadata{}, false
+	}
+
+	if err != nil {
+		panic(err)
+	}
+
+	return formatSqlDrawingMetadata(sqlMetadata), true
+}
+
+func (store *MySqlStore) GetPoints(id int) []types.OriginalPoint {
+	var points []byte
+
+	err := store.DB.Get(&points, "SELECT points FROM drawings WHERE id = ?", id)
+
+	if err != nil {
+		panic(err)
+	}
+
+	return decodePoints(points)
+}
+
+// GetVectors returns no vectors for a drawing not processed yet.
+func (store *MySqlStore) GetVectors(id int) []types.DrawVector {
+	var vectors []byte
+
+	err := store.DB.Get(&vectors, "SELECT vectors FROM drawings WHERE id = ?", id)
+
+	if err != nil {
+		panic(err)
+	}
+
+	return decodeVectors(vectors)
+}
+
+// GetRecent serves the previews of the 20 newest drawings from
+// recentPreviews while no drawing was added since they were read.
 func (store *MySqlStore) GetRecent() []types.DrawingPreview {
-	var sqlDrawings []SqlDrawing
+	var newestId int
 
-	err := store.DB.Select(&sqlDrawings, "SELECT id, originalPoints FROM drawings ORDER BY id DESC LIMIT 20")
+	err := store.DB.Get(&newestId, "SELECT COALESCE(MAX(id), 0) FROM drawings")
 
 	if err != nil {
 		panic(err)
 	}
 
-	return formatSqlDrawingPreviews(sqlDrawings)
+	if previews, found := recentPreviews.get(newestId); found {
+		return previews
+	}
+
+	var sqlPreviews []SqlDrawingPreview
+
+	err = store.DB.Select(&sqlPreviews, "SELECT id, svgPreview FROM drawings ORDER BY id DESC LIMIT 20")
+
+	if err != nil {
+		panic(err)
+	}
+
+	previews := make([]types.DrawingPreview, len(sqlPreviews))
+
+	for i, sqlPreview := range sqlPreviews {
+		previews[i] = types.DrawingPreview{Id: sqlPreview.Id, SvgPath: sqlPreview.SvgPreview.String}
+
+		if !sqlPreview.SvgPreview.Valid {
+			previews[i].SvgPath = store.storePreview(sqlPreview.Id)
+		}
+	}
+
+	recentPreviews.set(newestId, previews)
+
+	return previews
 }
 
-func (store *MySqlStore) Create(points []types.OriginalPoint) int {
-	json, _ := json.Marshal(points)
+// storePreview builds and stores the preview of a drawing saved before
+// previews were, returning it.
+func (store *MySqlStore) storePreview(id int) string {
+	svgPath := preview.SvgPath(store.GetPoints(id))
+
+	store.DB.MustExec("UPDATE drawings SET svgPreview = ? WHERE id = ?", svgPath, id)
 
-	result := store.DB.MustExec(`INSERT INTO drawings (originalPoints, drawVectors) VALUES (?, '[]')`, string(json[:]))
+	return svgPath
+}
+
+// Create stores a drawing pending processing with maxVectors, along with
+// its points hash so later identical submissions can find it (an empty hash
+// is stored as NULL) and its gallery preview. pointsHash is a unique key, so
+// when an identical drawing was stored in the meantime its id is returned
+// instead.
+func (store *MySqlStore) Create(points []types.OriginalPoint, hash string, maxVectors int) int {
+	result := store.DB.MustExec(`INSERT INTO drawings (points, pointsHash, svgPreview, maxVectors) VALUES (?, ?, ?, ?) ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)`, mustEncodePoints(points), nullableHash(hash), preview.SvgPath(points), maxVectors)
 	id, _ := result.LastInsertId()
+	recentPreviews.invalidate()
 
 	return int(id)
 }
 
-func (store *MySqlStore) AddVectors(drawingId int, vectors []types.DrawVector) {
-	json, _ := json.Marshal(vectors)
+// FindByHashes returns the drawing id for every hash that is stored.
+func (store *MySqlStore) FindByHashes(hashes []string) map[string]int {
+	return findByHashes(store.DB, hashes, "")
+}
+
+// findByHashes runs FindByHashes' query on db, which may be a transaction,
+// with lock appended to it.
+func findByHashes(db sqlx.Ext, hashes []string, lock string) map[string]int {
+	ids := map[string]int{}
+
+	if len(hashes) == 0 {
+		return ids
+	}
+
+	query, args, err := sqlx.In("SELECT pointsHash, id FROM drawings WHERE pointsHash IN (?)"+lock, hashes)
 
-	store.DB.MustExec("UPDATE drawings SET drawVectors = ? WHERE id = ?", string(json), drawingId)
+	if err != nil {
+		panic(err)
+	}
+
+	var rows []SqlHashedId
+	err = sqlx.Select(db, &rows, db.Rebind(query), args...)
+
+	if err != nil {
+		panic(err)
+	}
+
+	for _, row := range rows {
+		ids[row.PointsHash] = row.Id
+	}
+
+	return ids
+}
+
+// Multi-row INSERTs are split once their points reach this size, to stay
+// well under MySQL's max_allowed_packet.
+const createManyChunkBytes = 16 << 20
+
+// CreateMany inserts every drawing, with its points hash and maxVectors as
+// Create does, in one transaction, using as few multi-row INSERTs as the
+// chunk size allows, and returns their ids in order. Like Create, it returns
+// the id of an identical drawing stored in the meantime.
+func (store *MySqlStore) CreateMany(drawings [][]types.OriginalPoint, hashes []string, maxVectors []int) []int {
+	ids := make([]int, len(drawings))
+	tx := store.DB.MustBegin()
+
+	defer func() {
+		if recovered := recover(); recovered != nil {
+			tx.Rollback()
+			panic(recovered)
+		}
+	}()
+
+	// Servers replicating with auto_increment_increment > 1 space the ids out
+	var increment int
+
+	if err := tx.Get(&increment, "SELECT @@auto_increment_increment"); err != nil {
+		panic(err)
+	}
+
+	// Drawings without a hash cannot be stored already and keep the ids of
+	// their INSERT, the others are read back by hash
+	unhashed := &drawingRows{}
+	hashed := &drawingRows{upsert: true}
+	storedHashes := []string{}
+
+	for i, points := range drawings {
+		rows := unhashed
+
+		if hashes[i] != "" {
+			rows = hashed
+			storedHashes = append(storedHashes, hashes[i])
+		}
+
+		rows.add(i, mustEncodePoints(points), hashes[i], preview.SvgPath(points), maxVectors[i])
+
+		if rows.size >= createManyChunkBytes {
+			rows.insert(tx, ids, increment)
+		}
+	}
+
+	unhashed.insert(tx, ids, increment)
+	hashed.insert(tx, ids, increment)
+
+	// A locking read sees the rows other transactions committed after this
+	// one started, which a consistent read would miss
+	stored := findByHashes(tx, storedHashes, " LOCK IN SHARE MODE")
+
+	for i, hash := range hashes {
+		if hash != "" {
+			ids[i] = stored[hash]
+		}
+	}
+
+	if err := tx.Commit(); err != nil {
+		panic(err)
+	}
+
+	recentPreviews.invalidate()
+
+	return ids
+}
+
+// drawingRows gathers the values of one multi-row INSERT, the points,
+// pointsHash, svgPreview and maxVectors of each drawing in turn, and the
+// position of each drawing in CreateMany's arguments.
+type drawingRows struct {
+	upsert    bool
+	values    []interface{}
+	positions []int
+	size      int
+}
+
+func (rows *drawingRows) add(position int, encoded []byte, hash string, svgPath string, maxVectors int) {
+	rows.values = append(rows.values, encoded, nullableHash(hash), svgPath, maxVectors)
+	rows.positions = append(rows.positions, position)
+	rows.size += len(encoded)
+}
+
+// insert runs the INSERT and empties rows. Rows that may duplicate a stored
+// drawing are left to it, the others get their ids in ids, as InnoDB gives the
+// rows of a single multi-row INSERT ids increment apart, starting at the
+// statement's LastInsertId.
+func (rows *drawingRows) insert(tx *sqlx.Tx, ids []int, increment int) {
+	count := len(rows.positions)
+
+	if count == 0 {
+		return
+	}
+
+	query := "INSERT INTO drawings (points, pointsHash, svgPreview, maxVectors) VALUES " + strings.TrimSuffix(strings.Repeat("(?, ?, ?, ?), ", count), ", ")
+
+	if rows.upsert {
+		tx.MustExec(query+" ON DUPLICATE KEY UPDATE id = id", rows.values...)
+	} else {
+		result := tx.MustExec(query, rows.values...)
+		firstId, _ := result.LastInsertId()
+
+		if inserted, _ := result.RowsAffected(); inserted != int64(count) {
+			panic(fmt.Errorf("inserted %d of %d drawings", inserted, count))
+		}
+
+		for i, position := range rows.positions {
+			ids[position] = int(firstId) + i*increment
+		}
+	}
+
+	*rows = drawingRows{upsert: rows.upsert}
+}
+
+// mustEncodePoints panics on points the validation middleware lets through
+// only by mistake, as storing them would wrap their coordinates.
+func mustEncodePoints(points []types.OriginalPoint) []byte {
+	encoded, err := blob.EncodePoints(points)
+
+	if err != nil {
+		panic(err)
+	}
+
+	return encoded
+}
+
+func nullableHash(hash string) sql.NullString {
+	return sql.NullString{String: hash, Valid: hash != ""}
+}
+
+// AddVectors stores a drawing's vectors and marks it done.
+func (store *MySqlStore) AddVectors(drawingId int, vectors []types.DrawVector) {
+	store.DB.MustExec("UPDATE drawings SET vectors = ?, state = 'done', lastDrawVectorCalculatedAt = NOW() WHERE id = ?", blob.EncodeVectors(vectors), drawingId)
 }
@@ -1,6 +1,8 @@
 package store
 
 import (
+	"time"
+
 	"api/app/drawing/store/mysql"
 	"api/app/drawing/types"
 	"api/database"
@@ -15,7 +17,18 @@ func New() Store {
 type Store interface {
 	Exists(id int) bool
 	Get(id int) types.Drawing
+	GetMetadata(id int) (types.DrawingMetadata, bool)
+	GetPoints(id int) []types.OriginalPoint
+	GetVectors(id int) []types.DrawVector
 	GetRecent() []types.DrawingPreview
-	Create(points []types.OriginalPoint) int
+	Create(points []types.OriginalPoint, hash string, maxVectors int) int
+	CreateMany(drawings [][]types.OriginalPoint, hashes []string, maxVectors []int) []int
+	FindByHashes(hashes []string) map[string]int
 	AddVectors(drawingId int, vectors []types.DrawVector)
+	ClaimNext(maxAttempts int) (types.ProcessingJob, bool)
+	Retry(drawingId int, maxAttempts int, delay time.Duration)
+	RequeueStale(olderThan time.Duration, maxAttempts int) int
+	RequeueFailed(ids []int) int
+	GetStatus(id int) types.DrawingStatus
+	GetQueueStats() types.QueueStats
 }
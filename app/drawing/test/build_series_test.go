@@ -0,0 +1,93 @@
+package test
+
+import (
+	"encoding/json"
+	"github.com/google/go-cmp/cmp"
+	"github.com/stretchr/testify/assert"
+	"io/ioutil"
+	"math"
+	"math/cmplx"
+	"testing"
+
+	"api/app/drawing/processing/draw_vector"
+	"api/app/drawing/types"
+)
+
+type buildSeriesFixture struct {
+	MaxVectors int                   `json:"maxVectors"`
+	Points     []types.OriginalPoint `json:"points"`
+	Vectors    []types.DrawVector    `json:"vectors"`
+}
+
+// The fixture holds the vectors BuildSeries produced when VectorBuilder still
+// integrated every coefficient separately over the time grid.
+func TestBuildSeriesParity(t *testing.T) {
+	data, err := ioutil.ReadFile("fixtures/build_series.json")
+	assert.Nil(t, err)
+
+	fixtures := map[string]buildSeriesFixture{}
+	assert.Nil(t, json.Unmarshal(data, &fixtures))
+	assert.Equal(t, 7, len(fixtures))
+
+	for name, fixture := range fixtures {
+		vectors := draw_vector.BuildSeries(normalizeTime(fixture.Points), fixture.MaxVectors)
+
+		assert.Equal(t, len(fixture.Vectors), len(vectors), name)
+		assert.True(t, cmp.Equal(fixture.Vectors, vectors, getVectorComparer(1e-6)), name)
+	}
+}
+
+func TestBuildSeriesReportsProgress(t *testing.T) {
+	reports := []draw_vector.Progress{}
+	vectors := draw_vector.BuildSeriesWithProgress(buildUnitCirclePoints(100), 10, func(progress draw_vector.Progress) {
+		reports = append(reports, progress)
+	})
+
+	assert.Equal(t, len(vectors), len(reports))
+
+	for i, report := range reports {
+		assert.Equal(t, vectors[i].N, report.N)
+		assert.Equal(t, i+1, report.Vectors)
+	}
+
+	assert.True(t, reports[len(reports)-1].AverageDistance < 1)
+}
+
+func TestVectorBuilderMatchesIntegration(t *testing.T) {
+	points := buildUnitCirclePoints(100)
+	vectorBuilder := draw_vector.NewVectorBuilder(points)
+
+	for _, n := range []int{0, 1, -1, 7, -250, 999, 1001} {
+		expected := integrateCoefficient(n, points)
+		assert.True(t, cmp.Equal(expected, vectorBuilder.Build(n), getVectorComparer(1e-9)), n)
+	}
+}
+
+// Samples the circle points at the grid times directly, they already lie on it
+func integrateCoefficient(n int, points []types.OriginalPoint) types.DrawVector {
+	sum := complex(0, 0)
+
+	for i := 0; i < 1000; i++ {
+		point := points[i]
+		angle := -2.00 * math.Pi * float64(n) * float64(i) / 1000
+		sum += complex(float64(point.X), float64(point.Y)) * cmplx.Rect(0.001, angle)
+	}
+
+	return types.DrawVector{N: n, Real: real(sum), Imaginary: imag(sum)}
+}
+
+func normalizeTime(points []types.OriginalPoint) []types.OriginalPoint {
+	normalized := make([]types.OriginalPoint, len(points))
+	copy(normalized, points)
+	finalTime := normalized[len(normalized)-1].Time
+
+	if finalTime == 0 {
+		return normalized
+	}
+
+	for i := range normalized {
+		normalized[i].Time = normalized[i].Time / finalTime
+	}
+
+	return normalized
+}
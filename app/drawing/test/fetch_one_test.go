@@ -2,10 +2,12 @@ package test
 
 import (
 	"github.com/stretchr/testify/assert"
+	"net/http"
 	"strconv"
 	"testing"
 	"time"
 
+	"api/app/drawing/processing"
 	"api/app/drawing/store"
 	"api/app/drawing/types"
 	"api/database"
@@ -42,7 +44,7 @@ func TestFetchOneSuccess(t *testing.T) {
 	}
 
 	store := store.New()
-	id := store.Create(points)
+	id := store.Create(points, "", 100)
 
 	response := requester.Get("/drawing/" + strconv.Itoa(id))
 	assert.True(t, response.Ok())
@@ -66,3 +68,50 @@ func TestFetchOneSuccess(t *testing.T) {
 
 	assert.Equal(t, expectedJson, response.Body())
 }
+
+func TestFetchOneFields(t *testing.T) {
+	database.ClearTestingDb()
+
+	id := store.New().Create([]types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: 5, Y: 1, Time: 0.5}}, "", 100)
+	response := requester.Get("/drawing/" + strconv.Itoa(id) + "?fields=id,drawVectors,state")
+
+	assert.True(t, response.Ok())
+	assert.Equal(t, `{"id":1,"drawVectors":[],"state":"pending"}`, response.Body())
+
+	response = requester.Get("/drawing/" + strconv.Itoa(id) + "?fields=id,secret")
+	assert.True(t, response.IsBadRequest())
+}
+
+func TestFetchOneNotModified(t *testing.T) {
+	database.ClearTestingDb()
+
+	drawingStore := store.New()
+	id := drawingStore.Create([]types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: 5, Y: 1, Time: 0.5}}, "", 100)
+	uri := "/drawing/" + strconv.Itoa(id) + "?fields=drawVectors"
+
+	etag := requester.Get(uri).ResponseRecorder.Header().Get("ETag")
+	assert.NotEqual(t, "", etag)
+
+	response := requester.RequestWithHeaders("GET", uri, "", map[string]string{"If-None-Match": etag})
+	assert.Equal(t, http.StatusNotModified, response.ResponseRecorder.Code)
+	assert.Equal(t, "", response.Body())
+
+	drawingStore.AddVectors(id, []types.DrawVector{{N: 0, Real: 4.5, Imaginary: 3}})
+
+	response = requester.RequestWithHeaders("GET", uri, "", map[string]string{"If-None-Match": etag})
+	assert.True(t, response.Ok())
+	assert.Equal(t, `{"drawVectors":[{"n":0,"real":4.5,"imaginary":3}]}`, response.Body())
+	assert.NotEqual(t, etag, response.ResponseRecorder.Header().Get("ETag"))
+}
+
+func TestFetchOneWaitsForVectors(t *testing.T) {
+	database.ClearTestingDb()
+	processing.StartWorkers(2)
+	defer processing.StopWorkers()
+
+	response := requester.Post("/drawing", `{"points": [{"x": 0, "y": 0, "time": 0}, {"x": 10, "y": 0, "time": 1}], "maxVectors": 3}`)
+	assert.True(t, response.Ok())
+
+	response = requester.Get("/drawing/1?fields=state&wait=10")
+	assert.Equal(t, `{"state":"done"}`, response.Body())
+}
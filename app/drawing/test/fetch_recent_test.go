@@ -1,10 +1,14 @@
 package test
 
 import (
+	encodingJson "encoding/json"
 	"github.com/stretchr/testify/assert"
+	"math"
 	"strconv"
+	"strings"
 	"testing"
 
+	"api/app/drawing/preview"
 	"api/app/drawing/store"
 	"api/app/drawing/types"
 	"api/database"
@@ -26,13 +30,81 @@ func TestFetchRecent(t *testing.T) {
 	assert.Equal(t, expectedJson, response.Body())
 }
 
+func TestFetchRecentSeesNewDrawings(t *testing.T) {
+	database.ClearTestingDb()
+
+	firstDrawingJson := createFetchRecentDrawingJson()
+	assert.Equal(t, json.Compact(`[`+firstDrawingJson+`]`), requester.Get("/drawings/recent").Body())
+
+	// The cached previews are replaced once a drawing is added
+	secondDrawingJson := createFetchRecentDrawingJson()
+	expectedJson := json.Compact(`[` + secondDrawingJson + `,` + firstDrawingJson + `]`)
+
+	assert.Equal(t, expectedJson, requester.Get("/drawings/recent").Body())
+}
+
+func TestFetchRecentBoundsLargeDrawings(t *testing.T) {
+	database.ClearTestingDb()
+
+	store.New().Create(buildSpiralPoints(50000), "", 100)
+
+	var previews []types.DrawingPreview
+	response := requester.Get("/drawings/recent")
+	assert.Nil(t, encodingJson.Unmarshal([]byte(response.Body()), &previews))
+
+	assert.Equal(t, 1, len(previews))
+	assert.True(t, strings.HasPrefix(previews[0].SvgPath, "M 0 0 L "))
+	assert.Equal(t, preview.MaxPoints-1, strings.Count(previews[0].SvgPath, "L "))
+}
+
+func TestSvgPathSimplifiesStraightRuns(t *testing.T) {
+	points := []types.OriginalPoint{}
+
+	for i := 0; i <= 2000; i++ {
+		points = append(points, types.OriginalPoint{X: i, Y: 2 * i, Time: float64(i)})
+	}
+
+	assert.Equal(t, "M 0 0 L 2000 4000 ", preview.SvgPath(points))
+}
+
+func TestSvgPathKeepsTheCorners(t *testing.T) {
+	points := []types.OriginalPoint{}
+
+	// Three sides of a square, one point per unit
+	for i := 0; i < 600; i++ {
+		points = append(points, types.OriginalPoint{X: i, Y: 0, Time: float64(i)})
+	}
+
+	for i := 0; i < 600; i++ {
+		points = append(points, types.OriginalPoint{X: 600, Y: i, Time: float64(600 + i)})
+	}
+
+	for i := 600; i >= 0; i-- {
+		points = append(points, types.OriginalPoint{X: i, Y: 600, Time: float64(1800 - i)})
+	}
+
+	assert.Equal(t, "M 0 0 L 600 0 L 600 600 L 0 600 ", preview.SvgPath(points))
+}
+
+func buildSpiralPoints(count int) []types.OriginalPoint {
+	points := make([]types.OriginalPoint, count)
+
+	for i := range points {
+		angle := 40 * math.Pi * float64(i) / float64(count)
+		radius := 10 * angle
+		points[i] = types.OriginalPoint{X: int(radius * math.Cos(angle)), Y: int(radius * math.Sin(angle)), Time: float64(i)}
+	}
+
+	return points
+}
+
 func createFetchRecentDrawingJson() string {
 	store := store.New()
 	points := []types.OriginalPoint{
 		{X: 4, Y: 5, Time: 0},
 		{X: 5, Y: 1, Time: 1},
 	}
-	id := store.Create(points)
+	id := store.Create(points, "", 100)
 
 	return `{
 		"id": ` + strconv.Itoa(id) + `,
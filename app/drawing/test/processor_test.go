@@ -16,8 +16,8 @@ import (
 func TestOriginPoint(t *testing.T) {
 	store := store.New()
 	points := []types.OriginalPoint{{Time: 0.00, X: 0, Y: 0}}
-	id := store.Create(points)
-	processing.Process(id)
+	id := store.Create(points, "", 100)
+	processing.Process(id, 100)
 	result := store.Get(id)
 
 	expected := []types.DrawVector{
@@ -31,8 +31,8 @@ func TestOriginPoint(t *testing.T) {
 func TestNonOriginPoint(t *testing.T) {
 	store := store.New()
 	points := []types.OriginalPoint{{Time: 0, X: 50, Y: 50}}
-	id := store.Create(points)
-	processing.Process(id)
+	id := store.Create(points, "", 100)
+	processing.Process(id, 100)
 	result := store.Get(id)
 
 	expected := []types.DrawVector{
@@ -46,8 +46,8 @@ func TestNonOriginPoint(t *testing.T) {
 func TestCircle(t *testing.T) {
 	store := store.New()
 	radius := 100.00
-	id := store.Create(buildUnitCirclePoints(radius))
-	processing.Process(id)
+	id := store.Create(buildUnitCirclePoints(radius), "", 100)
+	processing.Process(id, 100)
 	result := store.Get(id)
 
 	expected := []types.DrawVector{
@@ -0,0 +1,126 @@
+package test
+
+import (
+	encodingJson "encoding/json"
+	"github.com/stretchr/testify/assert"
+	"strconv"
+	"testing"
+	"time"
+
+	"api/app/drawing/processing"
+	"api/app/drawing/store"
+	"api/app/drawing/types"
+	"api/database"
+	"api/test/requester"
+)
+
+func TestQueuedDrawingIsProcessed(t *testing.T) {
+	database.ClearTestingDb()
+	processing.StartWorkers(2)
+	defer processing.StopWorkers()
+
+	response := requester.Post("/drawing", `{"points": [{"x": 0, "y": 0, "time": 0}, {"x": 10, "y": 0, "time": 1}], "maxVectors": 3}`)
+	assert.True(t, response.Ok())
+
+	status := waitForState(t, 1, types.StateDone)
+
+	assert.Equal(t, 1, status.Attempts)
+	assert.Equal(t, 0, status.Position)
+	assert.False(t, time.Time(status.LastDrawVectorCalculatedAt).IsZero())
+	assert.True(t, len(store.New().GetVectors(1)) > 0)
+}
+
+func TestFailingDrawingIsRetriedThenFailed(t *testing.T) {
+	database.ClearTestingDb()
+	processing.StartWorkers(2)
+	defer processing.StopWorkers()
+
+	// No points to process, so every attempt panics
+	id := store.New().Create([]types.OriginalPoint{}, "", 100)
+	processing.Wake(1)
+
+	status := waitForState(t, id, types.StateFailed)
+
+	assert.Equal(t, 3, status.Attempts)
+	assert.Equal(t, 1, store.New().GetQueueStats().Failed)
+}
+
+func TestOnlyStaleDrawingsAreRequeued(t *testing.T) {
+	database.ClearTestingDb()
+
+	db := database.GetDb()
+	db.MustExec("INSERT INTO drawings (points, state, attempts, processingStartedAt) VALUES ('', 'processing', 1, NOW() - INTERVAL 1 HOUR), ('', 'processing', 1, NOW()), ('', 'processing', 3, NOW() - INTERVAL 1 HOUR)")
+
+	assert.Equal(t, 2, store.New().RequeueStale(10*time.Minute, 3))
+	assert.Equal(t, types.StatePending, store.New().GetStatus(1).State)
+	assert.Equal(t, types.StateProcessing, store.New().GetStatus(2).State)
+
+	// Its last attempt took the process down with it
+	assert.Equal(t, types.StateFailed, store.New().GetStatus(3).State)
+}
+
+func TestExhaustedDrawingsAreNotClaimed(t *testing.T) {
+	database.ClearTestingDb()
+
+	database.GetDb().MustExec("INSERT INTO drawings (points, state, attempts) VALUES ('', 'pending', 3), ('', 'pending', 2)")
+
+	job, found := store.New().ClaimNext(3)
+	assert.True(t, found)
+	assert.Equal(t, 2, job.DrawingId)
+	assert.Equal(t, 3, job.Attempts)
+
+	_, found = store.New().ClaimNext(3)
+	assert.False(t, found)
+}
+
+func TestRetriesWaitForTheirDelay(t *testing.T) {
+	database.ClearTestingDb()
+
+	database.GetDb().MustExec("INSERT INTO drawings (points, state, attempts) VALUES ('', 'processing', 1), ('', 'processing', 1)")
+	drawingStore := store.New()
+	drawingStore.Retry(1, 3, time.Hour)
+	drawingStore.Retry(2, 3, 0)
+
+	job, found := drawingStore.ClaimNext(3)
+	assert.True(t, found)
+	assert.Equal(t, 2, job.DrawingId)
+
+	_, found = drawingStore.ClaimNext(3)
+	assert.False(t, found)
+	assert.Equal(t, types.StatePending, drawingStore.GetStatus(1).State)
+}
+
+func TestNoWorkersWhenDisabled(t *testing.T) {
+	database.ClearTestingDb()
+
+	// TestMain sets PROCESSING_WORKERS=0
+	response := requester.Get("/drawings/queue")
+	assert.Equal(t, `{"pending":0,"processing":0,"failed":0,"workers":0}`, response.Body())
+}
+
+func TestStatusOfUnknownDrawing(t *testing.T) {
+	database.ClearTestingDb()
+
+	response := requester.Get("/drawing/1/status")
+	assert.True(t, response.IsNotFound())
+}
+
+func waitForState(t *testing.T, id int, state string) types.DrawingStatus {
+	for deadline := time.Now().Add(10 * time.Second); time.Now().Before(deadline); time.Sleep(50 * time.Millisecond) {
+		response := requester.Get("/drawing/" + strconv.Itoa(id) + "/status")
+		assert.True(t, response.Ok())
+
+		var body struct {
+			State string `json:"state"`
+		}
+		encodingJson.Unmarshal([]byte(response.Body()), &body)
+
+		if body.State == state {
+			return store.New().GetStatus(id)
+		}
+	}
+
+	t.Fatalf("drawing %d never got to %s", id, state)
+
+	return types.DrawingStatus{}
+}
@@ -0,0 +1,147 @@
+package test
+
+import (
+	"github.com/jmoiron/sqlx"
+	"github.com/stretchr/testify/assert"
+	"math"
+	"testing"
+
+	"api/app/drawing/store"
+	"api/app/drawing/store/blob"
+	"api/app/drawing/types"
+	"api/database"
+)
+
+func TestBlobRoundTrip(t *testing.T) {
+	points := []types.OriginalPoint{
+		{X: -2147483648, Y: 2147483647, Time: 0},
+		{X: 4, Y: -5, Time: 0.1},
+		{X: 0, Y: 0, Time: math.MaxFloat64},
+	}
+	vectors := []types.DrawVector{
+		{N: 0, Real: 1.5, Imaginary: -2.25},
+		{N: -3, Real: math.SmallestNonzeroFloat64, Imaginary: 0},
+	}
+
+	encodedPoints, err := blob.EncodePoints(points)
+	assert.Nil(t, err)
+	decodedPoints, err := blob.DecodePoints(encodedPoints)
+	assert.Nil(t, err)
+	assert.Equal(t, points, decodedPoints)
+	assert.Equal(t, len(points)*blob.PointSize, len(encodedPoints))
+
+	decodedVectors, err := blob.DecodeVectors(blob.EncodeVectors(vectors))
+	assert.Nil(t, err)
+	assert.Equal(t, vectors, decodedVectors)
+
+	_, err = blob.DecodePoints(encodedPoints[1:])
+	assert.Equal(t, blob.ErrCorrupt, err)
+
+	_, err = blob.EncodePoints([]types.OriginalPoint{{X: 0, Y: math.MaxInt32 + 1, Time: 0}})
+	assert.Equal(t, blob.ErrOutOfRange, err)
+}
+
+func TestUnprocessedDrawingHasNoVectors(t *testing.T) {
+	vectors, err := blob.DecodeVectors(nil)
+
+	assert.Nil(t, err)
+	assert.NotNil(t, vectors)
+	assert.Equal(t, 0, len(vectors))
+}
+
+func TestStoreReadsColumnsIndependently(t *testing.T) {
+	database.ClearTestingDb()
+
+	drawingStore := store.New()
+	points := []types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: 5, Y: 1, Time: 0.5}}
+	vectors := []types.DrawVector{{N: 0, Real: 4.5, Imaginary: 3}}
+	id := drawingStore.Create(points, "", 100)
+
+	assert.Equal(t, points, drawingStore.GetPoints(id))
+	assert.Equal(t, []types.DrawVector{}, drawingStore.GetVectors(id))
+
+	drawingStore.AddVectors(id, vectors)
+	drawing := drawingStore.Get(id)
+	metadata, found := drawingStore.GetMetadata(id)
+
+	assert.Equal(t, vectors, drawingStore.GetVectors(id))
+	assert.Equal(t, vectors, drawing.DrawVectors)
+	assert.Equal(t, points, drawing.OriginalPoints)
+	assert.True(t, found)
+	assert.Equal(t, id, metadata.Id)
+	assert.Equal(t, types.StateDone, metadata.State)
+	assert.Equal(t, drawing.CreatedAt, metadata.CreatedAt)
+}
+
+func TestMigrationPacksJsonColumns(t *testing.T) {
+	database.ClearTestingDb()
+	defer database.ClearTestingDb()
+
+	db := createLegacyDrawingsTable()
+	db.MustExec(`INSERT INTO drawings (originalPoints, drawVectors) VALUES
+		('[{"x":4,"y":5,"time":0},{"x":5,"y":1,"time":1}]', '[{"n":0,"real":4.5,"imaginary":3}]'),
+		('[{"x":1,"y":2,"time":0}]', '[]')`)
+
+	assert.Nil(t, database.Migrate())
+
+	drawingStore := store.New()
+	processed := drawingStore.Get(1)
+	unprocessed := drawingStore.Get(2)
+
+	assert.Equal(t, []types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: 5, Y: 1, Time: 1}}, processed.OriginalPoints)
+	assert.Equal(t, []types.DrawVector{{N: 0, Real: 4.5, Imaginary: 3}}, processed.DrawVectors)
+	assert.Equal(t, []types.DrawVector{}, unprocessed.DrawVectors)
+
+	var jsonColumns int
+	db.Get(&jsonColumns, "SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'drawings' AND COLUMN_NAME IN ('originalPoints', 'drawVectors')")
+	assert.Equal(t, 0, jsonColumns)
+
+	assert.Nil(t, database.Migrate())
+}
+
+func TestMigrationMakesPointsHashUnique(t *testing.T) {
+	database.ClearTestingDb()
+	defer database.ClearTestingDb()
+
+	db := database.GetDb()
+	db.MustExec("ALTER TABLE drawings DROP KEY points_hash, ADD KEY points_hash (pointsHash)")
+	db.MustExec(`INSERT INTO drawings (points, pointsHash, state) VALUES
+		('', 'a', 'failed'), ('', 'a', 'done'), ('', 'a', 'pending'),
+		('', 'b', 'failed'), ('', 'b', 'failed'), ('', 'c', 'done')`)
+
+	assert.Nil(t, database.Migrate())
+	assert.Equal(t, map[string]int{"a": 2, "b": 4, "c": 6}, store.New().FindByHashes([]string{"a", "b", "c"}))
+
+	_, err := db.Exec("INSERT INTO drawings (points, pointsHash) VALUES ('', 'a')")
+	assert.NotNil(t, err)
+
+	assert.Nil(t, database.Migrate())
+}
+
+func TestMigrationRejectsOutOfRangePoints(t *testing.T) {
+	database.ClearTestingDb()
+	defer database.ClearTestingDb()
+
+	db := createLegacyDrawingsTable()
+	db.MustExec(`INSERT INTO drawings (originalPoints, drawVectors) VALUES ('[{"x":3000000000,"y":5,"time":0}]', '[]')`)
+
+	assert.NotNil(t, database.Migrate())
+}
+
+// createLegacyDrawingsTable replaces the drawings table with the one that
+// stored points and vectors as JSON.
+func createLegacyDrawingsTable() *sqlx.DB {
+	db := database.GetDb()
+	db.MustExec("DROP TABLE drawings")
+	db.MustExec(`CREATE TABLE drawings (
+		id int(11) unsigned NOT NULL AUTO_INCREMENT,
+		featured tinyint NOT NULL DEFAULT 0,
+		originalPoints mediumtext NOT NULL,
+		drawVectors mediumtext NOT NULL,
+		createdAt datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+		lastDrawVectorCalculatedAt datetime NULL DEFAULT NULL,
+		PRIMARY KEY (id)
+	) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci`)
+
+	return db
+}
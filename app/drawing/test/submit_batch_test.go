@@ -0,0 +1,107 @@
+package test
+
+import (
+	"github.com/stretchr/testify/assert"
+	"testing"
+
+	"api/app/drawing/store"
+	"api/app/drawing/types"
+	"api/app/drawing/wire"
+	"api/database"
+	"api/test/requester"
+)
+
+func TestBatchSubmitSuccess(t *testing.T) {
+	database.ClearTestingDb()
+	json := `{"drawings": [
+		{"points": [{"x": 4, "y": 5, "time": 0}, {"x": 5, "y": 1, "time": 1}]},
+		{"points": [{"x": 2, "y": 3, "time": 0}, {"x": 6, "y": 3, "time": 2}], "maxVectors": 20}
+	]}`
+	response := requester.Post("/drawings/batch", json)
+	assert.True(t, response.Ok())
+	assert.Equal(t, `{"ids":[1,2]}`, response.Body())
+
+	drawing := store.New().Get(2)
+	assert.Equal(t, []types.OriginalPoint{{X: 2, Y: 3, Time: 0}, {X: 6, Y: 3, Time: 2}}, drawing.OriginalPoints)
+}
+
+func TestBatchIdsFollowAutoIncrementIncrement(t *testing.T) {
+	// New connections, which ClearTestingDb opens, pick up the global value
+	database.GetDb().MustExec("SET GLOBAL auto_increment_increment = 2")
+	database.ClearTestingDb()
+
+	defer func() {
+		database.GetDb().MustExec("SET GLOBAL auto_increment_increment = 1")
+		database.ClearTestingDb()
+	}()
+
+	json := `{"drawings": [
+		{"points": [{"x": 4, "y": 5, "time": 0}]},
+		{"points": [{"x": 2, "y": 3, "time": 0}]},
+		{"points": [{"x": 6, "y": 1, "time": 0}]}
+	]}`
+	response := requester.Post("/drawings/batch", json)
+	assert.Equal(t, `{"ids":[1,3,5]}`, response.Body())
+	assert.Equal(t, []types.OriginalPoint{{X: 6, Y: 1, Time: 0}}, store.New().GetPoints(5))
+}
+
+func TestBinaryBatchSubmitSuccess(t *testing.T) {
+	database.ClearTestingDb()
+	first := []types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: 5, Y: 1, Time: 1}}
+	second := []types.OriginalPoint{{X: 2, Y: 3, Time: 0}}
+	headers := map[string]string{"Content-Type": wire.BinaryContentType}
+	response := requester.PostWithHeaders("/drawings/batch", buildBinaryBody(first, 0)+buildBinaryBody(second, 10), headers)
+	assert.True(t, response.Ok())
+	assert.Equal(t, `{"ids":[1,2]}`, response.Body())
+}
+
+func TestEmptyBatch(t *testing.T) {
+	response := requester.Post("/drawings/batch", `{"drawings": []}`)
+	assert.True(t, response.IsBadRequest())
+	assert.Equal(t, `{"message":"There needs to be at least 1 drawing."}`, response.Body())
+}
+
+func TestMalformedBatch(t *testing.T) {
+	payloads := []string{"foo", "{}", `{"drawings": [{}]}`, `{"drawings": [{"points": ["foo"]}]}`}
+
+	for _, payload := range payloads {
+		response := requester.Post("/drawings/batch", payload)
+		assert.True(t, response.IsBadRequest())
+		assert.Equal(t, `{"message":"The request is not properly formatted."}`, response.Body())
+	}
+}
+
+func TestInvalidDrawingInBatch(t *testing.T) {
+	json := `{"drawings": [
+		{"points": [{"x": 4, "y": 5, "time": 0}]},
+		{"points": [{"x": 2, "y": 3, "time": 0.5}]}
+	]}`
+	response := requester.Post("/drawings/batch", json)
+	assert.True(t, response.IsBadRequest())
+	assert.Equal(t, `{"message":"Drawing 1: The first point's time must be zero."}`, response.Body())
+}
+
+func TestOutOfRangeDrawingInBatch(t *testing.T) {
+	json := `{"drawings": [
+		{"points": [{"x": 4, "y": 5, "time": 0}]},
+		{"points": [{"x": 4, "y": -3000000000, "time": 0}]}
+	]}`
+	response := requester.Post("/drawings/batch", json)
+	assert.True(t, response.IsBadRequest())
+	assert.Equal(t, `{"message":"Drawing 1: Each point's x and y must be between -2147483648 and 2147483647."}`, response.Body())
+}
+
+func TestBatchReusesDuplicateDrawings(t *testing.T) {
+	database.ClearTestingDb()
+	requester.Post("/drawing", `{"points": [{"x": 4, "y": 5, "time": 0}, {"x": 5, "y": 1, "time": 1}]}`)
+
+	json := `{"drawings": [
+		{"points": [{"x": 2, "y": 3, "time": 0}, {"x": 6, "y": 3, "time": 2}]},
+		{"points": [{"x": 4, "y": 5, "time": 0}, {"x": 5, "y": 1, "time": 1}]},
+		{"points": [{"x": 2, "y": 3, "time": 0}, {"x": 6, "y": 3, "time": 2}]},
+		{"points": [{"x": 2, "y": 3, "time": 0}, {"x": 6, "y": 3, "time": 2}], "maxVectors": 20}
+	]}`
+	response := requester.Post("/drawings/batch", json)
+	assert.True(t, response.Ok())
+	assert.Equal(t, `{"ids":[2,1,2,3]}`, response.Body())
+}
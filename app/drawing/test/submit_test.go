@@ -1,15 +1,27 @@
 package test
 
 import (
+	"bytes"
+	"compress/gzip"
+	"encoding/binary"
 	"github.com/stretchr/testify/assert"
+	"math"
+	"net/http"
 	"os"
 	"testing"
 
+	"api/app/drawing/store"
+	"api/app/drawing/store/blob"
+	"api/app/drawing/types"
+	"api/app/drawing/wire"
+	apphttp "api/app/http"
 	"api/database"
 	"api/test/requester"
 )
 
 func TestMain(m *testing.M) {
+	// Tests that need processing workers start their own
+	os.Setenv("PROCESSING_WORKERS", "0")
 	database.SetTestingEnvironment()
 	err := database.Initialize()
 
@@ -73,3 +85,199 @@ func TestSubmitSuccess(t *testing.T) {
 	assert.True(t, response.Ok())
 	assert.Equal(t, `{"id":1}`, response.Body())
 }
+
+func TestDuplicateSubmitReturnsExistingId(t *testing.T) {
+	database.ClearTestingDb()
+	json := `{"points":[{"x": 4, "y": 5, "time": 0}, {"x": 5, "y": 1, "time": 1}], "maxVectors": 20}`
+	assert.Equal(t, `{"id":1}`, requester.Post("/drawing", json).Body())
+	assert.Equal(t, `{"id":1}`, requester.Post("/drawing", json).Body())
+
+	// Times are compared after normalizing them
+	scaled := `{"points":[{"x": 4, "y": 5, "time": 0}, {"x": 5, "y": 1, "time": 4}], "maxVectors": 20}`
+	assert.Equal(t, `{"id":1}`, requester.Post("/drawing", scaled).Body())
+
+	otherMaxVectors := `{"points":[{"x": 4, "y": 5, "time": 0}, {"x": 5, "y": 1, "time": 1}], "maxVectors": 30}`
+	assert.Equal(t, `{"id":2}`, requester.Post("/drawing", otherMaxVectors).Body())
+}
+
+func TestCoordinatesOutsideInt32(t *testing.T) {
+	message := `{"message":"Each point's x and y must be between -2147483648 and 2147483647."}`
+	bodies := []string{
+		`{"points":[{"x": 0, "y": 0, "time": 0}, {"x": 3000000000, "y": 1, "time": 1}]}`,
+		`{"points":[{"x": 0, "y": -2147483649, "time": 0}]}`,
+	}
+
+	for _, body := range bodies {
+		response := requester.Post("/drawing", body)
+		assert.True(t, response.IsBadRequest())
+		assert.Equal(t, message, response.Body())
+	}
+
+	headers := map[string]string{"Content-Type": wire.ColumnsContentType}
+	response := requester.PostWithHeaders("/drawing", `{"time": [0, 1], "x": [0, 2147483648], "y": [0, 0]}`, headers)
+	assert.True(t, response.IsBadRequest())
+	assert.Equal(t, message, response.Body())
+
+	// The largest coordinates still fit
+	database.ClearTestingDb()
+	response = requester.Post("/drawing", `{"points":[{"x": -2147483648, "y": 2147483647, "time": 0}]}`)
+	assert.True(t, response.Ok())
+}
+
+func TestResubmittingFailedDrawingQueuesItAgain(t *testing.T) {
+	database.ClearTestingDb()
+	points := []types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: 5, Y: 1, Time: 1}}
+	encoded, _ := blob.EncodePoints(points)
+	database.GetDb().MustExec("INSERT INTO drawings (points, pointsHash, state, attempts) VALUES (?, ?, 'failed', 3)", encoded, store.PointsHash(points, 20))
+
+	json := `{"points":[{"x": 4, "y": 5, "time": 0}, {"x": 5, "y": 1, "time": 1}], "maxVectors": 20}`
+	assert.Equal(t, `{"id":1}`, requester.Post("/drawing", json).Body())
+
+	status := store.New().GetStatus(1)
+	assert.Equal(t, types.StatePending, status.State)
+	assert.Equal(t, 0, status.Attempts)
+
+	batch := `{"drawings": [{"points":[{"x": 4, "y": 5, "time": 0}, {"x": 5, "y": 1, "time": 1}], "maxVectors": 20}]}`
+	database.GetDb().MustExec("UPDATE drawings SET state = 'failed', attempts = 3 WHERE id = 1")
+	assert.Equal(t, `{"ids":[1]}`, requester.Post("/drawings/batch", batch).Body())
+	assert.Equal(t, types.StatePending, store.New().GetStatus(1).State)
+}
+
+func TestCreateReturnsIdOfIdenticalDrawing(t *testing.T) {
+	database.ClearTestingDb()
+	points := []types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: 5, Y: 1, Time: 1}}
+	other := []types.OriginalPoint{{X: 2, Y: 3, Time: 0}}
+	drawingStore := store.New()
+
+	// As when a concurrent submission stores the drawing between lookup and insert
+	id := drawingStore.Create(points, "hash", 100)
+	assert.Equal(t, id, drawingStore.Create(points, "hash", 100))
+
+	ids := drawingStore.CreateMany([][]types.OriginalPoint{other, points, other}, []string{"other", "hash", ""}, []int{100, 100, 100})
+	assert.Equal(t, id, ids[1])
+	assert.NotEqual(t, ids[0], ids[2])
+	assert.Equal(t, other, drawingStore.GetPoints(ids[0]))
+	assert.Equal(t, other, drawingStore.GetPoints(ids[2]))
+}
+
+func TestPointsHash(t *testing.T) {
+	points := []types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: -5, Y: 1, Time: 0.5}, {X: 2, Y: -3, Time: 2}}
+	halved := []types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: -5, Y: 1, Time: 0.25}, {X: 2, Y: -3, Time: 1}}
+	moved := []types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: -5, Y: 2, Time: 0.5}, {X: 2, Y: -3, Time: 2}}
+
+	assert.Equal(t, 64, len(store.PointsHash(points, 100)))
+	assert.Equal(t, store.PointsHash(points, 100), store.PointsHash(halved, 100))
+	assert.NotEqual(t, store.PointsHash(points, 100), store.PointsHash(points, 99))
+	assert.NotEqual(t, store.PointsHash(points, 100), store.PointsHash(moved, 100))
+}
+
+func TestGzipSubmitSuccess(t *testing.T) {
+	database.ClearTestingDb()
+	json := `{"points":[{"x": 4, "y": 5, "time": 0}, {"x": 5, "y": 1, "time": 0}, {"x": 2, "y": 3, "time": 1.5}, {"x": 6, "y": 3, "time": 2.1}]}`
+	headers := map[string]string{"Content-Encoding": "gzip"}
+	response := requester.PostWithHeaders("/drawing", gzipString(json), headers)
+	assert.True(t, response.Ok())
+	assert.Equal(t, `{"id":1}`, response.Body())
+}
+
+func TestInvalidGzipBody(t *testing.T) {
+	headers := map[string]string{"Content-Encoding": "gzip"}
+	response := requester.PostWithHeaders("/drawing", `{"points":[]}`, headers)
+	assert.True(t, response.IsBadRequest())
+	assert.Equal(t, `{"message":"The request is not properly formatted."}`, response.Body())
+}
+
+func TestGzipBombIsRejected(t *testing.T) {
+	var buffer bytes.Buffer
+	writer := gzip.NewWriter(&buffer)
+	zeros := make([]byte, 1<<20)
+
+	for written := 0; written <= apphttp.MaxInflatedSize; written += len(zeros) {
+		writer.Write(zeros)
+	}
+
+	writer.Close()
+
+	headers := map[string]string{"Content-Encoding": "gzip"}
+	response := requester.PostWithHeaders("/drawing", buffer.String(), headers)
+	assert.Equal(t, http.StatusRequestEntityTooLarge, response.ResponseRecorder.Code)
+	assert.Equal(t, `{"message":"The request body is too large."}`, response.Body())
+}
+
+func gzipString(payload string) string {
+	var buffer bytes.Buffer
+	writer := gzip.NewWriter(&buffer)
+	writer.Write([]byte(payload))
+	writer.Close()
+
+	return buffer.String()
+}
+
+func TestColumnsSubmitSuccess(t *testing.T) {
+	database.ClearTestingDb()
+	json := `{"time": [0, 0, 1.5, 2.1], "x": [4, 5, 2, 6], "y": [5, 1, 3, 3], "maxVectors": 20}`
+	headers := map[string]string{"Content-Type": wire.ColumnsContentType}
+	response := requester.PostWithHeaders("/drawing", json, headers)
+	assert.True(t, response.Ok())
+	assert.Equal(t, `{"id":1}`, response.Body())
+}
+
+func TestColumnsLengthMismatch(t *testing.T) {
+	json := `{"time": [0, 0.5, 1], "x": [4, 5], "y": [5, 1, 3]}`
+	headers := map[string]string{"Content-Type": wire.ColumnsContentType}
+	response := requester.PostWithHeaders("/drawing", json, headers)
+	assert.True(t, response.IsBadRequest())
+	assert.Equal(t, `{"message":"The request is not properly formatted."}`, response.Body())
+}
+
+func TestBinarySubmitSuccess(t *testing.T) {
+	database.ClearTestingDb()
+	points := []types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: -5, Y: 1, Time: 0}, {X: 2, Y: -3, Time: 1.5}}
+	headers := map[string]string{"Content-Type": wire.BinaryContentType}
+	response := requester.PostWithHeaders("/drawing", buildBinaryBody(points, 20), headers)
+	assert.True(t, response.Ok())
+	assert.Equal(t, `{"id":1}`, response.Body())
+}
+
+func TestBinaryValidation(t *testing.T) {
+	points := []types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: 5, Y: 1, Time: 1}, {X: 2, Y: 3, Time: 0.5}}
+	headers := map[string]string{"Content-Type": wire.BinaryContentType}
+	response := requester.PostWithHeaders("/drawing", buildBinaryBody(points, 0), headers)
+	assert.True(t, response.IsBadRequest())
+	assert.Equal(t, `{"message":"Each point's time should be equal to or greater than the previous point."}`, response.Body())
+}
+
+func TestMalformedBinary(t *testing.T) {
+	points := []types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: 5, Y: 1, Time: 1}}
+	body := buildBinaryBody(points, 0)
+	nanPoints := []types.OriginalPoint{{X: 4, Y: 5, Time: 0}, {X: 5, Y: 1, Time: math.NaN()}}
+	payloads := []string{"", "FPTS", body[:len(body)-1], "XXXX" + body[4:], buildBinaryBody(nanPoints, 0)}
+	headers := map[string]string{"Content-Type": wire.BinaryContentType}
+
+	for _, payload := range payloads {
+		response := requester.PostWithHeaders("/drawing", payload, headers)
+		assert.True(t, response.IsBadRequest())
+		assert.Equal(t, `{"message":"The request is not properly formatted."}`, response.Body())
+	}
+}
+
+func buildBinaryBody(points []types.OriginalPoint, maxVectors int) string {
+	var buffer bytes.Buffer
+	buffer.WriteString("FPTS")
+	binary.Write(&buffer, binary.LittleEndian, []uint16{1, 0})
+	binary.Write(&buffer, binary.LittleEndian, []uint32{uint32(len(points)), uint32(maxVectors)})
+
+	for _, point := range points {
+		binary.Write(&buffer, binary.LittleEndian, point.Time)
+	}
+
+	for _, point := range points {
+		binary.Write(&buffer, binary.LittleEndian, int32(point.X))
+	}
+
+	for _, point := range points {
+		binary.Write(&buffer, binary.LittleEndian, int32(point.Y))
+	}
+
+	return buffer.String()
+}
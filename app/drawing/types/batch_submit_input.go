@@ -0,0 +1,5 @@
+package types
+
+type BatchSubmitInput struct {
+	Drawings []SubmitInput `json:"drawings"`
+}
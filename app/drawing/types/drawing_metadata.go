@@ -0,0 +1,15 @@
+package types
+
+import (
+	"api/app/formatting"
+)
+
+// DrawingMetadata is a Drawing without its points and vectors, plus its
+// processing state.
+type DrawingMetadata struct {
+	Id                         int                 `json:"id"`
+	Featured                   bool                `json:"featured"`
+	CreatedAt                  formatting.JSONTime `json:"createdAt"`
+	LastDrawVectorCalculatedAt formatting.JSONTime `json:"lastDrawVectorCalculatedAt"`
+	State                      string              `json:"state"`
+}
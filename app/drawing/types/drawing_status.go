@@ -0,0 +1,32 @@
+package types
+
+import (
+	"api/app/formatting"
+)
+
+// Drawing states, in the order a drawing goes through them. A drawing whose
+// processing keeps failing ends up failed instead of done.
+const (
+	StatePending    = "pending"
+	StateProcessing = "processing"
+	StateDone       = "done"
+	StateFailed     = "failed"
+)
+
+type DrawingStatus struct {
+	Id    int    `json:"id"`
+	State string `json:"state"`
+	// Pending drawings ahead of this one, 0 unless it is pending itself
+	Position                   int                 `json:"position"`
+	Attempts                   int                 `json:"attempts"`
+	CreatedAt                  formatting.JSONTime `json:"createdAt"`
+	ProcessingStartedAt        formatting.JSONTime `json:"processingStartedAt"`
+	LastDrawVectorCalculatedAt formatting.JSONTime `json:"lastDrawVectorCalculatedAt"`
+}
+
+type QueueStats struct {
+	Pending    int `json:"pending"`
+	Processing int `json:"processing"`
+	Failed     int `json:"failed"`
+	Workers    int `json:"workers"`
+}
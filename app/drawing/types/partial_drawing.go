@@ -0,0 +1,18 @@
+package types
+
+import (
+	"api/app/formatting"
+)
+
+// PartialDrawing holds the fields of a drawing asked for with
+// GET /drawing/:id?fields=, leaving out the others (nil). Unlike a Drawing it
+// can also carry the drawing's processing state.
+type PartialDrawing struct {
+	Id                         *int                 `json:"id,omitempty"`
+	Featured                   *bool                `json:"featured,omitempty"`
+	OriginalPoints             *[]OriginalPoint     `json:"originalPoints,omitempty"`
+	DrawVectors                *[]DrawVector        `json:"drawVectors,omitempty"`
+	CreatedAt                  *formatting.JSONTime `json:"createdAt,omitempty"`
+	LastDrawVectorCalculatedAt *formatting.JSONTime `json:"lastDrawVectorCalculatedAt,omitempty"`
+	State                      *string              `json:"state,omitempty"`
+}
@@ -0,0 +1,9 @@
+package types
+
+// ProcessingJob is a drawing claimed from the queue by a worker.
+type ProcessingJob struct {
+	DrawingId  int
+	MaxVectors int
+	// Including the one starting now
+	Attempts int
+}
@@ -0,0 +1,166 @@
+package wire
+
+import (
+	"encoding/binary"
+	"encoding/json"
+	"errors"
+	"math"
+
+	"api/app/drawing/types"
+)
+
+// Content types accepted by POST /drawing besides plain application/json.
+const (
+	// {"time": [...], "x": [...], "y": [...], "maxVectors": 100}
+	ColumnsContentType = "application/vnd.drawing.columns+json"
+
+	// A 16 byte header followed by the time (float64), x (int32) and y (int32)
+	// columns, everything little-endian:
+	//
+	//	offset 0   magic "FPTS"
+	//	offset 4   version (uint16, currently 1)
+	//	offset 6   reserved (uint16, zero)
+	//	offset 8   point count (uint32)
+	//	offset 12  maxVectors (int32, 0 for the default)
+	//
+	// A batch is any number of these records back to back.
+	BinaryContentType = "application/vnd.drawing.points"
+)
+
+const (
+	binaryMagic      = "FPTS"
+	binaryVersion    = 1
+	binaryHeaderSize = 16
+	binaryPointSize  = 8 + 4 + 4
+)
+
+var ErrMalformed = errors.New("malformed drawing body")
+
+type columnsInput struct {
+	Time       []float64 `json:"time"`
+	X          []int     `json:"x"`
+	Y          []int     `json:"y"`
+	MaxVectors int       `json:"maxVectors,omitempty"`
+}
+
+type columnsBatchInput struct {
+	Drawings []columnsInput `json:"drawings"`
+}
+
+func DecodeColumns(body []byte, input *types.SubmitInput) error {
+	columns := columnsInput{}
+
+	if err := json.Unmarshal(body, &columns); err != nil {
+		return err
+	}
+
+	return columns.build(input)
+}
+
+func DecodeColumnsBatch(body []byte, batch *types.BatchSubmitInput) error {
+	columnsBatch := columnsBatchInput{}
+
+	if err := json.Unmarshal(body, &columnsBatch); err != nil {
+		return err
+	}
+
+	if columnsBatch.Drawings == nil {
+		return nil
+	}
+
+	batch.Drawings = make([]types.SubmitInput, len(columnsBatch.Drawings))
+
+	for i, columns := range columnsBatch.Drawings {
+		if err := columns.build(&batch.Drawings[i]); err != nil {
+			return err
+		}
+	}
+
+	return nil
+}
+
+func (columns columnsInput) build(input *types.SubmitInput) error {
+	if columns.Time == nil || len(columns.X) != len(columns.Time) || len(columns.Y) != len(columns.Time) {
+		return ErrMalformed
+	}
+
+	input.Points = make([]types.OriginalPoint, len(columns.Time))
+	input.MaxVectors = columns.MaxVectors
+
+	for i := range input.Points {
+		input.Points[i] = types.OriginalPoint{X: columns.X[i], Y: columns.Y[i], Time: columns.Time[i]}
+	}
+
+	return nil
+}
+
+func DecodeBinary(body []byte, input *types.SubmitInput) error {
+	rest, err := decodeBinaryRecord(body, input)
+
+	if err == nil && len(rest) != 0 {
+		return ErrMalformed
+	}
+
+	return err
+}
+
+func DecodeBinaryBatch(body []byte, batch *types.BatchSubmitInput) error {
+	batch.Drawings = []types.SubmitInput{}
+
+	for len(body) > 0 {
+		input := types.SubmitInput{}
+		rest, err := decodeBinaryRecord(body, &input)
+
+		if err != nil {
+			return err
+		}
+
+		batch.Drawings = append(batch.Drawings, input)
+		body = rest
+	}
+
+	return nil
+}
+
+// decodeBinaryRecord decodes the record at the start of body and returns
+// whatever follows it.
+func decodeBinaryRecord(body []byte, input *types.SubmitInput) ([]byte, error) {
+	if len(body) < binaryHeaderSize || string(body[0:4]) != binaryMagic {
+		return nil, ErrMalformed
+	}
+
+	if binary.LittleEndian.Uint16(body[4:6]) != binaryVersion {
+		return nil, ErrMalformed
+	}
+
+	count := int(binary.LittleEndian.Uint32(body[8:12]))
+	size := binaryHeaderSize + count*binaryPointSize
+
+	if len(body) < size {
+		return nil, ErrMalformed
+	}
+
+	times := body[binaryHeaderSize:]
+	xs := times[count*8:]
+	ys := xs[count*4:]
+
+	input.Points = make([]types.OriginalPoint, count)
+	input.MaxVectors = int(int32(binary.LittleEndian.Uint32(body[12:16])))
+
+	for i := range input.Points {
+		time := math.Float64frombits(binary.LittleEndian.Uint64(times[i*8:]))
+
+		// JSON can't carry these, so neither may the binary format
+		if math.IsNaN(time) || math.IsInf(time, 0) {
+			return nil, ErrMalformed
+		}
+
+		input.Points[i] = types.OriginalPoint{
+			X:    int(int32(binary.LittleEndian.Uint32(xs[i*4:]))),
+			Y:    int(int32(binary.LittleEndian.Uint32(ys[i*4:]))),
+			Time: time,
+		}
+	}
+
+	return body[size:], nil
+}
@@ -2,20 +2,70 @@ package http
 
 import (
 	"bytes"
+	"compress/gzip"
 	"encoding/json"
+	"errors"
 	"github.com/labstack/echo/v4"
+	"io"
 	"io/ioutil"
 )
 
+// The most a gzipped body may inflate to, well above the largest drawing the
+// points column holds as JSON, so a small body can't expand to gigabytes.
+const MaxInflatedSize = 128 << 20
+
+var ErrBodyTooLarge = errors.New("request body inflates past MaxInflatedSize")
+
 func BuildJson(c echo.Context, inputMap interface{}) error {
+	body, err := ReadBody(c)
+
+	if err != nil {
+		return err
+	}
+
+	return json.Unmarshal(body, inputMap)
+}
+
+// ReadBody returns the request body, inflating it first when the client sent it
+// with "Content-Encoding: gzip", or ErrBodyTooLarge when it inflates past
+// MaxInflatedSize. The raw body is put back on the request so it
+// can be read again further down the chain.
+func ReadBody(c echo.Context) ([]byte, error) {
 	request := c.Request()
 	body, err := ioutil.ReadAll(request.Body)
 
 	if err != nil {
-		return err
+		return nil, err
 	}
 
 	request.Body = ioutil.NopCloser(bytes.NewBuffer(body))
 
-	return json.Unmarshal(body, inputMap)
+	if request.Header.Get(echo.HeaderContentEncoding) == "gzip" {
+		return gunzip(body)
+	}
+
+	return body, nil
+}
+
+func gunzip(body []byte) ([]byte, error) {
+	reader, err := gzip.NewReader(bytes.NewReader(body))
+
+	if err != nil {
+		return nil, err
+	}
+
+	defer reader.Close()
+
+	// One byte past the limit tells a body of exactly MaxInflatedSize from a larger one
+	inflated, err := ioutil.ReadAll(io.LimitReader(reader, MaxInflatedSize+1))
+
+	if err != nil {
+		return nil, err
+	}
+
+	if len(inflated) > MaxInflatedSize {
+		return nil, ErrBodyTooLarge
+	}
+
+	return inflated, nil
 }
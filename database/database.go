@@ -39,6 +39,12 @@ func ClearTestingDb() {
 	}
 }
 
+// Migrate brings the tables of the open database up to Schema, as Initialize
+// does when it connects.
+func Migrate() error {
+	return runMigrations(persistentDb)
+}
+
 func openConnection(databaseName string) (*sqlx.DB, error) {
 	password := "passwd"
 	print(password)
@@ -93,5 +99,47 @@ func getDbName() string {
 func runMigrations(connection *sqlx.DB) error {
 	_, err := connection.Exec(Schema)
 
+	if err != nil {
+		return err
+	}
+
+	for _, migration := range ColumnMigrations {
+		err = runColumnMigration(connection, migration)
+
+		if err != nil {
+			return err
+		}
+	}
+
+	err = migrateUniquePointsHash(connection)
+
+	if err != nil {
+		return err
+	}
+
+	return migrateJsonColumns(connection)
+}
+
+func runColumnMigration(connection *sqlx.DB, migration ColumnMigration) error {
+	exists, err := columnExists(connection, migration.Table, migration.Column)
+
+	if err != nil || exists {
+		return err
+	}
+
+	_, err = connection.Exec(migration.Statement)
+
+	if err == nil && migration.Backfill != "" {
+		_, err = connection.Exec(migration.Backfill)
+	}
+
 	return err
 }
+
+func columnExists(connection *sqlx.DB, table string, column string) (bool, error) {
+	var count int
+	query := "SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = ? AND COLUMN_NAME = ?"
+	err := connection.Get(&count, query, table, column)
+
+	return count > 0, err
+}
@@ -0,0 +1,105 @@
+package database
+
+import (
+	"encoding/json"
+	"fmt"
+
+	"github.com/jmoiron/sqlx"
+
+	"api/app/drawing/store/blob"
+	"api/app/drawing/types"
+)
+
+// Drawings moved from the JSON columns per transaction
+const jsonColumnsBatchSize = 100
+
+type jsonDrawing struct {
+	Id             int    `db:"id"`
+	OriginalPoints string `db:"originalPoints"`
+	DrawVectors    string `db:"drawVectors"`
+}
+
+// migrateJsonColumns packs the points and vectors of drawings stored as JSON,
+// before the BLOB columns existed, into those columns and then drops the JSON
+// ones. Drawings without vectors are queued for processing. Batches are
+// committed as they go, so an interrupted migration picks up where it stopped
+// the next time the API starts.
+func migrateJsonColumns(connection *sqlx.DB) error {
+	exists, err := columnExists(connection, "drawings", "originalPoints")
+
+	if err != nil || !exists {
+		return err
+	}
+
+	for {
+		moved, err := moveJsonDrawings(connection)
+
+		if err != nil {
+			return err
+		}
+
+		if moved < jsonColumnsBatchSize {
+			break
+		}
+	}
+
+	_, err = connection.Exec("ALTER TABLE drawings DROP COLUMN originalPoints, DROP COLUMN drawVectors, MODIFY points mediumblob NOT NULL")
+
+	return err
+}
+
+func moveJsonDrawings(connection *sqlx.DB) (int, error) {
+	var drawings []jsonDrawing
+
+	err := connection.Select(&drawings, "SELECT id, originalPoints, drawVectors FROM drawings WHERE points IS NULL ORDER BY id LIMIT ?", jsonColumnsBatchSize)
+
+	if err != nil {
+		return 0, err
+	}
+
+	tx, err := connection.Beginx()
+
+	if err != nil {
+		return 0, err
+	}
+
+	for _, drawing := range drawings {
+		var points []types.OriginalPoint
+		var vectors []types.DrawVector
+
+		if err := json.Unmarshal([]byte(drawing.OriginalPoints), &points); err != nil {
+			tx.Rollback()
+			return 0, fmt.Errorf("drawing %d: originalPoints: %v", drawing.Id, err)
+		}
+
+		if err := json.Unmarshal([]byte(drawing.DrawVectors), &vectors); err != nil {
+			tx.Rollback()
+			return 0, fmt.Errorf("drawing %d: drawVectors: %v", drawing.Id, err)
+		}
+
+		encodedPoints, err := blob.EncodePoints(points)
+
+		if err != nil {
+			tx.Rollback()
+			return 0, fmt.Errorf("drawing %d: originalPoints: %v", drawing.Id, err)
+		}
+
+		// "[]" was stored until a drawing was processed, NULL is now
+		var encodedVectors []byte
+		state := "pending"
+
+		if len(vectors) > 0 {
+			encodedVectors = blob.EncodeVectors(vectors)
+			state = "done"
+		}
+
+		_, err = tx.Exec("UPDATE drawings SET points = ?, vectors = ?, state = ? WHERE id = ?", encodedPoints, encodedVectors, state, drawing.Id)
+
+		if err != nil {
+			tx.Rollback()
+			return 0, err
+		}
+	}
+
+	return len(drawings), tx.Commit()
+}
@@ -0,0 +1,34 @@
+package database
+
+import (
+	"github.com/jmoiron/sqlx"
+)
+
+// migrateUniquePointsHash makes points_hash a unique key in databases that
+// got it before it was one. Of the drawings sharing a hash, the oldest one not
+// failed (or the oldest one, when all of them failed) keeps it and the others
+// lose it, so they are never matched again.
+func migrateUniquePointsHash(connection *sqlx.DB) error {
+	var nonUnique []int
+	query := "SELECT NON_UNIQUE FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'drawings' AND INDEX_NAME = 'points_hash'"
+	err := connection.Select(&nonUnique, query)
+
+	if err != nil || len(nonUnique) == 0 || nonUnique[0] == 0 {
+		return err
+	}
+
+	_, err = connection.Exec(`UPDATE drawings
+		JOIN (
+			SELECT pointsHash, COALESCE(MIN(IF(state != 'failed', id, NULL)), MIN(id)) AS keptId
+			FROM drawings WHERE pointsHash IS NOT NULL GROUP BY pointsHash HAVING COUNT(*) > 1
+		) AS kept ON drawings.pointsHash = kept.pointsHash AND drawings.id != kept.keptId
+		SET drawings.pointsHash = NULL`)
+
+	if err != nil {
+		return err
+	}
+
+	_, err = connection.Exec("ALTER TABLE drawings DROP KEY points_hash, ADD UNIQUE KEY points_hash (pointsHash)")
+
+	return err
+}
@@ -4,12 +4,63 @@ var Schema string = `
 CREATE TABLE IF NOT EXISTS drawings (
   id int(11) unsigned NOT NULL AUTO_INCREMENT,
   featured tinyint NOT NULL DEFAULT 0,
-  originalPoints mediumtext NOT NULL,
-  drawVectors mediumtext NOT NULL,
+  points mediumblob NOT NULL,
+  vectors mediumblob NULL DEFAULT NULL,
+  maxVectors smallint unsigned NOT NULL DEFAULT 100,
+  state enum('pending', 'processing', 'done', 'failed') NOT NULL DEFAULT 'pending',
+  attempts tinyint unsigned NOT NULL DEFAULT 0,
+  pointsHash char(64) NULL DEFAULT NULL,
+  svgPreview text NULL DEFAULT NULL,
   createdAt datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  processingStartedAt datetime NULL DEFAULT NULL,
+  retryAfter datetime(3) NULL DEFAULT NULL,
   lastDrawVectorCalculatedAt datetime NULL DEFAULT NULL,
   PRIMARY KEY (id),
   KEY creation_time (createdAt),
-  KEY featured (featured, createdAt)
+  KEY featured (featured, createdAt),
+  UNIQUE KEY points_hash (pointsHash),
+  KEY queue (state, id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 `
+
+// ColumnMigration adds a column to a table created before the column was
+// part of Schema. It is skipped when the column already exists. Backfill, if
+// any, runs right after Statement to fill the column in for existing rows.
+type ColumnMigration struct {
+	Table     string
+	Column    string
+	Statement string
+	Backfill  string
+}
+
+var ColumnMigrations = []ColumnMigration{
+	{
+		Table:     "drawings",
+		Column:    "pointsHash",
+		Statement: "ALTER TABLE drawings ADD COLUMN pointsHash char(64) NULL DEFAULT NULL AFTER drawVectors, ADD UNIQUE KEY points_hash (pointsHash)",
+	},
+	{
+		Table:     "drawings",
+		Column:    "svgPreview",
+		Statement: "ALTER TABLE drawings ADD COLUMN svgPreview text NULL DEFAULT NULL AFTER pointsHash",
+	},
+	{
+		// Filled in from the JSON columns by migrateJsonColumns
+		Table:     "drawings",
+		Column:    "points",
+		Statement: "ALTER TABLE drawings ADD COLUMN points mediumblob NULL DEFAULT NULL AFTER featured, ADD COLUMN vectors mediumblob NULL DEFAULT NULL AFTER points",
+	},
+	{
+		// Drawings left unprocessed by the in-memory queue are queued again.
+		// Those still in the JSON columns get their state from migrateJsonColumns.
+		Table:     "drawings",
+		Column:    "state",
+		Statement: "ALTER TABLE drawings ADD COLUMN maxVectors smallint unsigned NOT NULL DEFAULT 100 AFTER vectors, ADD COLUMN state enum('pending', 'processing', 'done', 'failed') NOT NULL DEFAULT 'pending' AFTER maxVectors, ADD COLUMN attempts tinyint unsigned NOT NULL DEFAULT 0 AFTER state, ADD COLUMN processingStartedAt datetime NULL DEFAULT NULL AFTER createdAt, ADD KEY queue (state, id)",
+		Backfill:  "UPDATE drawings SET state = 'done' WHERE vectors IS NOT NULL",
+	},
+	{
+		Table:     "drawings",
+		Column:    "retryAfter",
+		Statement: "ALTER TABLE drawings ADD COLUMN retryAfter datetime(3) NULL DEFAULT NULL AFTER processingStartedAt",
+	},
+}
@@ -614,7 +614,8 @@ document.addEventListener('DOMContentLoaded', function() {
         // Setup polling interval
         pollingIntervalId = setInterval(async () => {
             try {
-                const response = await fetch(`${API_URL}/drawing/${drawingId}`);
+                // Only the vectors, not the points; the browser revalidates with the ETag
+                const response = await fetch(`${API_URL}/drawing/${drawingId}?fields=id,drawVectors,lastDrawVectorCalculatedAt`);
                 const data = await response.json();
                 console.log('Polling drawing results:', data);
                 
@@ -6,9 +6,9 @@ import (
 )
 
 func main() {
-	e := app.New()
-
+	// Before app.New, whose processing workers start on the database
 	dbError := database.Initialize()
+	e := app.New()
 
 	if dbError == nil {
 		e.Logger.Fatal(e.Start(":8081"))
@@ -0,0 +1,6 @@
+"""
+Shared helpers for the sample drawing scripts.
+
+Modules are imported explicitly (``from fourier_artist.client import send_drawing``)
+so that a script only pays for the dependencies it actually uses.
+"""
@@ -0,0 +1,45 @@
+"""
+Command line flags shared by the sample scripts and the offline tools.
+
+Kept apart from the modules that act on them (preprocess, planner, render)
+so a parser can be built, and --help answered, without importing NumPy.
+"""
+# preprocess.preprocess modes
+MODES = ("none", "grid", "simplify")
+
+RENDERERS = ("matplotlib", "numpy", "none")
+
+
+def add_reduce_arguments(parser):
+    """Add the --reduce and --tolerance flags shared by the sample scripts"""
+    parser.add_argument("--reduce", choices=MODES, default="none",
+                        help="shrink the drawing before upload: resample onto the API's time grid or simplify it")
+    parser.add_argument("--tolerance", type=float, default=1.0,
+                        help="maximum distance a point may move when simplifying (default: 1)")
+
+
+def add_plan_arguments(parser):
+    """Add the flags that let the sample scripts plan maxVectors instead of using their fixed value"""
+    parser.add_argument("--target-distance", type=float,
+                        help="plan maxVectors for this root mean square distance to the drawing")
+    parser.add_argument("--energy-fraction", type=float,
+                        help="plan maxVectors to capture this fraction of the drawing's energy, e.g. 0.999")
+
+
+def add_render_arguments(parser, default="matplotlib"):
+    """Add the rendering flags shared by the art scripts"""
+    parser.add_argument("--render", choices=RENDERERS, default=default,
+                        help="PNG renderer: full matplotlib visualization, fast NumPy preview or none")
+    parser.add_argument("--background", action="store_true",
+                        help="render in a separate process while the drawing is submitted")
+    parser.add_argument("--dpi", type=int, default=300, help="matplotlib resolution (default: 300)")
+    parser.add_argument("--size", type=int, default=1000, help="NumPy preview width and height in pixels")
+
+
+def add_profile_arguments(parser):
+    """Add the flags that time every phase of a run, see profiling.py"""
+    parser.add_argument("--profile", metavar="FILE",
+                        help="write per-phase timings and peak memory as JSON, adding to FILE if it exists")
+    parser.add_argument("--trace", metavar="FILE", help="write the phases as a Chrome trace-event file")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also measure each phase's Python allocations with tracemalloc (slower)")
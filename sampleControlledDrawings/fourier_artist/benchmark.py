@@ -0,0 +1,250 @@
+"""
+Benchmarks for the sample generators, the request body encoders, the two
+matplotlib visualizations and their NumPy previews.
+
+Every case is timed (best of `repeat` runs) and then run once more under
+tracemalloc for its peak memory, which NumPy reports its buffers to. Results
+are compared with a JSON baseline: a tracked case fails when its time or
+peak memory grows by more than the threshold. Cases missing from the
+baseline are reported but never fail, so record one with --update on the
+machine the comparison runs on.
+
+Rendering goes through the Agg backend and no API server is needed.
+
+Usage (from sampleControlledDrawings):
+    python -m fourier_artist.benchmark                 # compare with benchmark_baseline.json
+    python -m fourier_artist.benchmark --update        # record the baseline
+    python -m fourier_artist.benchmark --sizes 1000 15000 --match encode/
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from .points import to_api_points
+from .shapes import GENERATORS, generator, load_script
+from .wire import encode_binary, encode_columns, encode_json
+
+SIZES = (1000, 15000, 50000, 1000000)
+# Rendering a million point PNG takes minutes, the visualizations stop here
+VISUALIZATION_SIZES = (1000, 15000)
+# Width and height of the NumPy previews, which are benchmarked at every size
+PREVIEW_PIXELS = 256
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.25
+# Timings this short are mostly noise, allow them this much slack on top of the threshold
+MIN_SECONDS = 0.005
+
+
+@dataclass
+class Case:
+    name: str
+    # Does the untimed setup and returns the function to time
+    prepare: Callable[[], Callable[[], object]]
+
+
+def sample_drawing(size):
+    return generator("circle_sin", "generate_sinusoidal_circle")(size)
+
+
+def generator_cases(sizes):
+    for module, function in GENERATORS:
+        for size in sizes:
+            def prepare(module=module, function=function, size=size):
+                generate = generator(module, function)
+
+                return lambda: generate(size)
+
+            yield Case(f"generate/{function}/{size}", prepare)
+
+
+def encoding_cases(sizes):
+    encoders = {
+        "payload": lambda points: {"points": to_api_points(points), "maxVectors": 100},
+        "json": lambda points: encode_json(points, 100),
+        "columns": lambda points: encode_columns(points, 100),
+        "binary": lambda points: encode_binary(points, 100),
+    }
+
+    for name, encode in encoders.items():
+        for size in sizes:
+            def prepare(encode=encode, size=size):
+                points = sample_drawing(size)
+
+                return lambda: encode(points)
+
+            yield Case(f"encode/{name}/{size}", prepare)
+
+
+def visualization_cases(sizes, output_dir):
+    for size in sizes:
+        def prepare_single_stroke(size=size):
+            script = load_script("single_stroke_art")
+            points = script.generate_single_stroke_art(num_points=size, visualize=False)
+            filename = os.path.join(output_dir, f"single_stroke_art_{size}.png")
+
+            return lambda: script.create_visualization(points, 200, filename)
+
+        def prepare_superformula(size=size):
+            script = load_script("superformula_art")
+            vis_points, points = script.generate_layers(size)
+            filename = os.path.join(output_dir, f"superformula_art_{size}.png")
+
+            return lambda: script.create_visualization(vis_points, points, 200, filename)
+
+        yield Case(f"visualize/single_stroke_art/{size}", prepare_single_stroke)
+        yield Case(f"visualize/superformula_art/{size}", prepare_superformula)
+
+
+def preview_cases(sizes, output_dir):
+    for size in sizes:
+        def prepare_single_stroke(size=size):
+            script = load_script("single_stroke_art")
+            points = script.generate_single_stroke_art(num_points=size, visualize=False)
+            filename = os.path.join(output_dir, f"single_stroke_art_{size}_preview.png")
+
+            return lambda: script.create_preview(points, filename, size=PREVIEW_PIXELS)
+
+        def prepare_superformula(size=size):
+            script = load_script("superformula_art")
+            vis_points, points = script.generate_layers(size)
+            filename = os.path.join(output_dir, f"superformula_art_{size}_preview.png")
+
+            return lambda: script.create_preview(vis_points, points, 200, filename, size=PREVIEW_PIXELS)
+
+        yield Case(f"preview/single_stroke_art/{size}", prepare_single_stroke)
+        yield Case(f"preview/superformula_art/{size}", prepare_superformula)
+
+
+def all_cases(sizes=SIZES, visualization_sizes=VISUALIZATION_SIZES, output_dir="."):
+    return [
+        *generator_cases(sizes),
+        *encoding_cases(sizes),
+        *visualization_cases(visualization_sizes, output_dir),
+        *preview_cases(sizes, output_dir),
+    ]
+
+
+def measure(case, repeat=3):
+    """Best time of `repeat` runs and the peak memory of one more, traced, run"""
+    function = case.prepare()
+    timings = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": min(timings), "peak_bytes": peak}
+
+
+def compare(baseline, results, threshold=DEFAULT_THRESHOLD):
+    """
+    Return a description of every tracked case in results that got slower or
+    used more memory than the baseline allows.
+    """
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        expected = baseline[name]
+        allowed_seconds = expected["seconds"] * (1 + threshold) + MIN_SECONDS
+        allowed_bytes = expected["peak_bytes"] * (1 + threshold)
+
+        if result["seconds"] > allowed_seconds:
+            regressions.append(f"{name}: {result['seconds']:.4f}s, baseline {expected['seconds']:.4f}s")
+
+        if result["peak_bytes"] > allowed_bytes:
+            regressions.append(f"{name}: {result['peak_bytes']} bytes peak, baseline {expected['peak_bytes']}")
+
+    return regressions
+
+
+def environment():
+    import matplotlib
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def read_baseline(path):
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return json.load(f)["cases"]
+
+
+def write_baseline(path, results):
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "cases": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the generators, encoders and visualizations")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--update", action="store_true", help="write the results to the baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative growth in time or peak memory (default: 0.25)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="point counts for generators and encoders")
+    parser.add_argument("--visualization-sizes", type=int, nargs="+", default=VISUALIZATION_SIZES)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the fastest counts")
+    parser.add_argument("--match", default="", help="only run cases whose name contains this")
+    args = parser.parse_args(argv)
+
+    baseline = read_baseline(args.baseline)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for case in all_cases(args.sizes, args.visualization_sizes, output_dir):
+            if args.match not in case.name:
+                continue
+
+            results[case.name] = measure(case, args.repeat)
+            result = results[case.name]
+            change = ""
+
+            if case.name in baseline:
+                change = f" ({result['seconds'] / max(baseline[case.name]['seconds'], 1e-9) - 1:+.0%})"
+
+            print(f"{case.name:50} {result['seconds']:10.4f}s{change:8} {result['peak_bytes'] / 2**20:10.1f} MiB")
+
+    if args.update:
+        write_baseline(args.baseline, {**baseline, **results})
+        print(f"Wrote {len(results)} cases to {args.baseline}")
+        return 0
+
+    regressions = compare(baseline, results, args.threshold)
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
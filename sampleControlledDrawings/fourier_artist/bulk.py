@@ -0,0 +1,238 @@
+"""
+Submit many drawings concurrently and wait for the API to process them.
+
+Each drawing is submitted, then long-polled with GET /drawing/:id?wait=
+for its vectors only, the API answering as soon as it has processed it.
+Two limits keep the run honest:
+
+- `concurrency` caps the HTTP requests in flight.
+- `max_pending` caps drawings submitted but not yet processed. The API queues
+  them in its database for a fixed pool of workers, so submitting far ahead
+  only lengthens the queue and the polling.
+
+A long poll mostly waits on the API, so it does not count against
+`concurrency`: every pending drawing may have one open besides.
+
+The HTTP calls go through the pooled DrawingClient on a thread pool sized to
+`concurrency + max_pending`, so no extra HTTP library is needed. Drawings whose vectors are
+in the result cache (see cache.py) are not submitted at all.
+
+Usage: python -m fourier_artist.bulk drawing.npy other.json ... [--concurrency 8]
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from . import profiling
+from .arguments import add_profile_arguments
+from .cache import default_cache
+from .client import DEFAULT_API_URL, DrawingClient
+from .validation import DEFAULT_MAX_VECTORS
+
+# Enough to keep the workers of a small API instance busy
+DEFAULT_MAX_PENDING = 10
+
+# Seconds the API may hold every poll until the drawing is processed
+DEFAULT_POLL_WAIT = 10
+
+
+@dataclass
+class BulkResult:
+    index: int
+    drawing_id: Optional[int] = None
+    submit_latency: Optional[float] = None
+    processing_latency: Optional[float] = None
+    vector_count: int = 0
+    error: Optional[str] = None
+    # The vectors came from the result cache, nothing was sent to the API
+    cached: bool = False
+
+
+async def submit_all(drawings, max_vectors=DEFAULT_MAX_VECTORS, api_url=DEFAULT_API_URL, concurrency=8,
+                     max_pending=DEFAULT_MAX_PENDING, poll_interval=1.0, poll_timeout=300.0,
+                     poll_wait=DEFAULT_POLL_WAIT, client=None, cache=None):
+    """
+    Submit every drawing in an iterable of point arrays and wait for all of
+    them to be processed. The iterable is consumed lazily as pending slots
+    free up. Returns one BulkResult per drawing, in input order. cache is the
+    ResultCache for the client created here, when none is passed. Without a
+    poll_wait, drawings are polled every poll_interval seconds instead.
+    """
+    own_client = client is None
+    client = client or DrawingClient(api_url, pool_size=concurrency + max_pending, cache=cache)
+    executor = ThreadPoolExecutor(max_workers=concurrency + max_pending)
+    request_slots = asyncio.Semaphore(concurrency)
+    pending_slots = asyncio.Semaphore(max_pending)
+    loop = asyncio.get_running_loop()
+
+    async def call(function, *args):
+        async with request_slots:
+            return await loop.run_in_executor(executor, function, *args)
+
+    async def long_poll(drawing_id):
+        return await loop.run_in_executor(executor, client.processed, drawing_id, poll_wait)
+
+    async def track(index, points):
+        result = BulkResult(index)
+
+        try:
+            entry = client.cached(points, max_vectors)
+
+            if entry is not None and entry.get("drawVectors"):
+                result.drawing_id = entry["id"]
+                result.vector_count = len(entry["drawVectors"])
+                result.submit_latency = result.processing_latency = 0.0
+                result.cached = True
+
+                return result
+
+            started = time.perf_counter()
+            response = await call(client.submit, points, max_vectors)
+            submitted = time.perf_counter()
+            result.drawing_id = response["id"]
+            result.submit_latency = submitted - started
+            polling = profiling.now()
+            polls = 0
+
+            while True:
+                if poll_wait:
+                    drawing = await long_poll(result.drawing_id)
+                else:
+                    drawing = await call(client.processed, result.drawing_id)
+
+                polls += 1
+
+                if drawing is not None:
+                    result.processing_latency = time.perf_counter() - submitted
+                    result.vector_count = len(drawing["drawVectors"])
+                    profiling.record("poll", polling, drawing=result.drawing_id, polls=polls)
+                    break
+
+                if time.perf_counter() - submitted > poll_timeout:
+                    raise TimeoutError(f"no vectors after {poll_timeout:.0f}s")
+
+                if not poll_wait:
+                    await asyncio.sleep(poll_interval)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        finally:
+            pending_slots.release()
+
+        return result
+
+    tasks = []
+
+    try:
+        for index, points in enumerate(drawings):
+            await pending_slots.acquire()
+            tasks.append(asyncio.create_task(track(index, points)))
+
+        return list(await asyncio.gather(*tasks))
+    finally:
+        executor.shutdown(wait=False)
+
+        if own_client:
+            client.close()
+
+
+def run(drawings, **options):
+    """Blocking wrapper around submit_all"""
+    return asyncio.run(submit_all(drawings, **options))
+
+
+def percentiles(values, quantiles=(50, 90, 95, 99)):
+    if not values:
+        return {}
+
+    return {f"p{q}": float(np.percentile(values, q)) for q in quantiles}
+
+
+def summarize(results, elapsed=None):
+    """Counts and latency percentiles (seconds) for a list of BulkResults"""
+    succeeded = [result for result in results if result.error is None]
+    summary = {
+        "drawings": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "cached": sum(result.cached for result in results),
+        "submit_latency": percentiles([result.submit_latency for result in succeeded]),
+        "processing_latency": percentiles([result.processing_latency for result in succeeded]),
+    }
+
+    if elapsed:
+        summary["elapsed"] = elapsed
+        summary["throughput_per_minute"] = 60 * len(succeeded) / elapsed
+
+    return summary
+
+
+def load_drawing(path):
+    """Read a drawing saved as .npy (point array) or .json (points list or a POST /drawing payload)"""
+    if path.endswith(".npy"):
+        return np.load(path)
+
+    with open(path) as f:
+        data = json.load(f)
+
+    return data["points"] if isinstance(data, dict) else data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Submit drawings concurrently and wait until they are processed")
+    parser.add_argument("files", nargs="+", help=".npy point arrays or .json point lists")
+    parser.add_argument("--repeat", type=int, default=1, help="submit every file this many times")
+    parser.add_argument("--max-vectors", type=int, default=DEFAULT_MAX_VECTORS)
+    parser.add_argument("--api-url", default=DEFAULT_API_URL)
+    parser.add_argument("--concurrency", type=int, default=8, help="HTTP requests in flight")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING,
+                        help="drawings submitted but not processed yet")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds between polls without --poll-wait")
+    parser.add_argument("--poll-wait", type=int, default=DEFAULT_POLL_WAIT,
+                        help="seconds the API may hold a poll until the drawing is processed, 0 to poll")
+    parser.add_argument("--no-cache", action="store_true", help="submit every drawing, ignoring the result cache")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.profile or args.trace:
+        profiling.enable(args.trace_memory)
+
+    drawings = (load_drawing(path) for _ in range(args.repeat) for path in args.files)
+
+    started = time.perf_counter()
+    results = run(
+        drawings,
+        max_vectors=args.max_vectors,
+        api_url=args.api_url,
+        concurrency=args.concurrency,
+        max_pending=args.max_pending,
+        poll_interval=args.poll_interval,
+        poll_wait=args.poll_wait,
+        cache=None if args.no_cache else default_cache(),
+    )
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        if result.error:
+            print(f"#{result.index}: failed ({result.error})")
+        elif result.cached:
+            print(f"#{result.index}: drawing {result.drawing_id}, {result.vector_count} vectors, cached")
+        else:
+            print(f"#{result.index}: drawing {result.drawing_id}, {result.vector_count} vectors, "
+                  f"submit {result.submit_latency:.3f}s, processing {result.processing_latency:.3f}s")
+
+    print(json.dumps(summarize(results, elapsed), indent=2))
+
+    profile = profiling.finish(args.profile, args.trace)
+
+    if profile is not None:
+        print(profiling.report(profile))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+On-disk cache of submitted drawings, keyed by their content.
+
+The key is a SHA-256 of the canonical point buffer (the validated point array,
+as the binary wire format sends it) and the clamped maxVectors, so the same
+drawing generated twice has the same key however its points were built. Each
+entry is a small JSON file holding the id the API returned and, once the
+drawing was processed, its drawVectors.
+
+The cache is bounded by the total size of its files. Reading an entry bumps
+its modification time and writing one evicts the least recently used entries
+until the cache fits again. The directory is only scanned for the first write,
+later ones keep its size and order up to date in memory. Files are replaced
+atomically, so several processes (CI jobs, the nightly batch) can share one
+directory; entries another process writes meanwhile are counted from the next
+run on.
+
+The directory is $FOURIER_ARTIST_CACHE, or ~/.cache/fourier_artist;
+FOURIER_ARTIST_CACHE=off disables the cache for the scripts. Ids are only
+reused for the API URL that returned them. After resetting that API's
+database, clear the cache:
+
+    python -m fourier_artist.cache --clear
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from .validation import clamp_max_vectors, validate_points
+
+CACHE_ENVIRONMENT_VARIABLE = "FOURIER_ARTIST_CACHE"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "fourier_artist")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Part of every key, change it when the key or the entries change meaning
+KEY_VERSION = b"fourier-artist-cache-1"
+
+ENTRY_SUFFIX = ".json"
+
+
+def cache_key(points, max_vectors):
+    """Hex SHA-256 of the drawing's canonical point buffer and its clamped maxVectors"""
+    points = np.ascontiguousarray(validate_points(points))
+    digest = hashlib.sha256(KEY_VERSION)
+    digest.update(struct.pack("<I", clamp_max_vectors(max_vectors)))
+    # Hashed in place, a large drawing is not copied into bytes first
+    digest.update(points.view(np.uint8))
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # Size of every entry by path, least recently used first, and their
+        # total; read from the directory by the first put
+        self.index = None
+        self.total = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        """The entry for a key, or None. A hit makes it the most recently used entry."""
+        path = self.path(key)
+
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if self.index is not None and path in self.index:
+            self.index.move_to_end(path)
+
+        return entry
+
+    def put(self, key, entry):
+        """Store an entry, then evict least recently used entries beyond max_bytes"""
+        path = self.path(key)
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+
+        try:
+            with os.fdopen(handle, "w") as f:
+                json.dump(entry, f, separators=(",", ":"))
+                size = f.tell()
+
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+        if self.index is None:
+            self.load_index()
+
+        self.total += size - self.index.pop(path, 0)
+        self.index[path] = size
+        self.evict()
+
+    def load_index(self):
+        self.index = OrderedDict((path, size) for _, size, path in self.entries())
+        self.total = sum(self.index.values())
+
+    def entries(self):
+        """(modification time, size, path) of every entry, oldest first"""
+        entries = []
+
+        with os.scandir(self.directory) as files:
+            for file in files:
+                if not file.name.endswith(ENTRY_SUFFIX):
+                    continue
+
+                try:
+                    stat = file.stat()
+                except FileNotFoundError:
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, file.path))
+
+        return sorted(entries)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_bytes"""
+        if self.index is None:
+            self.load_index()
+
+        while self.total > self.max_bytes and self.index:
+            path, size = self.index.popitem(last=False)
+
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+            self.total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+        self.index = None
+        self.total = 0
+
+
+def default_cache():
+    """The cache the scripts use, or None when FOURIER_ARTIST_CACHE is off"""
+    directory = os.environ.get(CACHE_ENVIRONMENT_VARIABLE) or DEFAULT_CACHE_DIR
+
+    if directory.lower() == "off":
+        return None
+
+    return ResultCache(directory)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or clear the local drawing cache")
+    parser.add_argument("--clear", action="store_true", help="remove every entry")
+    args = parser.parse_args(argv)
+
+    cache = default_cache()
+
+    if cache is None:
+        print(f"The cache is disabled ({CACHE_ENVIRONMENT_VARIABLE}=off)")
+        return
+
+    if args.clear:
+        cache.clear()
+
+    entries = cache.entries()
+    size = sum(size for _, size, _ in entries)
+    print(f"{cache.directory}: {len(entries)} drawings, {size / 1024 / 1024:.1f} of "
+          f"{cache.max_bytes / 1024 / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
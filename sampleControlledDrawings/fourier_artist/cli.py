@@ -0,0 +1,244 @@
+"""
+One command line for every sample generator, a subcommand per shape:
+
+    python -m fourier_artist spiral --points 20000 --max-vectors 200
+    python -m fourier_artist superformula --render numpy --background
+    python -m fourier_artist curly_maze --no-submit --out maze.npy
+
+Every shape takes the same flags. Only argparse is imported to build the
+parser; NumPy, the generator's script and the HTTP client are imported once a
+command runs and needs them, and matplotlib only for a matplotlib rendering.
+So --help answers at once, and a batch job that calls a generator thousands
+of times only pays for what it uses. The sample scripts (python spiral.py)
+run through here too.
+"""
+import argparse
+import sys
+from typing import Callable, NamedTuple, Optional
+
+from .arguments import add_plan_arguments, add_profile_arguments, add_reduce_arguments, add_render_arguments
+
+
+def _generate_superformula(script, num_points, params):
+    vis_points, points = script.generate_layers(num_points, **params)
+    renderers = {
+        "matplotlib": (script.create_visualization, (vis_points, points, params["scale"])),
+        "numpy": (script.create_preview, (vis_points, points, params["scale"])),
+    }
+
+    return points, renderers
+
+
+def _generate_single_stroke(script, num_points, params):
+    points = script.generate_single_stroke_art(num_points, visualize=False, **params)
+    renderers = {
+        "matplotlib": (script.create_visualization, (points, params["scale"])),
+        "numpy": (script.create_preview, (points,)),
+    }
+
+    return points, renderers
+
+
+# A NamedTuple rather than a dataclass, which would import inspect before --help
+class Shape(NamedTuple):
+    script: str
+    function: str
+    title: str
+    points: int = 15000
+    max_vectors: int = 100
+    params: Optional[dict] = None
+    # For the art scripts, which render themselves: (script, num_points, params) ->
+    # (points, {renderer: (the script's rendering function, its arguments)})
+    generate: Optional[Callable] = None
+
+
+SHAPES = {
+    "circle": Shape("draw_circle", "generate_circle_points", "circle", points=1000),
+    "sinusoidal_circle": Shape("circle_sin", "generate_sinusoidal_circle", "sinusoidal circle",
+                               params={"a": 100, "b": 20, "freq": 3}),
+    "curly_maze": Shape("curly_maze", "generate_curly_maze", "curly maze", max_vectors=500,
+                        params={"size": 200, "complexity": 7, "density": 0.8}),
+    "ellipse": Shape("ellipse", "generate_ellipse", "ellipse", params={"a": 150, "b": 80}),
+    "spiral": Shape("spiral", "generate_spiral", "Archimedean spiral", params={"a": 10, "b": 1, "num_turns": 15}),
+    "golden_spiral": Shape("spiral", "generate_golden_spiral", "golden spiral", params={"scale": 1, "num_turns": 10}),
+    "square": Shape("square", "generate_square", "square", params={"side_length": 200}),
+    "single_stroke": Shape("single_stroke_art", "generate_single_stroke_art", "single stroke art", max_vectors=200,
+                           params={"scale": 250, "complexity": 3}, generate=_generate_single_stroke),
+    "superformula": Shape("superformula_art", "generate_complex_drawing", "superformula art", max_vectors=150,
+                          params={"scale": 200}, generate=_generate_superformula),
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m fourier_artist",
+                                     description="Generate a drawing and send it to the drawing API")
+    commands = parser.add_subparsers(dest="shape", metavar="SHAPE", required=True)
+
+    for name, shape in SHAPES.items():
+        command = commands.add_parser(name, help=f"draw the {shape.title}",
+                                      description=f"Generate the {shape.title} and send it to the drawing API")
+        command.add_argument("--points", type=int, default=shape.points,
+                             help=f"points to generate (default: {shape.points})")
+        command.add_argument("--max-vectors", type=int, default=shape.max_vectors,
+                             help=f"maxVectors to ask for (default: {shape.max_vectors})")
+        command.add_argument("--api-url", help="drawing API (default: http://localhost:8081)")
+        command.add_argument("--no-submit", action="store_true", help="only generate, render or save the drawing")
+        command.add_argument("--out", help="also save the points as .npy or .json (what bulk and planner read)")
+        add_render_arguments(command, default="matplotlib" if shape.generate else "none")
+        add_reduce_arguments(command)
+        add_plan_arguments(command)
+        add_profile_arguments(command)
+
+    return parser
+
+
+def _timestamp():
+    from datetime import datetime
+
+    return datetime.now().strftime("%Y%m%d%H%M%S")
+
+
+def create_visualization(points, name, filename=None, dpi=300):
+    """A matplotlib plot of the stroke, for the shapes without a visualization of their own"""
+    from .render import pyplot
+
+    filename = filename or f"{name}_{_timestamp()}.png"
+    plt = pyplot()
+    plt.figure(figsize=(10, 10))
+    plt.plot(points["x"], points["y"], linewidth=1)
+    plt.axis("equal")
+    plt.axis("off")
+    plt.savefig(filename, dpi=dpi, bbox_inches="tight")
+    plt.close()
+    print(f"Saved visualization as {filename}")
+
+    return filename
+
+
+def create_preview(points, name, filename=None, size=1000):
+    """A NumPy preview of the stroke, for the shapes without a preview of their own"""
+    from .render import Canvas, hsv_gradient
+
+    filename = filename or f"{name}_{_timestamp()}_preview.png"
+    canvas = Canvas.fit(points["x"], points["y"], size=size)
+    canvas.polyline(points["x"], points["y"], hsv_gradient(len(points) - 1), width=max(size // 500, 1))
+    canvas.save(filename)
+    print(f"Saved preview as {filename}")
+
+    return filename
+
+
+def save_drawing(points, path):
+    """Write the points where bulk.load_drawing reads them back: a .npy point array or a .json points list"""
+    if path.endswith(".npy"):
+        import numpy as np
+
+        np.save(path, points)
+    else:
+        import json
+
+        from .points import to_api_points
+
+        with open(path, "w") as f:
+            json.dump(to_api_points(points), f)
+
+    print(f"Saved {len(points)} points as {path}")
+
+
+def start_rendering(renderers, args):
+    from .render import start_render
+
+    if args.render == "none":
+        return None
+
+    function, arguments = renderers[args.render]
+    options = {"dpi": args.dpi} if args.render == "matplotlib" else {"size": args.size}
+
+    return start_render(function, *arguments, background=args.background, **options)
+
+
+def run(args):
+    from . import profiling
+    from .planner import apply_plan_arguments
+    from .preprocess import apply_reduce_arguments
+    from .shapes import load_script
+
+    shape = SHAPES[args.shape]
+
+    with profiling.phase("import", script=shape.script):
+        script = load_script(shape.script)
+
+    print(f"Generating {args.points} points for the {shape.title}...")
+
+    with profiling.phase("generate", shape=args.shape, points=args.points):
+        if shape.generate is not None:
+            points, renderers = shape.generate(script, args.points, dict(shape.params))
+        else:
+            points = getattr(script, shape.function)(num_points=args.points, **(shape.params or {}))
+            renderers = {
+                "matplotlib": (create_visualization, (points, shape.script)),
+                "numpy": (create_preview, (points, shape.script)),
+            }
+
+    # The PNG is made in the background if asked, so the upload does not wait for it
+    rendering = start_rendering(renderers, args)
+
+    if args.out:
+        save_drawing(points, args.out)
+
+    with profiling.phase("reduce", mode=args.reduce):
+        points = apply_reduce_arguments(points, args)
+
+    with profiling.phase("plan"):
+        max_vectors = apply_plan_arguments(points, args.max_vectors, args)
+
+    if not args.no_submit:
+        with profiling.phase("submit", points=len(points)):
+            submit(points, max_vectors, args.api_url, shape.title)
+
+    if rendering is not None:
+        with profiling.phase("render wait", background=args.background):
+            rendering.result()
+
+
+def submit(points, max_vectors, api_url, title):
+    import json
+
+    from .client import DEFAULT_API_URL, send_drawing
+
+    print("Sending drawing to API...")
+    result = send_drawing(points, max_vectors=max_vectors, api_url=api_url or DEFAULT_API_URL)
+
+    if result:
+        print("Success! API response:")
+        print(json.dumps(result, indent=2))
+        print(f"Drawing ID: {result.get('id')}")
+        print(f"Visit http://localhost:3000 to see your {title}")
+    else:
+        print("Failed to send drawing to API")
+
+    return result
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if not (args.profile or args.trace):
+        run(args)
+        return
+
+    from . import profiling
+
+    profiling.enable(args.trace_memory)
+
+    try:
+        run(args)
+    finally:
+        profile = profiling.finish(args.profile, args.trace)
+
+    print(profiling.report(profile))
+
+
+def script_main(shape):
+    """The __main__ of a sample script: its shape's subcommand with the script's arguments"""
+    main([shape, *sys.argv[1:]])
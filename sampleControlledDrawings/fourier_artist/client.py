@@ -0,0 +1,376 @@
+"""
+Pooled HTTP client for the drawing API.
+
+One DrawingClient keeps a keep-alive connection pool open for the whole run,
+sends drawings in the compact binary wire format, gzips request bodies and
+retries with jittered exponential backoff when the API answers 5xx or the
+connection is reset.
+
+Drawings of STREAM_MIN_POINTS points or more, and drawings given as a point
+generator (submit_stream), are sent as a chunked request whose body is encoded
+and gzipped a chunk at a time, so memory stays flat however large they are.
+
+Clients waiting for a drawing to be processed poll processed(), which asks
+GET /drawing/:id for only the fields it needs, optionally holding the request
+open until the drawing is processed (?wait=), and sends back the ETag of the
+last answer so an unchanged drawing costs a bodiless 304.
+
+Given a ResultCache (see cache.py), a client does not submit a drawing it
+already submitted to the same API with the same maxVectors, it returns the
+cached id instead, and it records the drawVectors once get() sees them.
+"""
+import gzip
+import json
+import random
+import time
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import profiling
+from .cache import cache_key, default_cache
+from .validation import DEFAULT_MAX_VECTORS, InvalidSubmission, clamp_max_vectors, validate_points
+from .wire import FORMATS, STREAM_CHUNK_POINTS, encode, encode_batch, gzip_chunks, stream
+
+DEFAULT_API_URL = "http://localhost:8081"
+
+# Bodies smaller than this are not worth the gzip header and CPU
+GZIP_MIN_SIZE = 1024
+
+# Point arrays this large are streamed instead of encoded into one body
+STREAM_MIN_POINTS = 1 << 18
+
+
+# Responses kept for conditional GETs, oldest dropped first
+ETAG_CACHE_SIZE = 1024
+
+# What processed() asks for: enough to tell the drawing is processed and draw it
+PROCESSED_FIELDS = ("id", "state", "drawVectors", "lastDrawVectorCalculatedAt")
+
+
+class ProcessingFailed(Exception):
+    """The API gave up processing a drawing after retrying it"""
+
+
+class DrawingClient:
+    def __init__(self, api_url=DEFAULT_API_URL, pool_size=10, retries=3, backoff=0.25, compress=True, timeout=60,
+                 wire_format="binary", cache=None, stream_min_points=STREAM_MIN_POINTS):
+        self.api_url = api_url.rstrip("/")
+        self.cache = cache
+        # Cache key of every drawing id submitted (or found in the cache) by this client
+        self.cache_keys = {}
+        self.wire_format = wire_format
+        self.retries = retries
+        self.backoff = backoff
+        self.compress = compress
+        self.timeout = timeout
+        self.stream_min_points = stream_min_points
+        # (drawing id, fields) of the latest GET /drawing/:id answers: (ETag, drawing)
+        self.etags = {}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def submit(self, points, max_vectors=DEFAULT_MAX_VECTORS):
+        """
+        Validate and submit a drawing, returning the API response ({"id": ...}).
+        Raises InvalidSubmission without contacting the API if it would be rejected.
+        Large point arrays and anything that is not a list or an array go
+        through submit_stream.
+        """
+        if not isinstance(points, (list, tuple, np.ndarray)):
+            return self.submit_stream(points, max_vectors)
+
+        if isinstance(points, np.ndarray) and points.shape[0] >= self.stream_min_points:
+            return self.submit_stream(points, max_vectors)
+
+        with profiling.phase("validate", points=len(points)):
+            points = validate_points(points)
+
+        max_vectors = clamp_max_vectors(max_vectors)
+        key, drawing_id = self.cached_id(points, max_vectors)
+
+        if drawing_id is not None:
+            return {"id": drawing_id}
+
+        with profiling.phase("encode", format=self.wire_format, points=points.shape[0]):
+            content_type, body = encode(points, max_vectors, self.wire_format)
+        response = self.post("/drawing", body, content_type).json()
+        self.remember(key, response["id"], max_vectors)
+
+        return response
+
+    def submit_stream(self, points, max_vectors=DEFAULT_MAX_VECTORS, chunk_points=STREAM_CHUNK_POINTS):
+        """
+        Submit a drawing in a chunked request, encoding (and gzipping) its body
+        a chunk at a time while it is sent. points is a point array or any
+        iterable of point dicts or (time, x, y) rows. A one-shot iterable
+        streams as JSON, is validated while it is sent and cannot be retried.
+        """
+        max_vectors = clamp_max_vectors(max_vectors)
+        replayable = isinstance(points, np.ndarray)
+        key, drawing_id = self.cached_id(points, max_vectors) if replayable else (None, None)
+
+        if drawing_id is not None:
+            return {"id": drawing_id}
+
+        wire_format = self.wire_format if replayable else "json"
+
+        def body():
+            # Validates a point array before anything is sent
+            chunks = stream(points, max_vectors, wire_format, chunk_points)[1]
+
+            return gzip_chunks(chunks) if self.compress else chunks
+
+        headers = {"Content-Type": FORMATS[wire_format][0]}
+
+        if self.compress:
+            headers["Content-Encoding"] = "gzip"
+
+        retries = self.retries if replayable else 0
+        response = self.request("POST", "/drawing", body=body, retries=retries, headers=headers).json()
+        self.remember(key, response["id"], max_vectors)
+
+        return response
+
+    def submit_batch(self, drawings, max_vectors=DEFAULT_MAX_VECTORS):
+        """
+        Validate and submit many drawings in one POST /drawings/batch request,
+        returning their ids in order. max_vectors is either one value for every
+        drawing or a sequence with one value per drawing.
+        """
+        with profiling.phase("validate", drawings=len(drawings)):
+            drawings = [validate_points(points) for points in drawings]
+
+        if isinstance(max_vectors, int) or max_vectors is None:
+            max_vectors = [max_vectors] * len(drawings)
+
+        batch = [(points, clamp_max_vectors(vectors)) for points, vectors in zip(drawings, max_vectors)]
+        cached = [self.cached_id(points, vectors) for points, vectors in batch]
+        ids = [drawing_id for _, drawing_id in cached]
+        missing = [index for index, drawing_id in enumerate(ids) if drawing_id is None]
+
+        if missing:
+            with profiling.phase("encode", format=self.wire_format, drawings=len(missing)):
+                content_type, body = encode_batch([batch[index] for index in missing], self.wire_format)
+            new_ids = self.post("/drawings/batch", body, content_type).json()["ids"]
+
+            for index, drawing_id in zip(missing, new_ids):
+                ids[index] = drawing_id
+                self.remember(cached[index][0], drawing_id, batch[index][1])
+
+        return ids
+
+    def get(self, drawing_id, fields=None, wait=None):
+        """
+        The drawing, or only the given fields of it. With wait, the API holds
+        the request for up to that many seconds until the drawing is processed.
+        A drawing unchanged since this client last got the same fields is
+        answered 304 and comes from memory.
+        """
+        params = {}
+
+        if fields is not None:
+            fields = tuple(fields)
+            params["fields"] = ",".join(fields)
+
+        if wait:
+            params["wait"] = int(wait)
+
+        etag_key = (drawing_id, fields)
+        known = self.etags.get(etag_key)
+        headers = {"If-None-Match": known[0]} if known is not None else {}
+        # A long poll is answered after up to wait seconds, on top of the usual timeout
+        timeout = self.timeout + (int(wait) if wait else 0)
+
+        response = self.request("GET", f"/drawing/{drawing_id}", params=params, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and known is not None:
+            drawing = known[1]
+        else:
+            drawing = response.json()
+            self.remember_etag(etag_key, response.headers.get("ETag"), drawing)
+
+        key = self.cache_keys.get(drawing_id)
+
+        if key is not None and drawing.get("drawVectors"):
+            entry = self.cache.get(key)
+
+            if entry is not None and not entry.get("drawVectors"):
+                entry["drawVectors"] = drawing["drawVectors"]
+                self.cache.put(key, entry)
+
+        return drawing
+
+    def remember_etag(self, key, etag, drawing):
+        self.etags.pop(key, None)
+
+        if etag is None:
+            return
+
+        if len(self.etags) >= ETAG_CACHE_SIZE:
+            del self.etags[next(iter(self.etags))]
+
+        self.etags[key] = (etag, drawing)
+
+    def status(self, drawing_id):
+        """
+        Where a drawing is in the API's queue: {"id", "state", "position",
+        "attempts", "createdAt", "processingStartedAt",
+        "lastDrawVectorCalculatedAt"}, where state is pending, processing,
+        done or failed and position counts the pending drawings ahead of it.
+        """
+        return self.request("GET", f"/drawing/{drawing_id}/status").json()
+
+    def processed(self, drawing_id, wait=None, fields=PROCESSED_FIELDS):
+        """
+        The drawing (only fields, which always include state) once the API has
+        processed it, None while it is queued. With wait, the API is asked to
+        answer as soon as it is processed, within that many seconds.
+        """
+        fields = tuple(fields) if "state" in fields else tuple(fields) + ("state",)
+        drawing = self.get(drawing_id, fields=fields, wait=wait)
+
+        if drawing["state"] == "failed":
+            raise ProcessingFailed(f"drawing {drawing_id} failed processing")
+
+        return drawing if drawing["state"] == "done" else None
+
+    def recent(self):
+        """The gallery previews, [{"id", "svgPath"}], of the 20 newest drawings, newest first"""
+        return self.request("GET", "/drawings/recent").json()
+
+    def cached(self, points, max_vectors=DEFAULT_MAX_VECTORS):
+        """
+        The cache entry ({"apiUrl", "id", "maxVectors", "drawVectors"}) for a
+        drawing submitted to this client's API, or None
+        """
+        if self.cache is None:
+            return None
+
+        entry = self.cache.get(cache_key(points, max_vectors))
+
+        if entry is None or entry["apiUrl"] != self.api_url:
+            return None
+
+        return entry
+
+    def cached_id(self, points, max_vectors):
+        """(cache key, id this API gave the drawing before or None), the key is None without a cache"""
+        if self.cache is None:
+            return None, None
+
+        key = cache_key(points, max_vectors)
+        entry = self.cache.get(key)
+
+        if entry is None or entry["apiUrl"] != self.api_url:
+            return key, None
+
+        self.cache_keys[entry["id"]] = key
+
+        return key, entry["id"]
+
+    def remember(self, key, drawing_id, max_vectors):
+        if self.cache is None:
+            return
+
+        self.cache_keys[drawing_id] = key
+        entry = {"apiUrl": self.api_url, "id": drawing_id, "maxVectors": max_vectors, "drawVectors": None}
+        self.cache.put(key, entry)
+
+    def post_json(self, path, payload):
+        body = json.dumps(payload, separators=(",", ":")).encode()
+
+        return self.post(path, body, "application/json")
+
+    def post(self, path, body, content_type):
+        headers = {"Content-Type": content_type}
+
+        if self.compress and len(body) >= GZIP_MIN_SIZE:
+            with profiling.phase("compress", bytes=len(body)):
+                body = gzip.compress(body, compresslevel=5, mtime=0)
+
+            headers["Content-Encoding"] = "gzip"
+
+        return self.request("POST", path, data=body, headers=headers)
+
+    def request(self, method, path, body=None, retries=None, **kwargs):
+        """
+        Send a request, retrying 5xx responses and connection errors. body is
+        an optional function returning a fresh iterator of body chunks for
+        every attempt, which requests sends with chunked transfer encoding
+        (so a streamed body is encoded within the request's phase).
+        """
+        url = f"{self.api_url}{path}"
+        retries = self.retries if retries is None else retries
+        kwargs.setdefault("timeout", self.timeout)
+
+        for attempt in range(retries + 1):
+            last_attempt = attempt == retries
+
+            if body is not None:
+                kwargs["data"] = body()
+
+            try:
+                with profiling.phase("request", method=method, path=path, attempt=attempt,
+                                     stream=body is not None) as request_phase:
+                    response = self.session.request(method, url, **kwargs)
+                    request_phase.set(status=response.status_code)
+            except requests.exceptions.ConnectionError:
+                if last_attempt:
+                    raise
+            else:
+                if response.status_code < 500 or last_attempt:
+                    response.raise_for_status()
+
+                    return response
+
+            time.sleep(self.backoff_delay(attempt))
+
+    def backoff_delay(self, attempt):
+        """Full jitter: a random delay up to backoff * 2^attempt seconds"""
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+
+_clients = {}
+
+
+def get_client(api_url=DEFAULT_API_URL):
+    """
+    Return the shared client for an API URL, so repeated calls reuse its
+    connections. It uses the default result cache unless that is turned off.
+    """
+    if api_url not in _clients:
+        _clients[api_url] = DrawingClient(api_url, cache=default_cache())
+
+    return _clients[api_url]
+
+
+def send_drawing(points, max_vectors=DEFAULT_MAX_VECTORS, api_url=DEFAULT_API_URL):
+    """
+    Submit a drawing through the shared client.
+    Prints the problem and returns None on failure, like the scripts always did.
+    """
+    try:
+        return get_client(api_url).submit(points, max_vectors)
+    except InvalidSubmission as e:
+        print(f"Invalid drawing: {e}")
+    except requests.exceptions.RequestException as e:
+        print(f"Error sending request: {e}")
+        if e.response is not None:
+            print(f"Response status code: {e.response.status_code}")
+            print(f"Response body: {e.response.text}")
+
+    return None
@@ -0,0 +1,370 @@
+"""
+A local library of generated drawings, memory-mapped from disk.
+
+A dataset is a directory of three files:
+
+- points.bin: the point arrays of every drawing back to back, as POINT_DTYPE
+  records. Points are read as views into a read-only memory map, so opening a
+  dataset loads none of them and reading a drawing copies nothing.
+- vectors.bin: the drawVectors the API returned, as VECTOR_DTYPE records,
+  read the same way.
+- index.jsonl: one line per drawing with its name, generator, parameters,
+  point count, offset into points.bin, content hash (the ResultCache key)
+  and, once submitted, its drawing id, API URL and vectors.
+
+All three are only appended to. Changes to a drawing (its id, its vectors)
+are appended to the index as update lines, replayed over the drawing's line
+when the dataset is opened; `compact` rewrites the index without them.
+Records are written before the index line referring to them, so an
+interrupted append leaves at most unreferenced records behind. A dataset has
+one writer at a time.
+
+Drawings made by a sample generator are looked up by the generator and its
+keyword arguments, so `generate` only runs a generator the first time:
+
+    python -m fourier_artist.dataset library add spiral.generate_spiral --param num_turns=5:40 --steps 36
+    python -m fourier_artist.dataset library list --generator spiral.generate_spiral
+    python -m fourier_artist.dataset library submit --wait
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .cache import cache_key
+from .points import POINT_DTYPE
+from .series import VECTOR_DTYPE, as_vector_array
+from .shapes import generator as load_generator
+from .validation import DEFAULT_MAX_VECTORS, clamp_max_vectors, validate_points
+
+POINTS_FILE = "points.bin"
+VECTORS_FILE = "vectors.bin"
+INDEX_FILE = "index.jsonl"
+
+# Drawings per POST /drawings/batch, the API accepts up to 1000
+DEFAULT_BATCH = 100
+
+
+@dataclass
+class Entry:
+    index: int
+    name: str
+    generator: Optional[str]
+    # The generator's keyword arguments, num_points included
+    params: dict
+    count: int
+    offset: int
+    hash: str
+    max_vectors: int
+    drawing_id: Optional[int] = None
+    api_url: Optional[str] = None
+    # (offset, count) of the drawVectors in vectors.bin
+    vectors: Optional[tuple] = None
+
+    def record(self):
+        return {"name": self.name, "generator": self.generator, "params": self.params, "points": self.count,
+                "offset": self.offset, "hash": self.hash, "maxVectors": self.max_vectors, "id": self.drawing_id,
+                "apiUrl": self.api_url, "vectors": self.vectors}
+
+    def update(self, record):
+        self.drawing_id = record.get("id", self.drawing_id)
+        self.api_url = record.get("apiUrl", self.api_url)
+        self.max_vectors = record.get("maxVectors", self.max_vectors)
+
+        if "vectors" in record:
+            self.vectors = tuple(record["vectors"]) if record["vectors"] is not None else None
+
+
+def _params_key(generator, params):
+    return generator, json.dumps(params, sort_keys=True)
+
+
+class DrawingDataset:
+    def __init__(self, directory):
+        self.directory = directory
+        self.entries = []
+        # (generator, canonical params) -> index of the first drawing made with them
+        self.by_params = {}
+        self.maps = {}
+        os.makedirs(directory, exist_ok=True)
+        self.read_index()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def read_index(self):
+        try:
+            f = open(self.path(INDEX_FILE))
+        except FileNotFoundError:
+            return
+
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # The last line of an interrupted write
+                    continue
+
+                if "update" in record:
+                    self.entries[record["update"]].update(record)
+                    continue
+
+                vectors = record["vectors"]
+                self.add(Entry(len(self.entries), record["name"], record["generator"], record["params"],
+                               record["points"], record["offset"], record["hash"], record["maxVectors"],
+                               record["id"], record["apiUrl"], tuple(vectors) if vectors is not None else None))
+
+    def add(self, entry):
+        self.entries.append(entry)
+
+        if entry.generator is not None:
+            self.by_params.setdefault(_params_key(entry.generator, entry.params), entry.index)
+
+    def write_index(self, record):
+        with open(self.path(INDEX_FILE), "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def write_records(self, name, records):
+        """Append records to a .bin file, returning the offset (in records) they start at"""
+        itemsize = records.dtype.itemsize
+
+        with open(self.path(name), "ab") as f:
+            end = f.tell()
+            # A partial record from an interrupted append is overwritten
+            f.truncate(end - end % itemsize)
+            np.ascontiguousarray(records).tofile(f)
+
+        return end // itemsize
+
+    def view(self, name, dtype, offset, count):
+        """count records from offset, a view into the file's memory map"""
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+
+        mapped = self.maps.get(name)
+
+        # The file grew since it was mapped
+        if mapped is None or mapped.shape[0] < offset + count:
+            size = os.path.getsize(self.path(name)) // dtype.itemsize
+            mapped = self.maps[name] = np.memmap(self.path(name), dtype=dtype, mode="r", shape=(size,))
+
+        return mapped[offset:offset + count]
+
+    def append(self, points, name=None, generator=None, params=None, max_vectors=DEFAULT_MAX_VECTORS):
+        """Validate and store a drawing, returning its Entry"""
+        points = validate_points(points)
+        max_vectors = clamp_max_vectors(max_vectors)
+        index = len(self.entries)
+        offset = self.write_records(POINTS_FILE, points)
+        entry = Entry(index, name or f"drawing-{index}", generator, dict(params or {}), points.shape[0], offset,
+                      cache_key(points, max_vectors), max_vectors)
+        self.write_index(entry.record())
+        self.add(entry)
+
+        return entry
+
+    def points(self, index):
+        """The drawing's point array, read-only and not copied"""
+        entry = self.entries[index]
+
+        return self.view(POINTS_FILE, POINT_DTYPE, entry.offset, entry.count)
+
+    def vectors(self, index):
+        """The drawVectors stored for the drawing as a read-only vector array, or None"""
+        entry = self.entries[index]
+
+        if entry.vectors is None:
+            return None
+
+        return self.view(VECTORS_FILE, VECTOR_DTYPE, *entry.vectors)
+
+    def drawings(self, entries=None):
+        """Lazily yield the point arrays of entries (default: every drawing), for bulk.run and the like"""
+        for entry in self.entries if entries is None else entries:
+            yield self.points(entry.index)
+
+    def lookup(self, generator, params):
+        """The first drawing made by generator with exactly these keyword arguments, or None"""
+        index = self.by_params.get(_params_key(generator, params))
+
+        return None if index is None else self.entries[index]
+
+    def find(self, generator=None, name=None, params=None):
+        """Drawings matching the generator and name given, whose parameters include every item of params"""
+        params = params or {}
+
+        return [
+            entry for entry in self.entries
+            if (generator is None or entry.generator == generator) and (name is None or entry.name == name)
+            and all(key in entry.params and entry.params[key] == value for key, value in params.items())
+        ]
+
+    def generate(self, generator, num_points, params=None, max_vectors=DEFAULT_MAX_VECTORS, name=None):
+        """
+        The Entry for a sample generator ("spiral.generate_spiral") called with
+        params, running it and appending the drawing only when the dataset
+        does not have it yet.
+        """
+        params = {"num_points": num_points, **(params or {})}
+        entry = self.lookup(generator, params)
+
+        if entry is not None:
+            return entry
+
+        module, _, function = generator.partition(".")
+        options = dict(params)
+        num_points = options.pop("num_points")
+        points = load_generator(module, function, **options)(num_points)
+
+        return self.append(points, name, generator, params, max_vectors)
+
+    def set_result(self, index, drawing_id=None, api_url=None, max_vectors=None, vectors=None):
+        """Record what the API returned for a drawing: its id, and its drawVectors once processed"""
+        entry = self.entries[index]
+        update = {"update": index}
+
+        if drawing_id is not None:
+            update.update({"id": drawing_id, "apiUrl": api_url})
+
+        if max_vectors is not None and max_vectors != entry.max_vectors:
+            # Vectors computed for another maxVectors no longer apply
+            update.update({"maxVectors": max_vectors, "vectors": None})
+
+        if vectors is not None:
+            vectors = as_vector_array(vectors)
+            update["vectors"] = [self.write_records(VECTORS_FILE, vectors), vectors.shape[0]]
+
+        self.write_index(update)
+        entry.update(update)
+
+    def submit(self, client, entries=None, max_vectors=None, batch=DEFAULT_BATCH):
+        """
+        Submit drawings (default: every drawing) with a DrawingClient, in batch
+        requests of `batch` drawings, and record their ids. Each drawing is
+        sent with max_vectors, or the maxVectors it was stored with.
+        """
+        entries = list(self.entries if entries is None else entries)
+
+        for first in range(0, len(entries), batch):
+            chunk = entries[first:first + batch]
+            limits = [clamp_max_vectors(max_vectors or entry.max_vectors) for entry in chunk]
+            ids = client.submit_batch(list(self.drawings(chunk)), limits)
+
+            for entry, drawing_id, limit in zip(chunk, ids, limits):
+                self.set_result(entry.index, drawing_id, client.api_url, limit)
+
+        return entries
+
+    def fetch(self, client, entries=None):
+        """
+        Store the drawVectors of the submitted drawings (default: every
+        drawing) the client's API has processed. Returns the drawings that
+        are still queued; those the API failed to process are left out.
+        """
+        waiting = []
+
+        for entry in self.entries if entries is None else entries:
+            if entry.vectors is not None or entry.drawing_id is None or entry.api_url != client.api_url:
+                continue
+
+            drawing = client.get(entry.drawing_id, fields=("state", "drawVectors"))
+
+            if drawing["state"] == "done":
+                self.set_result(entry.index, vectors=drawing["drawVectors"])
+            elif drawing["state"] != "failed":
+                waiting.append(entry)
+
+        return waiting
+
+    def compact(self):
+        """Rewrite the index with one line per drawing, folding the update lines in"""
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+
+        try:
+            with os.fdopen(handle, "w") as f:
+                for entry in self.entries:
+                    f.write(json.dumps(entry.record(), separators=(",", ":")) + "\n")
+
+            os.replace(temporary, self.path(INDEX_FILE))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+def main(argv=None):
+    from .client import DEFAULT_API_URL, DrawingClient
+    from .sweep import grid, parse_param
+
+    parser = argparse.ArgumentParser(description="Build, inspect and submit a local library of drawings")
+    parser.add_argument("directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="generate drawings that are not in the dataset yet")
+    add.add_argument("generator", help="module.function, e.g. spiral.generate_spiral")
+    add.add_argument("--points", type=int, default=15000)
+    add.add_argument("--param", action="append", default=[], type=parse_param, metavar="NAME=VALUES",
+                     help="comma separated values or a LOW:HIGH range, every combination is added")
+    add.add_argument("--steps", type=int, default=5, help="values per range (default: 5)")
+    add.add_argument("--max-vectors", type=int, default=DEFAULT_MAX_VECTORS)
+
+    show = commands.add_parser("list", help="print the index")
+    show.add_argument("--generator")
+
+    submit = commands.add_parser("submit", help="submit the drawings and record their ids")
+    submit.add_argument("--generator")
+    submit.add_argument("--api-url", default=DEFAULT_API_URL)
+    submit.add_argument("--max-vectors", type=int, help="default: each drawing's own")
+    submit.add_argument("--batch", type=int, default=DEFAULT_BATCH)
+    submit.add_argument("--wait", action="store_true", help="poll until every drawing has its vectors, then store them")
+    submit.add_argument("--poll-interval", type=float, default=1.0)
+
+    commands.add_parser("compact", help="fold the update lines into the index")
+    args = parser.parse_args(argv)
+
+    dataset = DrawingDataset(args.directory)
+
+    if args.command == "add":
+        before = len(dataset)
+
+        for params in grid(dict(args.param), args.steps):
+            dataset.generate(args.generator, args.points, params, args.max_vectors)
+
+        print(f"Added {len(dataset) - before} drawings, {len(dataset)} in {args.directory}")
+    elif args.command == "list":
+        for entry in dataset.find(args.generator):
+            drawing = f", drawing {entry.drawing_id}" if entry.drawing_id is not None else ""
+            vectors = f", {entry.vectors[1]} vectors" if entry.vectors is not None else ""
+            print(f"#{entry.index} {entry.name}: {entry.generator} {entry.params}, {entry.count} points{drawing}{vectors}")
+    elif args.command == "submit":
+        entries = dataset.find(args.generator)
+
+        with DrawingClient(args.api_url) as client:
+            dataset.submit(client, entries, args.max_vectors, args.batch)
+            waiting = dataset.fetch(client, entries)
+
+            while args.wait and waiting:
+                time.sleep(args.poll_interval)
+                waiting = dataset.fetch(client, waiting)
+
+        print(f"Submitted {len(entries)} drawings, {len(waiting)} waiting for vectors")
+    else:
+        dataset.compact()
+
+
+if __name__ == "__main__":
+    main()
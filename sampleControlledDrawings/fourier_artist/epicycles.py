@@ -0,0 +1,291 @@
+"""
+Reconstruct drawings from their drawVectors and export epicycle animations.
+
+The API (calculateOutput) and the frontend (animate) evaluate the series one
+time at a time, a complex exponential per vector. Here the whole trajectory
+comes out of one inverse FFT on a uniform time grid, or of one
+(times x vectors) matrix product for arbitrary times, and the epicycles of
+many frames at once out of a cumulative sum over that matrix.
+
+Animations are rendered with the NumPy rasterizer in a process pool, a chunk
+of frames per task, and streamed in order to a writer: ffmpeg (MP4 or GIF)
+when it is on the PATH, otherwise Pillow for GIF. Every worker receives the
+vectors once, tasks only carry frame ranges.
+
+Usage (from sampleControlledDrawings):
+    python -m fourier_artist.epicycles 42 drawing42.mp4 --fps 60 --seconds 5
+    python -m fourier_artist.epicycles drawing.json drawing.gif --size 400
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .client import DEFAULT_API_URL, DrawingClient
+from .render import Canvas, hsv_gradient
+from .series import BLOCK_ELEMENTS, as_vector_array
+
+# Trail resolution, the API's sample grid
+TRAIL_SAMPLES = 1000
+
+BACKGROUND = (24, 24, 24)
+
+
+def _terms(vectors):
+    vectors = as_vector_array(vectors)
+
+    return vectors["n"].astype(np.float64), vectors["real"] + 1j * vectors["imaginary"]
+
+
+def trajectory(vectors, times):
+    """The drawing's position at each time (normalized 0..1), from (times x vectors) matrix products"""
+    n, c = _terms(vectors)
+    times = np.asarray(times, dtype=np.float64)
+    positions = np.empty(times.shape[0], dtype=np.complex128)
+    block = max(1, BLOCK_ELEMENTS // max(n.shape[0], 1))
+
+    for first in range(0, times.shape[0], block):
+        t = times[first:first + block]
+        positions[first:first + block] = np.exp(2j * np.pi * np.outer(t, n)) @ c
+
+    return positions
+
+
+def uniform_trajectory(vectors, samples=TRAIL_SAMPLES):
+    """The drawing's position at times k / samples for k = 0..samples-1, from one inverse FFT"""
+    n, c = _terms(vectors)
+    spectrum = np.zeros(samples, dtype=np.complex128)
+
+    # Frequencies beyond the grid alias onto it exactly, e^(2 pi i n k / samples) only depends on n mod samples
+    np.add.at(spectrum, n.astype(np.int64) % samples, c)
+
+    return np.fft.ifft(spectrum) * samples
+
+
+def epicycle_centers(vectors, times):
+    """
+    (len(times), vectors + 1) complex array: per time the origin, then the end
+    of every vector added in order. The last column is the drawing's position.
+    """
+    n, c = _terms(vectors)
+    times = np.asarray(times, dtype=np.float64)
+
+    centers = np.zeros((times.shape[0], n.shape[0] + 1), dtype=np.complex128)
+    np.cumsum(c * np.exp(2j * np.pi * np.outer(times, n)), axis=1, out=centers[:, 1:])
+
+    return centers
+
+
+def iter_epicycles(vectors, frames, chunk=32):
+    """Yield (times, epicycle_centers) for `frames` evenly spaced times, `chunk` frames at a time"""
+    times = np.arange(frames) / frames
+
+    for first in range(0, frames, chunk):
+        yield times[first:first + chunk], epicycle_centers(vectors, times[first:first + chunk])
+
+
+class FrameRenderer:
+    """Draws the epicycles, arms and trail of one frame with the NumPy rasterizer"""
+
+    def __init__(self, vectors, frames, size=512, circle_segments=48):
+        self.vectors = as_vector_array(vectors)
+        self.frames = frames
+        self.trail = uniform_trajectory(self.vectors, TRAIL_SAMPLES)
+        self.radii = np.hypot(self.vectors["real"], self.vectors["imaginary"])
+
+        # Fixed view over the whole trail and the origin the first vector starts from
+        x = np.append(self.trail.real, 0)
+        y = np.append(self.trail.imag, 0)
+        self.canvas = Canvas.fit(x, y, size=size, background=BACKGROUND, margin=0.1)
+
+        # Circles under a pixel across are not worth drawing
+        self.visible = np.flatnonzero(self.radii * self.canvas.scale >= 1)
+        self.colors = hsv_gradient(self.visible.shape[0])
+        angles = np.linspace(0, 2 * np.pi, circle_segments + 1)
+        self.circle = np.exp(1j * angles)
+
+    def render(self, time, centers):
+        canvas = self.canvas
+        canvas.clear()
+
+        # Circles: one segment per step around each visible circle, colored by vector order
+        rims = centers[self.visible, np.newaxis] + self.radii[self.visible, np.newaxis] * self.circle
+        colors = np.repeat(self.colors, self.circle.shape[0] - 1, axis=0)
+        canvas.lines(rims[:, :-1].real.ravel(), rims[:, :-1].imag.ravel(),
+                     rims[:, 1:].real.ravel(), rims[:, 1:].imag.ravel(), colors, alpha=0.35)
+
+        # Arms from each center to the next
+        canvas.polyline(centers.real, centers.imag, (200, 200, 200), alpha=0.6)
+
+        # The trail drawn so far, ending at the current position
+        drawn = self.trail[:int(time * TRAIL_SAMPLES) + 1]
+        canvas.polyline(np.append(drawn.real, centers[-1].real), np.append(drawn.imag, centers[-1].imag),
+                        (255, 214, 102), width=2)
+
+        return canvas.pixels.copy()
+
+    def render_range(self, first, last):
+        """Frames first..last-1 as a (frames, size, size, 3) uint8 array"""
+        times = np.arange(first, last) / self.frames
+        centers = epicycle_centers(self.vectors, times)
+
+        return np.stack([self.render(time, row) for time, row in zip(times, centers)])
+
+
+_renderer = None
+
+
+def _start_worker(renderer):
+    global _renderer
+    _renderer = renderer
+
+
+def _render_chunk(first, last):
+    return _renderer.render_range(first, last)
+
+
+def render_frames(vectors, frames, size=512, workers=None, chunk=16):
+    """
+    Yield the frames of one turn of the animation in order, rendered `chunk`
+    frames per task in a pool of `workers` processes (all CPUs by default, 1
+    renders in this process). At most two tasks per worker are in flight, so
+    memory stays flat however long the animation is.
+    """
+    renderer = FrameRenderer(vectors, frames, size)
+    ranges = [(first, min(first + chunk, frames)) for first in range(0, frames, chunk)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for first, last in ranges:
+            yield from renderer.render_range(first, last)
+
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker, initargs=(renderer,)) as executor:
+        pending = deque()
+
+        for first, last in ranges:
+            pending.append(executor.submit(_render_chunk, first, last))
+
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+
+class FFmpegWriter:
+    """Pipes raw RGB frames into ffmpeg, which picks the format from the file name"""
+
+    def __init__(self, filename, size, fps):
+        codec = ["-c:v", "libx264", "-pix_fmt", "yuv420p"] if filename.endswith(".mp4") else []
+        self.process = subprocess.Popen(
+            ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+             "-s", f"{size}x{size}", "-r", str(fps), "-i", "-", *codec, filename],
+            stdin=subprocess.PIPE,
+        )
+
+    def write(self, frame):
+        self.process.stdin.write(frame.tobytes())
+
+    def close(self):
+        self.process.stdin.close()
+
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {self.process.returncode}")
+
+
+class GifWriter:
+    """
+    Pillow GIF writer for when ffmpeg is missing. Pillow writes all frames at
+    the end, so they are kept as 1 byte per pixel palette images until then.
+    """
+
+    def __init__(self, filename, size, fps):
+        self.filename = filename
+        self.duration = 1000 / fps
+        self.frames = []
+
+    def write(self, frame):
+        from PIL import Image
+
+        image = Image.fromarray(frame)
+
+        # Every frame shares the first frame's palette, mapping onto a fixed palette is much cheaper
+        if self.frames:
+            self.frames.append(image.quantize(palette=self.frames[0], dither=Image.Dither.NONE))
+        else:
+            self.frames.append(image.quantize(colors=256))
+
+    def close(self):
+        first, *rest = self.frames
+        first.save(self.filename, save_all=True, append_images=rest, duration=self.duration, loop=0)
+
+
+def open_writer(filename, size, fps):
+    if shutil.which("ffmpeg"):
+        return FFmpegWriter(filename, size, fps)
+
+    if filename.endswith(".gif"):
+        return GifWriter(filename, size, fps)
+
+    raise RuntimeError(f"Writing {os.path.splitext(filename)[1] or filename} needs ffmpeg on the PATH")
+
+
+def export_animation(vectors, filename, fps=60, seconds=5.0, size=512, workers=None, chunk=16):
+    """Render one turn of the epicycles as a `seconds` long animation, returning the frame count"""
+    frames = max(int(round(fps * seconds)), 1)
+    writer = open_writer(filename, size, fps)
+
+    try:
+        for frame in render_frames(vectors, frames, size, workers, chunk):
+            writer.write(frame)
+    finally:
+        writer.close()
+
+    return frames
+
+
+def load_vectors(source, api_url=DEFAULT_API_URL):
+    """drawVectors from a drawing id on the API, or a .json file with a drawing or a list of vectors"""
+    if source.isdigit():
+        with DrawingClient(api_url) as client:
+            return as_vector_array(client.get(int(source))["drawVectors"])
+
+    with open(source) as f:
+        data = json.load(f)
+
+    return as_vector_array(data["drawVectors"] if isinstance(data, dict) else data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the epicycle animation of a drawing")
+    parser.add_argument("source", help="drawing id, or a .json file with a drawing or its drawVectors")
+    parser.add_argument("output", help=".mp4 or .gif file (MP4 needs ffmpeg)")
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--seconds", type=float, default=5.0, help="length of one turn (the frontend's period)")
+    parser.add_argument("--size", type=int, default=512, help="width and height in pixels")
+    parser.add_argument("--workers", type=int, help="rendering processes (default: all CPUs)")
+    parser.add_argument("--api-url", default=DEFAULT_API_URL)
+    args = parser.parse_args(argv)
+
+    vectors = load_vectors(args.source, args.api_url)
+
+    if vectors.shape[0] == 0:
+        print("The drawing has no vectors yet")
+        return 1
+
+    frames = export_animation(vectors, args.output, args.fps, args.seconds, args.size, args.workers)
+    print(f"Wrote {frames} frames of {vectors.shape[0]} vectors to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Save the API's gallery previews as SVG files.
+
+GET /drawings/recent returns the 20 newest drawings as {"id", "svgPath"},
+where svgPath is an "M x y L x y ..." path through at most 500 of the
+drawing's points, computed by the API when the drawing was submitted. Each
+preview is written to <out>/drawing-<id>.svg with its viewBox fitted to the
+path, so it opens at a sensible size whatever the drawing's coordinates.
+
+Usage: python -m fourier_artist.gallery [--api-url http://localhost:8081] [--out gallery]
+"""
+import argparse
+import os
+
+from .client import DEFAULT_API_URL, get_client
+
+# Room left around the path, as a fraction of its larger side
+MARGIN = 0.05
+
+SVG_TEMPLATE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="{view_box}" width="{size}" height="{size}">'
+    '<path d="{path}" fill="none" stroke="black" stroke-width="{stroke}" '
+    'stroke-linecap="round" stroke-linejoin="round"/></svg>\n'
+)
+
+
+def path_bounds(svg_path):
+    """(min x, min y, max x, max y) of the points of an "M x y L x y ..." path"""
+    values = [float(token) for token in svg_path.split() if token not in ("M", "L")]
+    xs, ys = values[0::2], values[1::2]
+
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def to_svg(svg_path, size=256):
+    """A standalone SVG document drawing a preview path"""
+    min_x, min_y, max_x, max_y = path_bounds(svg_path)
+    side = max(max_x - min_x, max_y - min_y, 1.0)
+    margin = side * MARGIN
+    view_box = f"{min_x - margin:g} {min_y - margin:g} {max_x - min_x + 2 * margin:g} {max_y - min_y + 2 * margin:g}"
+
+    return SVG_TEMPLATE.format(view_box=view_box, size=size, path=svg_path.strip(), stroke=f"{side / 200:g}")
+
+
+def save_gallery(previews, directory, size=256):
+    """Write every preview with a path to <directory>/drawing-<id>.svg, returning the file names"""
+    os.makedirs(directory, exist_ok=True)
+    filenames = []
+
+    for preview in previews:
+        if not preview.get("svgPath"):
+            continue
+
+        filename = os.path.join(directory, f"drawing-{preview['id']}.svg")
+
+        with open(filename, "w") as f:
+            f.write(to_svg(preview["svgPath"], size))
+
+        filenames.append(filename)
+
+    return filenames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Save the previews of the newest drawings as SVG files")
+    parser.add_argument("--api-url", default=DEFAULT_API_URL)
+    parser.add_argument("--out", default="gallery", help="directory to write the SVG files to")
+    parser.add_argument("--size", type=int, default=256, help="width and height of each SVG in pixels")
+    args = parser.parse_args(argv)
+
+    for filename in save_gallery(get_client(args.api_url).recent(), args.out, args.size):
+        print(filename)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""
+Replay recorded and synthetic drawings against the API to find how many
+drawings per minute one instance sustains.
+
+The workload is a corpus of recorded submissions (JSON lines holding
+POST /drawing payloads, or records with the payload under "body") plus,
+optionally, one drawing from every sample generator. It is cycled until
+`count` drawings were sent or `duration` seconds passed, in one of two modes:
+
+- rate: open loop, drawing i is submitted at i / rate seconds whether or not
+  earlier ones finished. Submit latency is measured from that scheduled time,
+  so a client side hold-up counts against the API instead of hiding it.
+- concurrency: closed loop, `concurrency` drawings are in flight (submitted
+  and not processed yet) at any time.
+
+The API answers a drawing it already stored with the existing id and does no
+work, so every pass over the corpus after the first delays each drawing's last
+point by a little (see nudge) to keep the drawings per minute about processing.
+--duplicates replays the corpus as is instead.
+
+Every submitted drawing is polled with client.processed(), a GET /drawing/:id
+asking for its state and vectors only and answered 304 while neither changed,
+until it is processed. The drawings submitted but not processed yet are
+sampled while the run goes on; when that backlog keeps growing during the
+submission phase the API's workers are falling behind the offered rate.
+
+Usage (from sampleControlledDrawings):
+    python -m fourier_artist.loadtest --corpus recorded.jsonl --synthetic --rate 2 --duration 60
+    python -m fourier_artist.loadtest --synthetic --concurrency 10 --count 200 --standin
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import requests
+
+from .bulk import BulkResult, summarize
+from .client import DEFAULT_API_URL, DrawingClient
+from .points import as_point_array
+from .shapes import GENERATORS, generator
+from .validation import DEFAULT_MAX_VECTORS
+
+
+@dataclass
+class ReplayResult(BulkResult):
+    error_kind: Optional[str] = None
+
+
+def read_corpus(path):
+    """
+    Read recorded submissions, returning ([(points, max_vectors)], skipped).
+    Lines that hold no drawing are counted in skipped.
+    """
+    drawings = []
+    skipped = 0
+
+    with open(path) as f:
+        for line in f:
+            payload = parse_record(line)
+
+            if payload is None:
+                skipped += 1
+            else:
+                drawings.append((payload["points"], payload.get("maxVectors")))
+
+    return drawings, skipped
+
+
+def parse_record(line):
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+
+    payload = record.get("body", record) if isinstance(record, dict) else None
+
+    if isinstance(payload, str):
+        try:
+            payload = json.loads(payload)
+        except ValueError:
+            return None
+
+    if not isinstance(payload, dict) or not isinstance(payload.get("points"), list):
+        return None
+
+    return payload
+
+
+def synthetic_drawings(num_points=15000, max_vectors=DEFAULT_MAX_VECTORS):
+    """One drawing from every sample generator"""
+    return [(generator(module, function)(num_points), max_vectors) for module, function in GENERATORS]
+
+
+def workload(corpus, count=None, duration=None, unique=False):
+    """
+    Cycle through the corpus until count drawings were yielded or duration
+    seconds passed. With unique, the drawings of every pass after the first
+    are nudged by that pass's number, so none is a duplicate of another.
+    """
+    deadline = time.monotonic() + duration if duration else None
+    drawings = itertools.cycle(corpus)
+
+    if count is not None:
+        drawings = itertools.islice(drawings, count)
+
+    for index, drawing in enumerate(drawings):
+        if deadline is not None and time.monotonic() >= deadline:
+            return
+
+        replay = index // len(corpus)
+
+        if unique and replay:
+            points, max_vectors = drawing
+            drawing = (nudge(points, replay), max_vectors)
+
+        yield drawing
+
+
+def nudge(points, replay):
+    """
+    A copy of a drawing whose last point is replay millionths of its duration
+    later. The API hashes times relative to the last one, so the copy is not a
+    duplicate while drawing the same. A single point cannot move and is kept.
+    """
+    points = as_point_array(points).copy()
+    duration = points["time"][-1]
+
+    if points.shape[0] > 1:
+        points["time"][-1] = duration + replay * 1e-6 * (duration or 1)
+
+    return points
+
+
+def classify(error):
+    """A short kind for the error counts, and the full description"""
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        kind = f"HTTP {error.response.status_code}"
+    else:
+        kind = type(error).__name__
+
+    return kind, f"{kind}: {error}"
+
+
+async def replay(drawings, client, rate=None, concurrency=8, connections=32, poll_interval=0.5,
+                 poll_timeout=120.0, sample_interval=1.0):
+    """
+    Replay an iterable of (points, max_vectors) at `rate` drawings per second,
+    or with `concurrency` drawings in flight when rate is None.
+    Returns (results in input order, backlog samples, submission phase seconds, elapsed seconds),
+    where every backlog sample is (seconds since start, drawings not processed yet).
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=connections)
+    started = loop.time()
+    results = []
+    backlog = []
+    unfinished = 0
+
+    async def call(function, *args):
+        return await loop.run_in_executor(executor, function, *args)
+
+    async def track(index, points, max_vectors, scheduled):
+        nonlocal unfinished
+        result = ReplayResult(index)
+        unfinished += 1
+
+        try:
+            response = await call(client.submit, points, max_vectors)
+            submitted = loop.time()
+            result.drawing_id = response["id"]
+            result.submit_latency = submitted - scheduled
+
+            while True:
+                drawing = await call(client.processed, result.drawing_id)
+
+                if drawing is not None:
+                    result.processing_latency = loop.time() - submitted
+                    result.vector_count = len(drawing["drawVectors"])
+                    break
+
+                if loop.time() - submitted > poll_timeout:
+                    raise TimeoutError(f"no vectors after {poll_timeout:.0f}s")
+
+                await asyncio.sleep(poll_interval)
+        except Exception as e:
+            result.error_kind, result.error = classify(e)
+        finally:
+            unfinished -= 1
+
+        results.append(result)
+
+    async def sample():
+        while True:
+            backlog.append((loop.time() - started, unfinished))
+            await asyncio.sleep(sample_interval)
+
+    async def closed_loop(numbered):
+        for index, (points, max_vectors) in numbered:
+            await track(index, points, max_vectors, loop.time())
+
+    sampler = asyncio.create_task(sample())
+
+    try:
+        if rate:
+            tasks = []
+
+            for index, (points, max_vectors) in enumerate(drawings):
+                scheduled = started + index / rate
+                await asyncio.sleep(max(0.0, scheduled - loop.time()))
+                tasks.append(asyncio.create_task(track(index, points, max_vectors, scheduled)))
+
+            submitting = loop.time() - started
+            await asyncio.gather(*tasks)
+        else:
+            # The workers share one iterator, each takes the next drawing when its last one is done
+            numbered = enumerate(drawings)
+            workers = [asyncio.create_task(closed_loop(numbered)) for _ in range(concurrency)]
+            await asyncio.gather(*workers)
+            submitting = loop.time() - started
+    finally:
+        sampler.cancel()
+        executor.shutdown(wait=False)
+
+    backlog.append((loop.time() - started, unfinished))
+    results.sort(key=lambda result: result.index)
+
+    return results, backlog, submitting, loop.time() - started
+
+
+def backlog_growth(backlog, until):
+    """Least squares slope of the backlog during the submission phase, in drawings per minute"""
+    samples = np.array([sample for sample in backlog if sample[0] <= until], dtype=np.float64)
+
+    if samples.shape[0] < 2 or np.ptp(samples[:, 0]) == 0:
+        return 0.0
+
+    return float(np.polyfit(samples[:, 0], samples[:, 1], 1)[0] * 60)
+
+
+def report(results, backlog, submitting, elapsed, rate=None):
+    """summarize() plus error rates and backlog figures"""
+    summary = summarize(results, elapsed)
+    errors = Counter(result.error_kind for result in results if result.error)
+
+    summary["error_rate"] = summary["failed"] / len(results) if results else 0.0
+    summary["errors"] = dict(errors)
+    summary["backlog"] = {
+        "max": max(pending for _, pending in backlog),
+        # A closed loop caps the backlog at its concurrency, only an offered rate can outrun the API
+        "growth_per_minute": backlog_growth(backlog, submitting) if rate else None,
+        "samples": [[round(at, 3), pending] for at, pending in backlog],
+    }
+
+    if rate:
+        summary["offered_per_minute"] = 60 * rate
+
+    return summary
+
+
+def run(drawings, api_url=DEFAULT_API_URL, rate=None, concurrency=8, connections=32, **options):
+    """Blocking wrapper around replay that returns the report"""
+    with DrawingClient(api_url, pool_size=connections, retries=0) as client:
+        results, backlog, submitting, elapsed = asyncio.run(
+            replay(drawings, client, rate=rate, concurrency=concurrency, connections=connections, **options)
+        )
+
+    return report(results, backlog, submitting, elapsed, rate)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay drawings against the API and measure how it keeps up")
+    parser.add_argument("--corpus", action="append", default=[], help="JSON lines file of recorded submissions")
+    parser.add_argument("--synthetic", action="store_true", help="add one drawing from every sample generator")
+    parser.add_argument("--points", type=int, default=15000, help="points per synthetic drawing")
+    parser.add_argument("--max-vectors", type=int, default=DEFAULT_MAX_VECTORS, help="for synthetic drawings")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--rate", type=float, help="drawings submitted per second (open loop)")
+    mode.add_argument("--concurrency", type=int, default=8, help="drawings in flight (closed loop)")
+    parser.add_argument("--count", type=int, help="drawings to submit")
+    parser.add_argument("--duration", type=float, help="seconds to keep submitting")
+    parser.add_argument("--duplicates", action="store_true",
+                        help="replay the corpus unchanged, later passes being answered as duplicates")
+    parser.add_argument("--connections", type=int, default=32, help="HTTP requests in flight")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--api-url", default=DEFAULT_API_URL)
+    parser.add_argument("--standin", action="store_true", help="start a local stand-in API and target it")
+    parser.add_argument("--standin-workers", type=int, default=5)
+    parser.add_argument("--standin-delay", type=float, default=0.0)
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    corpus = []
+
+    for path in args.corpus:
+        drawings, skipped = read_corpus(path)
+        corpus.extend(drawings)
+        print(f"{path}: {len(drawings)} drawings, {skipped} lines without a drawing skipped")
+
+    if args.synthetic:
+        corpus.extend(synthetic_drawings(args.points, args.max_vectors))
+
+    if not corpus:
+        parser.error("nothing to replay, pass --corpus and/or --synthetic")
+
+    if args.count is None and args.duration is None:
+        args.count = len(corpus)
+
+    server = None
+    api_url = args.api_url
+
+    if args.standin:
+        from .standin import StandInServer
+
+        server = StandInServer(("127.0.0.1", 0), workers=args.standin_workers, delay=args.standin_delay)
+        server.start()
+        api_url = server.url
+
+    try:
+        summary = run(
+            workload(corpus, args.count, args.duration, unique=not args.duplicates),
+            api_url=api_url,
+            rate=args.rate,
+            concurrency=args.concurrency,
+            connections=args.connections,
+            poll_interval=args.poll_interval,
+        )
+    finally:
+        if server:
+            server.shutdown()
+
+    print(json.dumps(summary, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
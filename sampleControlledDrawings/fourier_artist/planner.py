@@ -0,0 +1,116 @@
+"""
+Pick the smallest maxVectors that is good enough, before submitting.
+
+By Parseval's identity the mean squared distance between the resampled
+drawing and its series truncated to the first K vectors is the energy of the
+coefficients left out, so one FFT gives the error for every K at once: a
+cumulative sum over the coefficient energies in the API's 0, 1, -1, 2, -2...
+order.
+
+The API stops adding vectors once the average distance to the original
+points is below 1, measured at the original points rather than on its sample
+grid. For many drawings (single_stroke_art, superformula_art, spirals) that
+never happens and every one of maxVectors is computed, even though the
+series stopped improving on the grid long before. The distance planned for
+here is the root mean square over the grid, which is never smaller than the
+average distance there. The energy fraction leaves out vector 0, which only
+places the drawing and would otherwise dominate the total.
+"""
+import argparse
+from dataclasses import dataclass
+
+import numpy as np
+
+from .arguments import add_plan_arguments
+from .points import as_point_array
+from .series import coefficients, resample, vector_order
+from .validation import MAX_VECTORS
+
+
+@dataclass
+class Plan:
+    max_vectors: int
+    rms_distance: float
+    energy_fraction: float
+    # False when even max_vectors does not meet the targets
+    reached: bool
+
+
+def error_curve(points, count=MAX_VECTORS):
+    """
+    (rms_distance, energy_fraction) arrays where entry K - 1 describes the
+    series truncated to its first K vectors, for K = 1..count.
+    """
+    all_coefficients = coefficients(resample(as_point_array(points)))
+    energy = np.abs(all_coefficients) ** 2
+    order = vector_order(count) % energy.shape[0]
+    selected = energy[order]
+
+    # Summing what is left out, rather than subtracting from the total, keeps small errors exact
+    left_out = energy.sum() - energy[np.unique(order)].sum()
+    tail = np.cumsum(selected[::-1])[::-1]
+    residual = left_out + np.append(tail[1:], 0)
+
+    shape_energy = energy.sum() - energy[0]
+    captured = np.cumsum(selected) - energy[0]
+    fraction = captured / shape_energy if shape_energy > 0 else np.ones(count)
+
+    return np.sqrt(np.maximum(residual, 0)), np.clip(fraction, 0, 1)
+
+
+def plan(points, target_distance=None, energy_fraction=None, max_vectors=MAX_VECTORS):
+    """
+    The smallest maxVectors (at most max_vectors) whose series is within
+    target_distance of the drawing (root mean square) and captures at least
+    energy_fraction of its shape. At least one target is needed.
+    """
+    if target_distance is None and energy_fraction is None:
+        raise ValueError("Pass a target distance, an energy fraction or both")
+
+    rms_distance, fraction = error_curve(points, max_vectors)
+    good = np.ones(max_vectors, dtype=bool)
+
+    if target_distance is not None:
+        good &= rms_distance <= target_distance
+
+    if energy_fraction is not None:
+        good &= fraction >= energy_fraction
+
+    reached = bool(good.any())
+    index = int(np.argmax(good)) if reached else max_vectors - 1
+
+    return Plan(index + 1, float(rms_distance[index]), float(fraction[index]), reached)
+
+
+def apply_plan_arguments(points, max_vectors, args):
+    """The planned maxVectors if a target was given on the command line, otherwise max_vectors"""
+    if args.target_distance is None and args.energy_fraction is None:
+        return max_vectors
+
+    result = plan(points, args.target_distance, args.energy_fraction)
+    note = "" if result.reached else ", targets not reached"
+    print(f"Planned maxVectors {result.max_vectors} (rms distance {result.rms_distance:.2f}, "
+          f"energy {result.energy_fraction:.4%}{note})")
+
+    return result.max_vectors
+
+
+def main(argv=None):
+    from .bulk import load_drawing
+
+    parser = argparse.ArgumentParser(description="Plan maxVectors for saved drawings")
+    parser.add_argument("files", nargs="+", help=".npy point arrays or .json point lists")
+    add_plan_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.target_distance is None and args.energy_fraction is None:
+        args.target_distance = 1.0
+
+    for path in args.files:
+        points = load_drawing(path)
+        print(f"{path}: ", end="")
+        apply_plan_arguments(points, None, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Point buffers shared by the generators, the API client and the offline tools.
+
+A drawing is a NumPy structured array with one record per point, laid out the
+way the API stores it: ``time`` as float64 and ``x``/``y`` as int32. The list of
+``{"time", "x", "y"}`` dicts the API speaks is only built at the edge.
+"""
+import numpy as np
+
+POINT_DTYPE = np.dtype([("time", "<f8"), ("x", "<i4"), ("y", "<i4")])
+
+# What the x and y fields (and the API's points column) can hold
+COORDINATE_RANGE = (np.iinfo(np.int32).min, np.iinfo(np.int32).max)
+
+
+def uniform_time(count):
+    """Evenly spaced times from 0 to 1, computed as i / (count - 1) like the scripts always did"""
+    return np.arange(count) / max(count - 1, 1)
+
+
+def from_columns(time, x, y):
+    """
+    Build a point array from time, x and y columns.
+    Coordinates are truncated towards zero, the same as int() in the scripts.
+    Raises InvalidSubmission for coordinates the x and y fields cannot hold,
+    rather than letting the cast wrap them.
+    """
+    time = np.asarray(time, dtype=np.float64)
+    x = np.trunc(np.asarray(x, dtype=np.float64))
+    y = np.trunc(np.asarray(y, dtype=np.float64))
+    check_coordinates(x)
+    check_coordinates(y)
+
+    points = np.empty(time.shape[0], dtype=POINT_DTYPE)
+    points["time"] = time
+    points["x"] = x
+    points["y"] = y
+
+    return points
+
+
+def check_coordinates(column):
+    # Imported here, validation builds on this module
+    from .validation import InvalidSubmission
+
+    if not np.isfinite(column).all():
+        raise InvalidSubmission("The request is not properly formatted.")
+
+    low, high = COORDINATE_RANGE
+
+    if column.size and (column.min() < low or column.max() > high):
+        raise InvalidSubmission(f"Each point's x and y must be between {low} and {high}.")
+
+
+def as_point_array(points):
+    """
+    Accept a point array, any structured array with time/x/y fields, an
+    (N, 3) array of time/x/y rows or a list of API point dicts.
+    """
+    if isinstance(points, np.ndarray):
+        if points.dtype == POINT_DTYPE:
+            return points
+
+        if points.dtype.names is not None:
+            return from_columns(points["time"], points["x"], points["y"])
+
+        rows = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+
+        return from_columns(rows[:, 0], rows[:, 1], rows[:, 2])
+
+    points = list(points)
+    count = len(points)
+    time = np.fromiter((p["time"] for p in points), dtype=np.float64, count=count)
+    x = np.fromiter((p["x"] for p in points), dtype=np.float64, count=count)
+    y = np.fromiter((p["y"] for p in points), dtype=np.float64, count=count)
+
+    return from_columns(time, x, y)
+
+
+def to_api_points(points):
+    """Convert a point array to the list of dicts used in the JSON payload"""
+    points = as_point_array(points)
+
+    return [
+        {"time": time, "x": x, "y": y}
+        for time, x, y in zip(points["time"].tolist(), points["x"].tolist(), points["y"].tolist())
+    ]
@@ -0,0 +1,132 @@
+"""
+Shrink a drawing before it is uploaded.
+
+The API only ever looks at a drawing through the 1000 samples it takes on its
+0.001 time grid (see series.resample), so most of a 50,000 point drawing is
+wasted upload, storage and scanning. Two reductions are offered:
+
+- "grid" sends exactly those samples plus the final point (1001 points). The
+  API resamples them back to the very same values, so every coefficient is
+  bit-identical to sending the full drawing. Only the stopping rule, which
+  averages over the submitted points, sees fewer of them.
+- "simplify" keeps the points a Ramer-Douglas-Peucker pass needs to stay
+  within a distance tolerance of the original, where distances are measured
+  against the API's linear interpolation in time rather than the nearest
+  segment, so the timing of the stroke is preserved too.
+"""
+import numpy as np
+
+from .points import as_point_array, from_columns
+from .series import SAMPLE_TIMES, normalize_time, resample
+
+
+def resample_to_grid(points):
+    """The drawing as the API samples it: one point per grid time plus the final point"""
+    points = as_point_array(points)
+
+    # Nothing to gain, or nothing the API would normalize onto its grid
+    if points.shape[0] <= SAMPLE_TIMES.shape[0] + 1 or points["time"][-1] == 0:
+        return points
+
+    samples = resample(points)
+
+    return from_columns(
+        np.append(SAMPLE_TIMES, 1.0),
+        np.append(samples.real, points["x"][-1]),
+        np.append(samples.imag, points["y"][-1]),
+    )
+
+
+def simplify(points, tolerance=1.0):
+    """
+    Keep the fewest points (first and last always included) such that no
+    dropped point is further than `tolerance` from where linear interpolation
+    in time between the kept points puts it.
+    """
+    points = as_point_array(points)
+    count = points.shape[0]
+
+    if count < 3:
+        return points
+
+    time = normalize_time(points["time"])
+    x = points["x"].astype(np.float64)
+    y = points["y"].astype(np.float64)
+
+    keep = np.zeros(count, dtype=bool)
+    keep[[0, -1]] = True
+    segments = [(0, count - 1)]
+
+    while segments:
+        first, last = segments.pop()
+
+        if last - first < 2:
+            continue
+
+        inner = slice(first + 1, last)
+        deviation = _deviation(time[inner], x[inner], y[inner], time, x, y, first, last)
+        worst = int(np.argmax(deviation))
+
+        if deviation[worst] > tolerance:
+            split = first + 1 + worst
+            keep[split] = True
+            segments.append((first, split))
+            segments.append((split, last))
+
+    return points[keep]
+
+
+def _deviation(time, x, y, all_time, all_x, all_y, first, last):
+    # Distance from each point to the position interpolated at its own time
+    duration = all_time[last] - all_time[first]
+    fraction = (time - all_time[first]) / duration if duration > 0 else np.zeros_like(time)
+
+    expected_x = all_x[first] + fraction * (all_x[last] - all_x[first])
+    expected_y = all_y[first] + fraction * (all_y[last] - all_y[first])
+
+    return np.hypot(x - expected_x, y - expected_y)
+
+
+def max_deviation(original, reduced):
+    """
+    Largest distance between an original point and the reduced drawing at
+    the same time, interpolated and truncated to integers as the API would.
+    """
+    original = as_point_array(original)
+    reduced = as_point_array(reduced)
+
+    time = normalize_time(original["time"])
+    reduced_time = normalize_time(reduced["time"])
+
+    x = np.trunc(np.interp(time, reduced_time, reduced["x"]))
+    y = np.trunc(np.interp(time, reduced_time, reduced["y"]))
+
+    return float(np.hypot(x - original["x"], y - original["y"]).max())
+
+
+def preprocess(points, mode="grid", tolerance=1.0):
+    """Apply one of arguments.MODES, returning (reduced points, max deviation introduced)"""
+    points = as_point_array(points)
+
+    if mode == "none":
+        return points, 0.0
+
+    if mode == "grid":
+        reduced = resample_to_grid(points)
+    elif mode == "simplify":
+        reduced = simplify(points, tolerance)
+    else:
+        raise ValueError(f"Unknown preprocessing mode: {mode}")
+
+    return reduced, max_deviation(points, reduced)
+
+
+def apply_reduce_arguments(points, args):
+    """Preprocess points as requested on the command line and report what changed"""
+    if args.reduce == "none":
+        return points
+
+    reduced, deviation = preprocess(points, args.reduce, args.tolerance)
+    print(f"Reduced {len(points)} points to {len(reduced)} ({args.reduce}, max deviation {deviation:.2f})")
+
+    return reduced
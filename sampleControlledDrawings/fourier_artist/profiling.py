@@ -0,0 +1,355 @@
+"""
+Optional timing of every phase of the pipeline: generating a drawing,
+rendering it, building the payload, each HTTP request and polling for the
+vectors.
+
+The phases are marked in the code with
+
+    with profiling.phase("encode", format="binary"):
+        ...
+
+which costs one global lookup while profiling is off. Once `enable()`d, every
+phase becomes an event with its wall clock start, duration, thread, arguments
+and the process's peak resident memory when it ended. With trace_memory the
+peak of the memory allocated by Python during the phase is measured with
+tracemalloc too (slower; with several threads their allocations mix).
+
+A profile is written as JSON (the events plus a per-phase summary) and as a
+Chrome trace-event file, which chrome://tracing and https://ui.perfetto.dev
+open. Writing a profile to an existing file adds the run's events to it, so a
+batch job that runs a script many times, one run after the other, collects
+them all in one profile; profiles written by parallel jobs are combined with
+
+    python -m fourier_artist.profiling run1.json run2.json --out all.json --trace all.trace.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    # Not on Windows, where peak memory is not recorded
+    resource = None
+
+PROFILE_VERSION = 1
+
+_profiler = None
+
+
+def peak_rss():
+    """The process's peak resident memory in bytes, or None where it is not available"""
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def now():
+    """Microseconds since the epoch, the clock of every event"""
+    return time.time_ns() / 1000
+
+
+class _NullPhase:
+    """The phase handed out while profiling is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class Phase:
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+        self.start = None
+        # tracemalloc peak seen before the latest reset, see Profiler.enter
+        self.traced_peak = 0
+
+    def __enter__(self):
+        self.profiler.enter(self)
+
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+
+        self.profiler.exit(self)
+
+        return False
+
+    def set(self, **args):
+        """Add arguments known only once the phase ran, e.g. a response status"""
+        self.args.update(args)
+
+
+class Profiler:
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.events = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.pid = os.getpid()
+
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stack(self):
+        try:
+            return self.local.stack
+        except AttributeError:
+            self.local.stack = []
+
+            return self.local.stack
+
+    def enter(self, phase):
+        stack = self.stack()
+
+        if self.trace_memory:
+            # The peak is reset for the new phase, the enclosing one keeps what it saw so far
+            if stack:
+                stack[-1].traced_peak = max(stack[-1].traced_peak, tracemalloc.get_traced_memory()[1])
+
+            tracemalloc.reset_peak()
+
+        stack.append(phase)
+        phase.start = now()
+
+    def exit(self, phase):
+        end = now()
+        stack = self.stack()
+        stack.pop()
+        event = {"name": phase.name, "start": phase.start, "duration": end - phase.start, "pid": self.pid,
+                 "tid": threading.get_native_id(), "args": phase.args, "peakRss": peak_rss()}
+
+        if self.trace_memory:
+            event["peakTraced"] = max(phase.traced_peak, tracemalloc.get_traced_memory()[1])
+
+            if stack:
+                stack[-1].traced_peak = max(stack[-1].traced_peak, event["peakTraced"])
+
+        with self.lock:
+            self.events.append(event)
+
+    def record(self, name, start, **args):
+        """
+        Add a phase that ran from start (a now() value) until now, for work
+        spread over awaits or callbacks that a with block cannot enclose.
+        """
+        end = now()
+        event = {"name": name, "start": start, "duration": end - start, "pid": self.pid,
+                 "tid": threading.get_native_id(), "args": args, "peakRss": peak_rss()}
+
+        with self.lock:
+            self.events.append(event)
+
+    def profile(self):
+        with self.lock:
+            events = list(self.events)
+
+        return {"version": PROFILE_VERSION, "runs": 1, "events": events, "summary": summarize(events)}
+
+
+def enable(trace_memory=False):
+    """Start profiling, returning the Profiler that collects the events"""
+    global _profiler
+
+    _profiler = Profiler(trace_memory)
+
+    return _profiler
+
+
+def disable():
+    """Stop profiling, returning the Profiler that was collecting (or None)"""
+    global _profiler
+
+    profiler, _profiler = _profiler, None
+
+    if profiler is not None and profiler.trace_memory:
+        tracemalloc.stop()
+
+    return profiler
+
+
+def active():
+    return _profiler
+
+
+def phase(name, **args):
+    """Context manager timing a phase of the pipeline, a no-op while profiling is off"""
+    if _profiler is None:
+        return _NULL_PHASE
+
+    return Phase(_profiler, name, args)
+
+
+def record(name, start, **args):
+    """Profiler.record on the active profiler, if any"""
+    if _profiler is not None:
+        _profiler.record(name, start, **args)
+
+
+def _percentile(values, quantile):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(quantile / 100 * (len(values) - 1))))
+
+    return values[index]
+
+
+def summarize(events):
+    """Per phase: count, total, mean, p50, p95 and max duration in milliseconds, and the peak memory seen"""
+    phases = {}
+
+    for event in events:
+        phases.setdefault(event["name"], []).append(event)
+
+    summary = {}
+
+    for name, group in sorted(phases.items()):
+        durations = [event["duration"] / 1000 for event in group]
+        summary[name] = {
+            "count": len(group),
+            "total_ms": sum(durations),
+            "mean_ms": sum(durations) / len(durations),
+            "p50_ms": _percentile(durations, 50),
+            "p95_ms": _percentile(durations, 95),
+            "max_ms": max(durations),
+            "peak_rss_bytes": max((event.get("peakRss") or 0 for event in group), default=0),
+        }
+
+        traced = [event["peakTraced"] for event in group if "peakTraced" in event]
+
+        if traced:
+            summary[name]["peak_traced_bytes"] = max(traced)
+
+    return summary
+
+
+def merge(profiles):
+    """One profile holding the events of every profile given"""
+    events = [event for profile in profiles for event in profile["events"]]
+    events.sort(key=lambda event: event["start"])
+
+    return {"version": PROFILE_VERSION, "runs": sum(profile.get("runs", 1) for profile in profiles),
+            "events": events, "summary": summarize(events)}
+
+
+def chrome_trace(profile):
+    """The profile as Chrome trace-event JSON: one complete ("X") event per phase"""
+    events = []
+
+    for event in profile["events"]:
+        args = dict(event["args"])
+
+        for key in ("peakRss", "peakTraced"):
+            if event.get(key) is not None:
+                args[key] = event[key]
+
+        events.append({"name": event["name"], "cat": "fourier_artist", "ph": "X", "ts": event["start"],
+                       "dur": event["duration"], "pid": event["pid"], "tid": event["tid"], "args": args})
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def read_profile(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_json(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+    try:
+        with os.fdopen(handle, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def write_profile(path, profile):
+    """Write a profile, adding its events to the profile already in path if there is one"""
+    if os.path.exists(path):
+        profile = merge([read_profile(path), profile])
+
+    _write_json(path, profile)
+
+    return profile
+
+
+def write_trace(path, profile):
+    _write_json(path, chrome_trace(profile))
+
+
+def finish(profile_path=None, trace_path=None):
+    """Stop profiling and write what was collected, for the command line tools"""
+    profiler = disable()
+
+    if profiler is None:
+        return None
+
+    profile = profiler.profile()
+
+    if profile_path:
+        profile = write_profile(profile_path, profile)
+
+    if trace_path:
+        write_trace(trace_path, profile)
+
+    return profile
+
+
+def report(profile):
+    lines = [f"{'phase':<16} {'count':>7} {'total ms':>11} {'mean ms':>10} {'p95 ms':>10} {'max ms':>10} "
+             f"{'peak MiB':>9}"]
+
+    for name, phase_summary in profile["summary"].items():
+        lines.append(f"{name:<16} {phase_summary['count']:>7} {phase_summary['total_ms']:>11.1f} "
+                     f"{phase_summary['mean_ms']:>10.2f} {phase_summary['p95_ms']:>10.2f} "
+                     f"{phase_summary['max_ms']:>10.2f} {phase_summary['peak_rss_bytes'] / 1024 / 1024:>9.1f}")
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Combine and summarize pipeline profiles")
+    parser.add_argument("profiles", nargs="+", help="profiles written with --profile")
+    parser.add_argument("--out", help="write the combined profile here")
+    parser.add_argument("--trace", help="write the combined profile as a Chrome trace here")
+    args = parser.parse_args(argv)
+
+    profile = merge([read_profile(path) for path in args.profiles])
+
+    if args.out:
+        _write_json(args.out, profile)
+
+    if args.trace:
+        write_trace(args.trace, profile)
+
+    print(f"{profile['runs']} runs, {len(profile['events'])} events")
+    print(report(profile))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Rendering helpers for the art scripts.
+
+Two paths produce a PNG of a drawing:
+
+- matplotlib, through the non-interactive Agg backend (`pyplot()`), for the
+  full quality visualizations. Segments for a LineCollection are built as a
+  strided view of the points (`stroke_segments`) instead of a Python loop.
+- a NumPy-only rasterizer (`Canvas`) that draws polylines straight into a
+  pixel array and writes it with zlib. It has no antialiasing, but renders a
+  preview in milliseconds, which is what a parameter sweep needs.
+
+Either can run in a background process (`start_render`) so generating and
+submitting a drawing do not wait for the PNG.
+"""
+import struct
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from . import profiling
+
+# The named colors the scripts use, for the NumPy path
+COLORS = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "blue": (0, 0, 255),
+    "red": (255, 0, 0),
+    "green": (0, 128, 0),
+    "purple": (128, 0, 128),
+}
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def pyplot():
+    """Import pyplot on the Agg backend, only when a matplotlib rendering is made"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def stroke_segments(x, y):
+    """(N - 1, 2, 2) view of consecutive point pairs, as LineCollection takes them, without copying"""
+    path = np.column_stack([x, y])
+
+    return sliding_window_view(path, 2, axis=0).transpose(0, 2, 1)
+
+
+def hsv_gradient(count):
+    """RGB colors (uint8) running once around the hue circle, like matplotlib's hsv colormap"""
+    hue = np.arange(count) / max(count, 1) * 6
+    sector = np.floor(hue).astype(np.int64) % 6
+    rising = hue - np.floor(hue)
+    falling = 1 - rising
+    ones = np.ones(count)
+    zeros = np.zeros(count)
+
+    channels = np.select(
+        [sector[:, np.newaxis] == i for i in range(6)],
+        [
+            np.column_stack([ones, rising, zeros]),
+            np.column_stack([falling, ones, zeros]),
+            np.column_stack([zeros, ones, rising]),
+            np.column_stack([zeros, falling, ones]),
+            np.column_stack([rising, zeros, ones]),
+            np.column_stack([ones, zeros, falling]),
+        ],
+    )
+
+    return np.round(channels * 255).astype(np.uint8)
+
+
+class Canvas:
+    """An RGB pixel array covering a region of drawing coordinates, y pointing up"""
+
+    def __init__(self, bounds, size=512, background="black", margin=0.05):
+        min_x, max_x, min_y, max_y = bounds
+        span = max(max_x - min_x, max_y - min_y, 1e-9) * (1 + 2 * margin)
+
+        self.size = size
+        self.scale = (size - 1) / span
+        self.center = ((min_x + max_x) / 2, (min_y + max_y) / 2)
+        self.background = rgb(background)
+        self.pixels = np.empty((size, size, 3), dtype=np.uint8)
+        self.clear()
+
+    def clear(self):
+        self.pixels[:] = self.background
+
+    @classmethod
+    def fit(cls, x, y, **options):
+        """A canvas that shows every point of x and y"""
+        return cls((np.min(x), np.max(x), np.min(y), np.max(y)), **options)
+
+    def to_pixels(self, x, y):
+        half = (self.size - 1) / 2
+        column = half + (np.asarray(x, dtype=np.float64) - self.center[0]) * self.scale
+        row = half - (np.asarray(y, dtype=np.float64) - self.center[1]) * self.scale
+
+        return column, row
+
+    def polyline(self, x, y, color="white", width=1, alpha=1.0):
+        """
+        Draw the path through the points. color is a name, an RGB tuple or one
+        RGB row per segment (see hsv_gradient).
+        """
+        column, row = self.to_pixels(x, y)
+
+        if column.shape[0] < 2:
+            column, row = np.append(column, column), np.append(row, row)
+
+        self._draw(column[:-1], row[:-1], column[1:], row[1:], color, width, alpha)
+
+    def lines(self, start_x, start_y, end_x, end_y, color="white", width=1, alpha=1.0):
+        """Draw separate segments from each start to the matching end, colored as in polyline"""
+        start_column, start_row = self.to_pixels(start_x, start_y)
+        end_column, end_row = self.to_pixels(end_x, end_y)
+
+        self._draw(start_column, start_row, end_column, end_row, color, width, alpha)
+
+    def _draw(self, start_column, start_row, end_column, end_row, color, width, alpha):
+        segment, columns, rows = _segment_pixels(start_column, start_row, end_column, end_row)
+        colors = np.asarray(rgb(color), dtype=np.float64)
+
+        if colors.ndim == 2:
+            colors = colors[segment]
+
+        radius = (width - 1) // 2
+
+        for dx in range(-radius, width - radius):
+            for dy in range(-radius, width - radius):
+                self._plot(columns + dx, rows + dy, colors, alpha)
+
+    def _plot(self, columns, rows, colors, alpha):
+        inside = (columns >= 0) & (columns < self.size) & (rows >= 0) & (rows < self.size)
+
+        if colors.ndim == 2:
+            colors = colors[inside]
+
+        rows, columns = rows[inside], columns[inside]
+
+        if alpha >= 1:
+            self.pixels[rows, columns] = colors
+        else:
+            blended = self.pixels[rows, columns] * (1 - alpha) + colors * alpha
+            self.pixels[rows, columns] = np.round(blended).astype(np.uint8)
+
+    def save(self, filename):
+        write_png(filename, self.pixels)
+
+        return filename
+
+
+def _segment_pixels(start_column, start_row, end_column, end_row):
+    # Walk every segment in steps of at most one pixel, all segments at once
+    dx = end_column - start_column
+    dy = end_row - start_row
+    steps = np.ceil(np.maximum(np.abs(dx), np.abs(dy))).astype(np.int64) + 1
+
+    segment = np.repeat(np.arange(steps.shape[0]), steps)
+    offset = np.arange(segment.shape[0]) - np.repeat(np.cumsum(steps) - steps, steps)
+    fraction = offset / np.maximum(steps - 1, 1)[segment]
+
+    columns = np.rint(start_column[segment] + fraction * dx[segment]).astype(np.int64)
+    rows = np.rint(start_row[segment] + fraction * dy[segment]).astype(np.int64)
+
+    return segment, columns, rows
+
+
+def rgb(color):
+    if isinstance(color, str):
+        return COLORS[color]
+
+    return color
+
+
+def write_png(filename, pixels):
+    """Write an (height, width, 3) uint8 array as an 8-bit RGB PNG"""
+    height, width, _ = pixels.shape
+
+    # Every scanline starts with its filter type, 0 (none)
+    scanlines = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    scanlines[:, 1:] = pixels.reshape(height, width * 3)
+
+    with open(filename, "wb") as f:
+        f.write(PNG_SIGNATURE)
+        f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(_png_chunk(b"IDAT", zlib.compress(scanlines.tobytes(), 6)))
+        f.write(_png_chunk(b"IEND", b""))
+
+
+def _png_chunk(tag, data):
+    checksum = zlib.crc32(tag + data) & 0xFFFFFFFF
+
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", checksum)
+
+
+_executor = None
+
+
+def start_render(function, *args, background=False, **kwargs):
+    """
+    Call a rendering function, in the background rendering process if asked,
+    and return a Future for its result (the filename).
+    """
+    global _executor
+
+    if background:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=1)
+
+        return _executor.submit(function, *args, **kwargs)
+
+    future = Future()
+
+    with profiling.phase("render", function=function.__name__):
+        future.set_result(function(*args, **kwargs))
+
+    return future
@@ -0,0 +1,246 @@
+"""
+Offline copy of the API's Fourier series builder (draw_vector.BuildSeries).
+
+The API samples a drawing every 0.001 of its normalized time, integrates
+each coefficient separately and keeps adding vectors in 0, 1, -1, 2, -2...
+order until the reconstruction is within an average distance of 1 of the
+original points. Here the drawing is resampled once onto the same grid, every
+coefficient comes out of a single FFT and the stopping rule is evaluated in
+blocks of vectors, so a whole series costs O(N log N + K * N).
+"""
+import math
+
+import numpy as np
+
+from .points import as_point_array
+from .validation import DEFAULT_MAX_VECTORS, clamp_max_vectors
+
+VECTOR_DTYPE = np.dtype([("n", "<i4"), ("real", "<f8"), ("imaginary", "<f8")])
+
+TIME_DELTA = 0.001
+
+# Stop adding vectors once the average distance to the original points drops below this
+AVERAGE_DISTANCE_TARGET = 1
+
+# Cap on the size of the (vectors x points) blocks used for the stopping rule
+BLOCK_ELEMENTS = 1 << 21
+
+
+def float_compare(x, y, tolerance):
+    """Vectorized util.FloatCompare: 0 within a relative tolerance, otherwise 1 or -1"""
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative = np.abs(x - y) / (np.abs(x + y) / 2)
+
+    equal = np.isnan(relative) | (relative < tolerance)
+
+    return np.where(equal, 0, np.where(x > y, 1, -1))
+
+
+def _float_compare_scalar(x, y, tolerance):
+    # float_compare for two Python floats, without NumPy's per-call overhead
+    difference = abs(x - y)
+    mean = abs(x + y) / 2
+
+    if mean == 0:
+        relative = math.nan if difference == 0 else math.inf
+    else:
+        relative = difference / mean
+
+    if math.isnan(relative) or relative < tolerance:
+        return 0
+
+    return 1 if x > y else -1
+
+
+def _build_sample_times():
+    # Accumulate the same way VectorBuilder.Build does, rounding errors included
+    times = []
+    current_time = 0.0
+
+    while _float_compare_scalar(current_time, 1.0, 0.0001) < 0:
+        times.append(current_time)
+        current_time += TIME_DELTA
+
+    return np.array(times)
+
+
+# The times VectorBuilder.Build samples the drawing at
+SAMPLE_TIMES = _build_sample_times()
+
+
+def normalize_time(time):
+    """Scale times so the final point is at 1, as OriginalPointsFactory does"""
+    time = np.asarray(time, dtype=np.float64)
+
+    if time[-1] == 0:
+        return time
+
+    return time / time[-1]
+
+
+def resample(points):
+    """
+    Sample a drawing onto SAMPLE_TIMES the way VectorBuilder.findOriginalPoint
+    does. A point within the comparison tolerance of a sample time is used
+    as is, a sample falling strictly between two points is linearly
+    interpolated and truncated to integers, and anything else takes the final point.
+    Returns the samples as complex numbers (x + iy).
+    """
+    points = as_point_array(points)
+    time = normalize_time(points["time"])
+    x = points["x"].astype(np.int64)
+    y = points["y"].astype(np.int64)
+    count = time.shape[0]
+
+    first_candidates = _first_not_before(time, SAMPLE_TIMES)
+
+    # findOriginalPoint resumes its scan where the previous sample stopped. The
+    # resume index rarely matters, but it decides which point wins inside the
+    # comparison tolerance, so it is tracked exactly.
+    source = np.empty(SAMPLE_TIMES.shape[0], dtype=np.int64)
+    interpolated = np.zeros(SAMPLE_TIMES.shape[0], dtype=bool)
+    first_candidates = first_candidates.tolist()
+    start = 0
+
+    for k, sample_time in enumerate(SAMPLE_TIMES.tolist()):
+        i = max(first_candidates[k], start)
+
+        if i < count and _float_compare_scalar(float(time[i]), sample_time, 0.001) == 0:
+            start = i
+        elif 0 < i < count and _float_compare_scalar(float(time[i - 1]), sample_time, 0.001) < 0:
+            interpolated[k] = True
+            start = i - 1
+        else:
+            start = count - 1
+
+        source[k] = start
+
+    sample_x = x[source].astype(np.float64)
+    sample_y = y[source].astype(np.float64)
+
+    if interpolated.any():
+        p1 = source[interpolated]
+        p2 = p1 + 1
+        sample_x[interpolated] = _linear_average(SAMPLE_TIMES[interpolated], time[p1], time[p2], x[p1], x[p2])
+        sample_y[interpolated] = _linear_average(SAMPLE_TIMES[interpolated], time[p1], time[p2], y[p1], y[p2])
+
+    return sample_x + 1j * sample_y
+
+
+def _first_not_before(time, sample_times):
+    """
+    For every sample time, the first point index whose time compares equal
+    to or greater than it. The comparison is monotonic along the sorted
+    point times, so a vectorized bisection finds all of them at once.
+    """
+    low = np.zeros(sample_times.shape[0], dtype=np.int64)
+    high = np.full(sample_times.shape[0], time.shape[0], dtype=np.int64)
+
+    while (low < high).any():
+        active = low < high
+        middle = (low + high) // 2
+        probe = np.minimum(middle, time.shape[0] - 1)
+        not_before = float_compare(time[probe], sample_times, 0.001) >= 0
+
+        high = np.where(active & not_before, middle, high)
+        low = np.where(active & ~not_before, middle + 1, low)
+
+    return low
+
+
+def _linear_average(sample_time, t1, t2, v1, v2):
+    # Same operation order as VectorBuilder.getLinearAverage, then int() truncation
+    slope = (v2 - v1).astype(np.float64) / (t2 - t1)
+    intercept = v2.astype(np.float64) - slope * t2
+
+    return np.trunc(slope * sample_time + intercept)
+
+
+def coefficients(samples):
+    """
+    Every Fourier coefficient of the resampled drawing from one FFT.
+    Coefficient n is at index n modulo the number of samples.
+    """
+    return np.fft.fft(samples) * TIME_DELTA
+
+
+def vector_order(count):
+    """The first `count` values of n in the order getNextN visits them: 0, 1, -1, 2, -2..."""
+    k = np.arange(count)
+    n = (k + 1) // 2
+
+    return np.where(k % 2 == 1, n, -n)
+
+
+def build_series(points, max_vectors=DEFAULT_MAX_VECTORS):
+    """
+    Compute the drawVectors the API would store for a drawing submitted with
+    the given maxVectors (clamped the same way the API clamps it).
+    Returns a VECTOR_DTYPE array.
+    """
+    points = as_point_array(points)
+    max_vectors = clamp_max_vectors(max_vectors)
+
+    all_coefficients = coefficients(resample(points))
+    order = vector_order(max_vectors)
+    selected = all_coefficients[order % all_coefficients.shape[0]]
+
+    count = _vectors_needed(points, order, selected)
+
+    vectors = np.empty(count, dtype=VECTOR_DTYPE)
+    vectors["n"] = order[:count]
+    vectors["real"] = selected[:count].real
+    vectors["imaginary"] = selected[:count].imag
+
+    return vectors
+
+
+def _vectors_needed(points, order, selected):
+    """
+    How many vectors BuildSeries keeps: the first count whose reconstruction
+    is within the target average distance, or all of them.
+    """
+    time = normalize_time(points["time"])
+    original = points["x"] + 1j * points["y"]
+    reconstruction = np.zeros(time.shape[0], dtype=np.complex128)
+    block = max(1, min(64, BLOCK_ELEMENTS // time.shape[0]))
+
+    for first in range(0, order.shape[0], block):
+        n = order[first:first + block]
+        terms = selected[first:first + block, None] * np.exp(1j * (n * 2.0 * np.pi)[:, None] * time[None, :])
+
+        # Each row is the reconstruction with one more vector, summed in the API's order
+        partial = np.cumsum(np.vstack([reconstruction[None, :], terms]), axis=0)[1:]
+        average_distances = np.abs(partial - original).mean(axis=1)
+        close_enough = np.flatnonzero(average_distances < AVERAGE_DISTANCE_TARGET)
+
+        if close_enough.size:
+            return first + int(close_enough[0]) + 1
+
+        reconstruction = partial[-1]
+
+    return order.shape[0]
+
+
+def as_vector_array(vectors):
+    """Accept a vector array or the list of {"n", "real", "imaginary"} dicts the API returns"""
+    if isinstance(vectors, np.ndarray) and vectors.dtype == VECTOR_DTYPE:
+        return vectors
+
+    vectors = list(vectors)
+    array = np.empty(len(vectors), dtype=VECTOR_DTYPE)
+
+    for field in VECTOR_DTYPE.names:
+        array[field] = [vector[field] for vector in vectors]
+
+    return array
+
+
+def to_api_vectors(vectors):
+    """Convert a vector array to the list of {"n", "real", "imaginary"} dicts the API returns"""
+    return [
+        {"n": n, "real": real, "imaginary": imaginary}
+        for n, real, imaginary in zip(vectors["n"].tolist(), vectors["real"].tolist(), vectors["imaginary"].tolist())
+    ]
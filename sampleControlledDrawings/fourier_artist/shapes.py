@@ -0,0 +1,43 @@
+"""
+Access to the generators in the sample scripts (circle_sin.py, spiral.py, ...)
+for the offline tools, without running the scripts themselves.
+"""
+import importlib
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (script module, generator function)
+GENERATORS = (
+    ("circle_sin", "generate_sinusoidal_circle"),
+    ("curly_maze", "generate_curly_maze"),
+    ("draw_circle", "generate_circle_points"),
+    ("ellipse", "generate_ellipse"),
+    ("single_stroke_art", "generate_single_stroke_art"),
+    ("spiral", "generate_spiral"),
+    ("spiral", "generate_golden_spiral"),
+    ("square", "generate_square"),
+    ("superformula_art", "generate_complex_drawing"),
+)
+
+# Scripts whose generators render a PNG unless passed visualize=False
+VISUALIZING = ("single_stroke_art", "superformula_art")
+
+
+def load_script(name):
+    """Import one of the sample scripts. They only import matplotlib to render, on the Agg backend."""
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+
+    return importlib.import_module(name)
+
+
+def generator(module, function, **params):
+    """Return generate(num_points) for a generator called with params, with rendering switched off"""
+    generate = getattr(load_script(module), function)
+
+    if module in VISUALIZING:
+        params["visualize"] = False
+
+    return lambda num_points: generate(num_points=num_points, **params)
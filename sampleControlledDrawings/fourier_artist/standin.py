@@ -0,0 +1,419 @@
+"""
+A minimal local stand-in for the drawing API, for testing the client tools
+(load testing, bulk submission) without Go, MySQL or Docker.
+
+It speaks the parts of the API the tools use: POST /drawing and
+POST /drawings/batch in every wire format (gzipped or not, with a
+Content-Length or chunked), GET /drawing/:id (with ?fields=, ?wait= and
+If-None-Match), GET /drawing/:id/status, GET /drawings/recent and
+GET /drawings/queue. Submissions go into an unbounded queue drained by a fixed
+number of worker threads, like the API's processing workers, which compute
+the vectors with series.build_series. Gallery previews are thinned to
+PREVIEW_POINTS by taking every nth point rather than simplified like the
+API's. Like the API, a drawing identical to one stored (see points_hash) gets
+the existing id and is not queued again, unless it failed, in which case it is
+queued anew with no attempts. `delay` adds a fixed amount of processing time
+per drawing to imitate a slower server.
+
+Usage: python -m fourier_artist.standin [--port 8081] [--workers 5] [--delay 0.5]
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import queue
+import re
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from .points import POINT_DTYPE, as_point_array, from_columns
+from .series import build_series, to_api_vectors
+from .validation import InvalidSubmission, clamp_max_vectors, validate_points
+from .wire import BINARY_CONTENT_TYPE, COLUMNS_CONTENT_TYPE, decode_binary, decode_binary_batch
+
+DRAWING_PATH = re.compile(r"^/drawing/(\d+)$")
+STATUS_PATH = re.compile(r"^/drawing/(\d+)/status$")
+
+# Like the API, a drawing whose processing raises this many times is failed
+MAX_ATTEMPTS = 3
+
+# What GET /drawing/:id?fields= can ask for, and the API's longest ?wait=
+DRAWING_FIELDS = ("id", "featured", "originalPoints", "drawVectors", "createdAt", "lastDrawVectorCalculatedAt",
+                  "state")
+MAX_WAIT = 30
+
+# The API's preview.MaxPoints and the number of drawings GET /drawings/recent returns
+PREVIEW_POINTS = 500
+RECENT_COUNT = 20
+
+
+class BadRequest(Exception):
+    pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 8081), workers=5, delay=0.0):
+        super().__init__(address, StandInHandler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        # Notified whenever a drawing is done or failed, for GET /drawing/:id?wait=
+        self.finished = threading.Condition(self.lock)
+        self.drawings = {}
+        self.previews = {}
+        # The queue columns of the API's drawings table: state, attempts, processingStartedAt
+        self.statuses = {}
+        # Drawing id for every points_hash, for spotting duplicates
+        self.hashes = {}
+        self.work = queue.Queue()
+        self.workers = [threading.Thread(target=self.process_work, daemon=True) for _ in range(workers)]
+
+        for worker in self.workers:
+            worker.start()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve on a background thread, for tests and in-process use"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+        return self
+
+    def backlog(self):
+        """Drawings submitted but not picked up by a worker yet"""
+        return self.work.qsize()
+
+    def create(self, points, max_vectors):
+        key = points_hash(points, max_vectors)
+
+        with self.lock:
+            existing = self.hashes.get(key)
+
+            if existing is not None:
+                status = self.statuses[existing]
+
+                if status["state"] != "failed":
+                    return existing
+
+                status.update(state="pending", attempts=0)
+                self.work.put((existing, max_vectors))
+
+                return existing
+
+            drawing_id = len(self.drawings) + 1
+            self.hashes[key] = drawing_id
+            self.drawings[drawing_id] = {
+                "id": drawing_id,
+                "featured": False,
+                "originalPoints": points,
+                "drawVectors": [],
+                "createdAt": timestamp(),
+                "lastDrawVectorCalculatedAt": None,
+            }
+            self.previews[drawing_id] = svg_path(points)
+            self.statuses[drawing_id] = {"state": "pending", "attempts": 0, "processingStartedAt": None}
+
+        self.work.put((drawing_id, max_vectors))
+
+        return drawing_id
+
+    def get(self, drawing_id, wait=0):
+        """The drawing and its state, after waiting up to wait seconds for it to be processed"""
+        with self.lock:
+            if drawing_id not in self.drawings:
+                return None
+
+            self.finished.wait_for(lambda: self.statuses[drawing_id]["state"] in ("done", "failed"), wait)
+
+            return dict(self.drawings[drawing_id], state=self.statuses[drawing_id]["state"])
+
+    def status(self, drawing_id):
+        with self.lock:
+            if drawing_id not in self.statuses:
+                return None
+
+            drawing = self.drawings[drawing_id]
+            status = self.statuses[drawing_id]
+            position = 0
+
+            if status["state"] == "pending":
+                position = sum(1 for other_id, other in self.statuses.items()
+                               if other_id < drawing_id and other["state"] == "pending")
+
+            return {
+                "id": drawing_id,
+                "state": status["state"],
+                "position": position,
+                "attempts": status["attempts"],
+                "createdAt": drawing["createdAt"],
+                "processingStartedAt": status["processingStartedAt"],
+                "lastDrawVectorCalculatedAt": drawing["lastDrawVectorCalculatedAt"],
+            }
+
+    def queue(self):
+        with self.lock:
+            states = [status["state"] for status in self.statuses.values()]
+
+        return {
+            "pending": states.count("pending"),
+            "processing": states.count("processing"),
+            "failed": states.count("failed"),
+            "workers": len(self.workers),
+        }
+
+    def recent(self):
+        with self.lock:
+            newest = sorted(self.previews, reverse=True)[:RECENT_COUNT]
+
+            return [{"id": drawing_id, "svgPath": self.previews[drawing_id]} for drawing_id in newest]
+
+    def process_work(self):
+        while True:
+            drawing_id, max_vectors = self.work.get()
+
+            with self.lock:
+                points = self.drawings[drawing_id]["originalPoints"]
+                status = self.statuses[drawing_id]
+                status.update(state="processing", processingStartedAt=timestamp())
+                status["attempts"] += 1
+
+            if self.delay:
+                time.sleep(self.delay)
+
+            try:
+                vectors = to_api_vectors(build_series(points, max_vectors))
+            except Exception:
+                with self.lock:
+                    status["state"] = "failed" if status["attempts"] >= MAX_ATTEMPTS else "pending"
+                    self.finished.notify_all()
+
+                if status["state"] == "pending":
+                    self.work.put((drawing_id, max_vectors))
+
+                continue
+
+            with self.lock:
+                drawing = self.drawings[drawing_id]
+                drawing["drawVectors"] = vectors
+                drawing["lastDrawVectorCalculatedAt"] = timestamp()
+                status["state"] = "done"
+                self.finished.notify_all()
+
+    def shutdown(self):
+        super().shutdown()
+        self.server_close()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        try:
+            drawings = self.read_drawings()
+        except BadRequest as e:
+            return self.respond(400, {"message": str(e)})
+
+        ids = [self.server.create(points, max_vectors) for points, max_vectors in drawings]
+
+        if self.path == "/drawing":
+            return self.respond(200, {"id": ids[0]})
+
+        self.respond(200, {"ids": ids})
+
+    def do_GET(self):
+        if self.path == "/drawings/recent":
+            return self.respond(200, self.server.recent())
+
+        if self.path == "/drawings/queue":
+            return self.respond(200, self.server.queue())
+
+        status_match = STATUS_PATH.match(self.path)
+
+        if status_match:
+            status = self.server.status(int(status_match.group(1)))
+
+            if status is None:
+                return self.respond(404, {"message": "This drawing doesn't exist."})
+
+            return self.respond(200, status)
+
+        url = urlsplit(self.path)
+        match = DRAWING_PATH.match(url.path)
+
+        if not match:
+            return self.respond(404, {"message": "Not Found"})
+
+        query = parse_qs(url.query)
+        fields = [field.strip() for field in query.get("fields", [""])[0].split(",") if field.strip()]
+        wait = query.get("wait", ["0"])[0]
+
+        if any(field not in DRAWING_FIELDS for field in fields) or not wait.isdigit():
+            return self.respond(400, {"message": "The request is not properly formatted."})
+
+        drawing = self.server.get(int(match.group(1)), min(int(wait), MAX_WAIT))
+
+        if drawing is None:
+            return self.respond(404, {"message": "This drawing doesn't exist."})
+
+        # Changes with the vectors and the state, and differs per selection of fields, like the API's
+        etag = f'"{drawing["id"]}-{drawing["lastDrawVectorCalculatedAt"]}-{drawing["state"]}-{"+".join(fields)}"'
+
+        if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+            return self.respond(304, None, {"ETag": etag})
+
+        if not fields:
+            fields = DRAWING_FIELDS[:-1]
+
+        if "originalPoints" in fields:
+            drawing["originalPoints"] = [
+                {"x": int(x), "y": int(y), "time": float(t)}
+                for t, x, y in drawing["originalPoints"].tolist()
+            ]
+
+        self.respond(200, {field: drawing[field] for field in fields}, {"ETag": etag, "Cache-Control": "no-cache"})
+
+    def read_drawings(self):
+        """Decode and validate the body, returning a list of (points, max_vectors)"""
+        if self.path not in ("/drawing", "/drawings/batch"):
+            raise BadRequest("Not Found")
+
+        body = self.read_body()
+
+        try:
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+
+            drawings = decode(body, self.headers.get("Content-Type", ""), batch=self.path != "/drawing")
+        except InvalidSubmission as e:
+            # Coordinates out of range, caught while the points are decoded
+            raise BadRequest(str(e))
+        except (OSError, ValueError, KeyError, TypeError):
+            raise BadRequest("The request is not properly formatted.")
+
+        if not drawings:
+            raise BadRequest("There needs to be at least 1 drawing.")
+
+        validated = []
+
+        for i, (points, max_vectors) in enumerate(drawings):
+            try:
+                validated.append((validate_points(points), clamp_max_vectors(max_vectors)))
+            except InvalidSubmission as e:
+                raise BadRequest(str(e) if self.path == "/drawing" else f"Drawing {i}: {e}")
+
+        return validated
+
+    def read_body(self):
+        """The raw body, sent with a Content-Length or with chunked transfer encoding"""
+        if self.headers.get("Transfer-Encoding", "").lower() != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        chunks = []
+
+        while True:
+            size = int(self.rfile.readline().split(b";")[0], 16)
+
+            if size == 0:
+                # Skip any trailers up to the final empty line
+                while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+
+                return b"".join(chunks)
+
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+
+    def respond(self, status, payload, headers=None):
+        body = b"" if status == 304 else json.dumps(payload).encode()
+        self.send_response(status)
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        if status != 304:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def decode(body, content_type, batch):
+    media_type = content_type.split(";")[0].strip()
+
+    if media_type == BINARY_CONTENT_TYPE:
+        return decode_binary_batch(body) if batch else [decode_binary(body)]
+
+    payload = json.loads(body)
+    payloads = payload["drawings"] if batch else [payload]
+
+    if media_type == COLUMNS_CONTENT_TYPE:
+        return [(from_columns(p["time"], p["x"], p["y"]), p.get("maxVectors")) for p in payloads]
+
+    return [(as_point_array(p["points"]), p.get("maxVectors")) for p in payloads]
+
+
+def points_hash(points, max_vectors):
+    """
+    The API's store.PointsHash: SHA-256 of maxVectors (uint32) and every point
+    as a point array record with its time divided by the last point's time.
+    """
+    normalized = np.array(points, dtype=POINT_DTYPE)
+    final_time = normalized["time"][-1]
+
+    if final_time != 0:
+        normalized["time"] /= final_time
+
+    digest = hashlib.sha256(struct.pack("<I", max_vectors))
+    digest.update(normalized.view(np.uint8))
+
+    return digest.hexdigest()
+
+
+def svg_path(points):
+    """The "M x y L x y ..." gallery path of a drawing, from at most PREVIEW_POINTS of its points"""
+    stride = max(1, -(-points.shape[0] // PREVIEW_POINTS))
+    kept = points[::stride].tolist()
+
+    # Always end where the drawing ends
+    if (points.shape[0] - 1) % stride:
+        kept = kept[:PREVIEW_POINTS - 1] + [points[-1].tolist()]
+
+    return "".join(f"{'L' if i else 'M'} {int(x)} {int(y)} " for i, (_, x, y) in enumerate(kept))
+
+
+def timestamp():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S%z")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the drawing API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--workers", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.0, help="extra processing seconds per drawing")
+    args = parser.parse_args(argv)
+
+    server = StandInServer((args.host, args.port), workers=args.workers, delay=args.delay)
+    print(f"Stand-in drawing API listening on {server.url}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+Sweep the parameters of the art generators and keep the best shapes.
+
+Variants come from a parameter grid (every combination) or a random sampler
+over the same space. They are generated in a process pool, a batch at a time:
+the workers write the points of each variant straight into one shared memory
+block and score them there, so only the scores travel back. Only the best
+`top` variants are kept (with a copy of their points), get a NumPy thumbnail
+and can be submitted.
+
+Scores, higher is better:
+
+- concentration: the share of the drawing's energy (vector 0 aside) in the
+  first `budget` vectors, from the planner's Parseval curve. High for shapes
+  the API can draw well with few vectors.
+- complexity: the number of vectors needed for 99.9% of the energy. High for
+  intricate shapes.
+
+Parameters are given as NAME=VALUES, where VALUES is a comma separated list
+or a LOW:HIGH range (sampled uniformly with --random, `--steps` values on a
+grid). Superformula layers are addressed by their index in DEFAULT_LAYERS:
+
+    python -m fourier_artist.sweep superformula --param 0.m=2,3,5,6,8 --param 0.n1=0.5:2 --random 2000
+    python -m fourier_artist.sweep single_stroke --param n_lobes=3:7 --param complexity=1,2,3,4 --submit 3
+"""
+import argparse
+import heapq
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from .planner import error_curve
+from .points import POINT_DTYPE
+from .render import Canvas, hsv_gradient
+from .shapes import load_script
+from .validation import MAX_VECTORS
+
+DEFAULT_POINTS = 15000
+DEFAULT_BATCH = 128
+
+# Energy share the complexity score asks for
+COMPLEXITY_ENERGY = 0.999
+
+
+def superformula(num_points, params):
+    """superformula_art points, with "<layer>.<key>" parameters replacing the DEFAULT_LAYERS values"""
+    module = load_script("superformula_art")
+    layers = [dict(layer) for layer in module.DEFAULT_LAYERS]
+    options = {}
+
+    for name, value in params.items():
+        layer, _, key = name.partition(".")
+
+        if key:
+            layers[int(layer)][key] = value
+        else:
+            options[name] = value
+
+    return module.generate_layers(num_points, layers=layers, **options)[1]
+
+
+def single_stroke(num_points, params):
+    module = load_script("single_stroke_art")
+
+    return module.generate_single_stroke_art(num_points=num_points, visualize=False, **params)
+
+
+SHAPES = {
+    "superformula": superformula,
+    "single_stroke": single_stroke,
+}
+
+
+def concentration(points, budget):
+    return float(error_curve(points, budget)[1][-1])
+
+
+def complexity(points, budget):
+    fraction = error_curve(points, MAX_VECTORS)[1]
+    reached = np.flatnonzero(fraction >= COMPLEXITY_ENERGY)
+
+    return float(reached[0] + 1 if reached.size else MAX_VECTORS + 1)
+
+
+SCORES = {
+    "concentration": concentration,
+    "complexity": complexity,
+}
+
+
+@dataclass
+class Variant:
+    index: int
+    params: dict
+    score: float
+    points: Optional[np.ndarray] = field(default=None, repr=False)
+    thumbnail: Optional[str] = None
+    drawing_id: Optional[int] = None
+
+
+def parse_param(text):
+    """NAME=1,2,3 -> (NAME, [1, 2, 3]) and NAME=0.5:2 -> (NAME, (0.5, 2.0))"""
+    name, separator, values = text.partition("=")
+
+    if not separator or not name or not values:
+        raise ValueError(f"Expected NAME=VALUES, got {text!r}")
+
+    if ":" in values:
+        low, high = values.split(":")
+
+        return name, (_number(low), _number(high))
+
+    return name, [_number(value) for value in values.split(",")]
+
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def grid(space, steps=5):
+    """Every combination of the parameter values, ranges split into `steps` values"""
+    names = list(space)
+    axes = [_axis(space[name], steps) for name in names]
+
+    for values in itertools.product(*axes):
+        yield dict(zip(names, values))
+
+
+def _axis(values, steps):
+    if isinstance(values, list):
+        return values
+
+    low, high = values
+
+    if isinstance(low, int) and isinstance(high, int):
+        return sorted({int(round(value)) for value in np.linspace(low, high, steps)})
+
+    return np.linspace(low, high, steps).tolist()
+
+
+def random_variants(space, count, seed=None):
+    """`count` parameter sets: list values picked uniformly, ranges sampled uniformly (integers inclusive)"""
+    rng = np.random.default_rng(seed)
+
+    for _ in range(count):
+        params = {}
+
+        for name, values in space.items():
+            if isinstance(values, list):
+                params[name] = values[int(rng.integers(len(values)))]
+            elif all(isinstance(value, int) for value in values):
+                params[name] = int(rng.integers(values[0], values[1] + 1))
+            else:
+                params[name] = float(rng.uniform(*values))
+
+        yield params
+
+
+_worker = None
+
+
+class _Worker:
+    """Generates and scores variants into rows of the shared points block"""
+
+    def __init__(self, shape, score, budget, num_points, block):
+        self.shape = SHAPES[shape]
+        self.score = SCORES[score]
+        self.budget = budget
+        self.num_points = num_points
+        self.block = block
+
+    def evaluate(self, first, params_list):
+        scores = []
+
+        for slot, params in enumerate(params_list, first):
+            try:
+                # Parameters that send points to infinity fail when the points are converted to integers
+                with np.errstate(all="ignore", invalid="raise"):
+                    self.block[slot] = self.shape(self.num_points, params)
+
+                score = self.score(self.block[slot], self.budget)
+            except (ArithmeticError, ValueError):
+                score = -math.inf
+
+            scores.append(score if math.isfinite(score) else -math.inf)
+
+        return scores
+
+
+def _start_worker(shape, score, budget, num_points, memory_name, batch):
+    global _worker
+
+    memory = shared_memory.SharedMemory(name=memory_name)
+    block = np.ndarray((batch, num_points), dtype=POINT_DTYPE, buffer=memory.buf)
+    _worker = _Worker(shape, score, budget, num_points, block)
+    # Kept referenced for as long as the worker uses the block
+    _worker.memory = memory
+
+
+def _evaluate(first, params_list):
+    return _worker.evaluate(first, params_list)
+
+
+def sweep(shape, variants, num_points=DEFAULT_POINTS, score="concentration", budget=100, top=10, workers=None,
+          batch=DEFAULT_BATCH):
+    """
+    Generate and score every parameter set in `variants` (any iterable, read a
+    batch at a time) and return the `top` best as Variants with their points,
+    best first. Variants the generator cannot draw (points at infinity) are left out.
+    """
+    variants = iter(variants)
+    first = next(variants, None)
+
+    if first is None:
+        return []
+
+    # A bad parameter name fails here, before any work is spread out
+    try:
+        with np.errstate(all="ignore"):
+            SHAPES[shape](2, first)
+    except (IndexError, KeyError, TypeError) as e:
+        raise ValueError(f"{shape} cannot take the parameters {first}: {e}") from e
+    except ValueError:
+        # Points out of the integer range: an undrawable variant, left out below
+        pass
+
+    variants = itertools.chain([first], variants)
+    workers = workers or os.cpu_count() or 1
+    memory = shared_memory.SharedMemory(create=True, size=batch * num_points * POINT_DTYPE.itemsize)
+    block = np.ndarray((batch, num_points), dtype=POINT_DTYPE, buffer=memory.buf)
+    executor = worker = None
+    best = []
+    index = 0
+
+    if workers == 1:
+        worker = _Worker(shape, score, budget, num_points, block)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                                       initargs=(shape, score, budget, num_points, memory.name, batch))
+
+    try:
+        while True:
+            params_list = list(itertools.islice(variants, batch))
+
+            if not params_list:
+                break
+
+            if executor is None:
+                scores = worker.evaluate(0, params_list)
+            else:
+                chunk = max(1, math.ceil(len(params_list) / (4 * workers)))
+                futures = [executor.submit(_evaluate, first, params_list[first:first + chunk])
+                           for first in range(0, len(params_list), chunk)]
+                scores = [value for future in futures for value in future.result()]
+
+            # A min-heap of the best so far, ties going to the earlier variant
+            for slot, (params, value) in enumerate(zip(params_list, scores)):
+                entry = (value, -(index + slot))
+
+                if value == -math.inf:
+                    continue
+
+                if len(best) < top or entry > best[0][0]:
+                    variant = Variant(index + slot, params, value, block[slot].copy())
+                    push = heapq.heappush if len(best) < top else heapq.heapreplace
+                    push(best, (entry, variant))
+
+            index += len(params_list)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+        memory.close()
+        memory.unlink()
+
+    return [variant for _, variant in sorted(best, key=lambda item: item[0], reverse=True)]
+
+
+def write_thumbnails(variants, directory, shape, size=256):
+    """Render a NumPy preview of every variant, returning the filenames"""
+    os.makedirs(directory, exist_ok=True)
+
+    for rank, variant in enumerate(variants, 1):
+        points = variant.points
+        canvas = Canvas.fit(points["x"], points["y"], size=size)
+        canvas.polyline(points["x"], points["y"], hsv_gradient(len(points) - 1))
+        variant.thumbnail = canvas.save(os.path.join(directory, f"{rank:03d}_{shape}_{variant.index}.png"))
+
+    return [variant.thumbnail for variant in variants]
+
+
+def submit_variants(variants, max_vectors, api_url, cache=None):
+    """Submit the variants in one batch (skipping what the ResultCache knows), setting their drawing ids"""
+    from .client import DrawingClient
+
+    with DrawingClient(api_url, cache=cache) as client:
+        ids = client.submit_batch([variant.points for variant in variants], max_vectors)
+
+    for variant, drawing_id in zip(variants, ids):
+        variant.drawing_id = drawing_id
+
+    return ids
+
+
+def write_results(variants, filename, shape, score):
+    results = [
+        {"rank": rank, "index": variant.index, "params": variant.params, score: variant.score,
+         "thumbnail": variant.thumbnail, "id": variant.drawing_id}
+        for rank, variant in enumerate(variants, 1)
+    ]
+
+    with open(filename, "w") as f:
+        json.dump({"shape": shape, "results": results}, f, indent=2)
+
+    return filename
+
+
+def main(argv=None):
+    from .client import DEFAULT_API_URL
+
+    parser = argparse.ArgumentParser(description="Sweep the parameters of an art generator")
+    parser.add_argument("shape", choices=sorted(SHAPES))
+    parser.add_argument("--param", action="append", default=[], type=parse_param, metavar="NAME=VALUES",
+                        help="comma separated values or a LOW:HIGH range, repeat for every parameter")
+    parser.add_argument("--random", type=int, metavar="COUNT", help="sample COUNT variants instead of the full grid")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--steps", type=int, default=5, help="grid values per range (default: 5)")
+    parser.add_argument("--points", type=int, default=DEFAULT_POINTS, help="points per variant")
+    parser.add_argument("--score", choices=sorted(SCORES), default="concentration")
+    parser.add_argument("--budget", type=int, default=100, help="vectors the concentration score allows")
+    parser.add_argument("--top", type=int, default=10, help="variants to keep")
+    parser.add_argument("--workers", type=int, help="processes (default: all CPUs)")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, help="variants per shared memory batch")
+    parser.add_argument("--out", help="directory for thumbnails and results.json (default: timestamped)")
+    parser.add_argument("--thumbnail-size", type=int, default=256)
+    parser.add_argument("--submit", type=int, default=0, metavar="COUNT", help="submit the best COUNT variants")
+    parser.add_argument("--max-vectors", type=int, help="maxVectors for submitted variants (default: the budget)")
+    parser.add_argument("--api-url", default=DEFAULT_API_URL)
+    args = parser.parse_args(argv)
+
+    space = dict(args.param)
+
+    if args.random:
+        variants = random_variants(space, args.random, args.seed)
+    else:
+        variants = grid(space, args.steps)
+
+    try:
+        best = sweep(args.shape, variants, args.points, args.score, args.budget, args.top, args.workers, args.batch)
+    except ValueError as e:
+        parser.error(str(e))
+
+    directory = args.out or f"sweep_{args.shape}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    write_thumbnails(best, directory, args.shape, args.thumbnail_size)
+
+    if args.submit:
+        from .cache import default_cache
+
+        submit_variants(best[:args.submit], args.max_vectors or args.budget, args.api_url, default_cache())
+
+    for rank, variant in enumerate(best, 1):
+        drawing = f", drawing {variant.drawing_id}" if variant.drawing_id is not None else ""
+        print(f"#{rank} {args.score} {variant.score:.6g} {variant.params}{drawing}")
+
+    print(f"Wrote {write_results(best, os.path.join(directory, 'results.json'), args.shape, args.score)}")
+
+
+if __name__ == "__main__":
+    main()
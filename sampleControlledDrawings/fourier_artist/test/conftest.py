@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from fourier_artist.points import from_columns, uniform_time
+from fourier_artist.standin import StandInServer
+
+
+def build_points(count=300, turns=1):
+    time = uniform_time(count)
+    angle = 2 * np.pi * turns * time
+
+    return from_columns(time, 100 * np.cos(angle), 70 * np.sin(angle))
+
+
+@pytest.fixture
+def server():
+    server = StandInServer(("127.0.0.1", 0), workers=2).start()
+
+    yield server
+
+    server.shutdown()
@@ -0,0 +1,53 @@
+import json
+
+from fourier_artist.benchmark import all_cases, compare, main
+from fourier_artist.shapes import GENERATORS
+
+
+def test_compare_flags_time_and_memory_regressions():
+    baseline = {
+        "fast": {"seconds": 1.0, "peak_bytes": 1000},
+        "slow": {"seconds": 1.0, "peak_bytes": 1000},
+        "hungry": {"seconds": 1.0, "peak_bytes": 1000},
+    }
+    results = {
+        "fast": {"seconds": 1.2, "peak_bytes": 1200},
+        "slow": {"seconds": 1.5, "peak_bytes": 1000},
+        "hungry": {"seconds": 0.5, "peak_bytes": 2000},
+        "untracked": {"seconds": 100.0, "peak_bytes": 10 ** 9},
+    }
+
+    regressions = compare(baseline, results, threshold=0.25)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("slow:")
+    assert regressions[1].startswith("hungry:")
+
+
+def test_cases_cover_every_generator_and_visualization(tmp_path):
+    names = [case.name for case in all_cases(sizes=(10,), visualization_sizes=(10,), output_dir=str(tmp_path))]
+
+    assert len(names) == len(set(names))
+    for _, function in GENERATORS:
+        assert f"generate/{function}/10" in names
+    assert "encode/json/10" in names
+    assert "visualize/single_stroke_art/10" in names
+    assert "visualize/superformula_art/10" in names
+    assert "preview/single_stroke_art/10" in names
+
+
+def test_update_then_compare(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    arguments = ["--baseline", str(baseline), "--sizes", "100", "--repeat", "1", "--match", "encode/"]
+
+    assert main(arguments + ["--update"]) == 0
+
+    cases = json.loads(baseline.read_text())["cases"]
+    assert set(cases) == {"encode/payload/100", "encode/json/100", "encode/columns/100", "encode/binary/100"}
+
+    assert main(arguments) == 0
+
+    # Pretend every case used to take no time and memory at all
+    baseline.write_text(json.dumps({"cases": {name: {"seconds": 0, "peak_bytes": 0} for name in cases}}))
+
+    assert main(arguments) == 1
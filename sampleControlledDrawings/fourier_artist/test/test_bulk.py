@@ -0,0 +1,104 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pytest
+
+from fourier_artist.bulk import run, summarize
+from fourier_artist.points import from_columns, uniform_time
+
+
+class ProcessingHandler(BaseHTTPRequestHandler):
+    """Accepts drawings and reports them done on the second poll"""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+
+        with self.server.lock:
+            self.server.polls.append(0)
+            drawing_id = len(self.server.polls)
+            self.server.max_unfinished = max(self.server.max_unfinished, self.unfinished())
+
+        self.respond({"id": drawing_id})
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        drawing_id = int(url.path.rsplit("/", 1)[1])
+
+        with self.server.lock:
+            self.server.polls[drawing_id - 1] += 1
+            self.server.queries.append(parse_qs(url.query))
+            done = self.server.polls[drawing_id - 1] >= 2
+
+        vectors = [{"n": 0, "real": 0, "imaginary": 0}] if done else []
+        self.respond({"id": drawing_id, "state": "done" if done else "pending", "drawVectors": vectors})
+
+    def unfinished(self):
+        return sum(1 for polls in self.server.polls if polls < 2)
+
+    def respond(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ProcessingHandler)
+    server.lock = threading.Lock()
+    server.polls = []
+    server.queries = []
+    server.max_unfinished = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_submit_all_tracks_every_drawing(server):
+    time = uniform_time(200)
+    drawings = (from_columns(time, 50 * np.cos(i * time), 50 * np.sin(time)) for i in range(12))
+
+    results = run(drawings, api_url=f"http://127.0.0.1:{server.server_port}", concurrency=4, max_pending=3,
+                  poll_interval=0.01)
+
+    assert [result.index for result in results] == list(range(12))
+    assert sorted(result.drawing_id for result in results) == list(range(1, 13))
+    assert all(result.error is None and result.vector_count == 1 for result in results)
+    assert server.max_unfinished <= 3
+
+    assert all(query["wait"] == ["10"] and "state" in query["fields"][0] for query in server.queries)
+
+    summary = summarize(results, elapsed=1.0)
+    assert summary["succeeded"] == 12
+    assert set(summary["processing_latency"]) == {"p50", "p90", "p95", "p99"}
+
+
+def test_failures_are_reported_per_drawing(server):
+    bad = from_columns([0.5, 1], [0, 0], [0, 0])
+
+    results = run([bad], api_url=f"http://127.0.0.1:{server.server_port}")
+
+    assert results[0].drawing_id is None
+    assert "first point's time must be zero" in results[0].error
+
+
+def test_polling_without_waiting(server):
+    time = uniform_time(200)
+    drawings = [from_columns(time, 50 * np.cos(time), 50 * np.sin(time)) for _ in range(2)]
+
+    results = run(drawings, api_url=f"http://127.0.0.1:{server.server_port}", poll_wait=0, poll_interval=0.01)
+
+    assert all(result.error is None and result.vector_count == 1 for result in results)
+    assert not any("wait" in query for query in server.queries)
@@ -0,0 +1,121 @@
+import os
+import time
+
+from fourier_artist.bulk import run
+from fourier_artist.cache import ResultCache, cache_key
+from fourier_artist.client import DrawingClient
+from fourier_artist.points import to_api_points
+
+from fourier_artist.test.conftest import build_points
+
+
+def wait_for_vectors(client, drawing_id, timeout=10):
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        drawing = client.get(drawing_id)
+
+        if drawing["drawVectors"]:
+            return drawing
+
+        time.sleep(0.01)
+
+    raise TimeoutError(drawing_id)
+
+
+def test_key_depends_on_content_and_max_vectors():
+    points = build_points()
+
+    assert cache_key(points, 50) == cache_key(to_api_points(points), 50)
+    assert cache_key(points, 50) != cache_key(points, 51)
+    assert cache_key(points, 500) == cache_key(points, 1000)
+    assert cache_key(points, 50) != cache_key(build_points(turns=2), 50)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=10_000)
+    entry = {"apiUrl": "http://api", "id": 1, "maxVectors": 10, "drawVectors": [{"n": 0}] * 100}
+
+    for index, key in enumerate(["a", "b", "c"]):
+        cache.put(key, entry)
+        os.utime(cache.path(key), (index, index))
+
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") is not None
+    entry_size = os.path.getsize(cache.path("a"))
+    cache.max_bytes = 3 * entry_size
+    cache.put("d", entry)
+
+    assert cache.get("b") is None
+    assert [cache.get(key) is not None for key in "acd"] == [True, True, True]
+    assert cache.size() <= cache.max_bytes
+
+
+def test_puts_do_not_rescan_the_directory(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path), max_bytes=10_000)
+    entry = {"apiUrl": "http://api", "id": 1, "maxVectors": 10, "drawVectors": [{"n": 0}] * 100}
+    scans = []
+    scan = cache.entries
+
+    def entries():
+        scans.append(1)
+
+        return scan()
+
+    monkeypatch.setattr(cache, "entries", entries)
+
+    for key in range(50):
+        cache.put(str(key), entry)
+
+    assert len(scans) == 1
+    assert cache.total == cache.size() <= cache.max_bytes
+    assert cache.get("49") is not None and cache.get("0") is None
+
+
+def test_resubmitting_a_drawing_uses_the_cached_id(server, tmp_path):
+    points = build_points()
+
+    with DrawingClient(server.url, cache=ResultCache(str(tmp_path))) as client:
+        drawing_id = client.submit(points, 20)["id"]
+        drawing = wait_for_vectors(client, drawing_id)
+
+    with DrawingClient(server.url, cache=ResultCache(str(tmp_path))) as client:
+        assert client.submit(to_api_points(points), 20) == {"id": drawing_id}
+        assert client.submit_batch([build_points(turns=2), points], 20) == [2, drawing_id]
+        assert client.cached(points, 20)["drawVectors"] == drawing["drawVectors"]
+
+    assert len(server.drawings) == 2
+
+
+def test_ids_are_not_reused_for_another_api(server, tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put(cache_key(build_points(), 20), {"apiUrl": "http://elsewhere", "id": 7, "maxVectors": 20,
+                                              "drawVectors": None})
+
+    with DrawingClient(server.url, cache=cache) as client:
+        assert client.submit(build_points(), 20) == {"id": 1}
+
+
+def test_bulk_skips_drawings_with_cached_vectors(server, tmp_path):
+    drawings = [build_points(turns=turns) for turns in (1, 2)]
+
+    first = run(drawings, api_url=server.url, max_vectors=10, poll_interval=0.01, cache=ResultCache(str(tmp_path)))
+    second = run(drawings, api_url=server.url, max_vectors=10, poll_interval=0.01, cache=ResultCache(str(tmp_path)))
+
+    assert [result.cached for result in first] == [False, False]
+    assert [result.cached for result in second] == [True, True]
+    assert [result.drawing_id for result in second] == [result.drawing_id for result in first]
+    assert [result.vector_count for result in second] == [result.vector_count for result in first]
+    assert len(server.drawings) == 2
+
+
+def test_bulk_does_not_reuse_vectors_cached_for_another_api(server, tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put(cache_key(build_points(), 10), {"apiUrl": "http://elsewhere", "id": 7, "maxVectors": 10,
+                                              "drawVectors": [{"n": 0, "real": 1, "imaginary": 0}]})
+
+    results = run([build_points()], api_url=server.url, max_vectors=10, poll_interval=0.01, cache=cache)
+
+    assert results[0].cached is False
+    assert results[0].drawing_id == 1
+    assert len(server.drawings) == 1
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from fourier_artist.bulk import load_drawing
+from fourier_artist.cli import SHAPES, build_parser, main
+from fourier_artist.shapes import SCRIPTS_DIR, load_script
+
+
+def test_help_imports_nothing_heavy():
+    check = ("import sys\n"
+             "from fourier_artist.cli import build_parser\n"
+             "build_parser().format_help()\n"
+             "print(sorted(m for m in ('numpy', 'requests', 'matplotlib') if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", check], cwd=SCRIPTS_DIR, capture_output=True, text=True,
+                            check=True).stdout
+
+    assert output.strip() == "[]"
+
+
+def test_every_shape_matches_its_script():
+    for name, shape in SHAPES.items():
+        assert callable(getattr(load_script(shape.script), shape.function)), name
+
+    args = build_parser().parse_args(["curly_maze"])
+
+    assert (args.points, args.max_vectors, args.render) == (15000, 500, "none")
+    assert build_parser().parse_args(["superformula"]).render == "matplotlib"
+
+
+def test_a_drawing_is_saved_without_submitting(tmp_path):
+    main(["spiral", "--points", "2000", "--no-submit", "--out", str(tmp_path / "spiral.npy")])
+    main(["square", "--points", "400", "--no-submit", "--out", str(tmp_path / "square.json")])
+
+    spiral = load_script("spiral").generate_spiral(a=10, b=1, num_turns=15, num_points=2000)
+
+    assert np.array_equal(load_drawing(str(tmp_path / "spiral.npy")), spiral)
+    assert len(load_drawing(str(tmp_path / "square.json"))) == 400
+
+
+def test_a_drawing_is_submitted_and_previewed(server, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("FOURIER_ARTIST_CACHE", "off")
+    monkeypatch.chdir(tmp_path)
+
+    main(["single_stroke", "--points", "3000", "--max-vectors", "30", "--api-url", server.url,
+          "--render", "numpy", "--size", "100"])
+
+    assert "Drawing ID: 1" in capsys.readouterr().out
+    assert len(server.drawings[1]["originalPoints"]) == 3000
+    assert [name.endswith("_preview.png") for name in os.listdir(tmp_path)] == [True]
@@ -0,0 +1,265 @@
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from fourier_artist.client import DrawingClient, ProcessingFailed
+from fourier_artist.points import from_columns, to_api_points
+from fourier_artist.validation import InvalidSubmission, clamp_max_vectors, validate_points
+from fourier_artist.wire import BINARY_CONTENT_TYPE, decode_binary
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    """Answers POST /drawing with the queued statuses, recording every body it receives"""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+
+        if self.headers["Content-Type"] == BINARY_CONTENT_TYPE:
+            points, max_vectors = decode_binary(body)
+            self.server.bodies.append({"points": points, "maxVectors": max_vectors})
+        else:
+            self.server.bodies.append(json.loads(body))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        response = json.dumps({"id": len(self.server.bodies)}).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+    server.bodies = []
+    server.statuses = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def build_points(count):
+    time = np.linspace(0, 1, count)
+
+    return from_columns(time, 100 * np.cos(2 * np.pi * time), 100 * np.sin(2 * np.pi * time))
+
+
+def test_submit_sends_gzipped_binary_payload(server):
+    points = build_points(500)
+
+    with DrawingClient(f"http://127.0.0.1:{server.server_port}") as client:
+        assert client.submit(points, max_vectors=1000) == {"id": 1}
+
+    payload = server.bodies[0]
+    assert payload["maxVectors"] == 500
+    np.testing.assert_array_equal(payload["points"], points)
+
+
+def test_submit_sends_gzipped_json_payload(server):
+    points = build_points(500)
+
+    with DrawingClient(f"http://127.0.0.1:{server.server_port}", wire_format="json") as client:
+        assert client.submit(points, max_vectors=1000) == {"id": 1}
+
+    payload = server.bodies[0]
+    assert payload["maxVectors"] == 500
+    assert len(payload["points"]) == 500
+    assert payload["points"][1] == {"time": points["time"][1], "x": 99, "y": 1}
+
+
+def test_submit_retries_server_errors(server):
+    server.statuses = [503, 502]
+
+    with DrawingClient(f"http://127.0.0.1:{server.server_port}", backoff=0.001) as client:
+        assert client.submit(build_points(10)) == {"id": 3}
+
+    assert len(server.bodies) == 3
+
+
+def test_invalid_drawing_is_not_sent(server):
+    points = build_points(10)
+    points["time"][3] = 0.1
+
+    with DrawingClient(f"http://127.0.0.1:{server.server_port}") as client:
+        with pytest.raises(InvalidSubmission, match="equal to or greater than the previous point"):
+            client.submit(points)
+
+    assert server.bodies == []
+
+
+def test_validation_matches_api_messages():
+    with pytest.raises(InvalidSubmission, match="at least 1 point"):
+        validate_points([])
+
+    with pytest.raises(InvalidSubmission, match="first point's time must be zero"):
+        validate_points([{"time": 0.5, "x": 4, "y": 5}])
+
+    assert clamp_max_vectors(0) == 100
+    assert clamp_max_vectors(-4) == 100
+    assert clamp_max_vectors(37) == 37
+    assert clamp_max_vectors(1000) == 500
+
+
+def test_submit_batch_validates_every_drawing(server):
+    drawings = [build_points(10), build_points(10)]
+    drawings[1]["time"][0] = 0.5
+
+    with DrawingClient(f"http://127.0.0.1:{server.server_port}") as client:
+        with pytest.raises(InvalidSubmission, match="first point's time must be zero"):
+            client.submit_batch(drawings)
+
+    assert server.bodies == []
+
+
+def test_large_drawings_and_generators_are_streamed(tmp_path):
+    from fourier_artist.standin import StandInServer
+
+    server = StandInServer(("127.0.0.1", 0), workers=1).start()
+    points = build_points(5000)
+
+    try:
+        with DrawingClient(server.url, stream_min_points=1000) as client:
+            # Different maxVectors, so the stand-in does not take them for duplicates
+            assert client.submit(points, 10) == {"id": 1}
+            assert client.submit_stream((p for p in to_api_points(points)), 11, chunk_points=700) == {"id": 2}
+            assert client.submit_stream(points, 12, chunk_points=700) == {"id": 3}
+    finally:
+        server.shutdown()
+
+    for drawing_id in (1, 2, 3):
+        np.testing.assert_array_equal(server.drawings[drawing_id]["originalPoints"], points)
+
+
+def test_status_reports_the_queue_position():
+    from fourier_artist.standin import StandInServer
+
+    # No workers, so nothing leaves the queue
+    server = StandInServer(("127.0.0.1", 0), workers=0).start()
+
+    try:
+        with DrawingClient(server.url) as client:
+            ids = [client.submit(build_points(50 + i), 5)["id"] for i in range(3)]
+            statuses = [client.status(drawing_id) for drawing_id in ids]
+            processed = client.processed(ids[0])
+            queue = client.request("GET", "/drawings/queue").json()
+    finally:
+        server.shutdown()
+
+    assert [(status["state"], status["position"]) for status in statuses] == [("pending", 0), ("pending", 1), ("pending", 2)]
+    assert processed is None
+    assert queue == {"pending": 3, "processing": 0, "failed": 0, "workers": 0}
+
+
+def test_processed_returns_the_drawing_once_done():
+    from fourier_artist.standin import StandInServer
+
+    server = StandInServer(("127.0.0.1", 0), workers=1).start()
+
+    try:
+        with DrawingClient(server.url) as client:
+            drawing_id = client.submit(build_points(50), 5)["id"]
+
+            drawing = client.processed(drawing_id)
+
+            while drawing is None:
+                time.sleep(0.01)
+                drawing = client.processed(drawing_id)
+
+            status = client.status(drawing_id)
+    finally:
+        server.shutdown()
+
+    assert drawing["drawVectors"]
+    assert (status["state"], status["position"], status["attempts"]) == ("done", 0, 1)
+    assert status["lastDrawVectorCalculatedAt"] is not None
+
+
+def test_processing_failures_are_retried_then_reported(monkeypatch):
+    from fourier_artist.standin import MAX_ATTEMPTS, StandInServer, build_series
+
+    def fail(points, max_vectors):
+        raise ValueError
+
+    monkeypatch.setattr("fourier_artist.standin.build_series", fail)
+    server = StandInServer(("127.0.0.1", 0), workers=1).start()
+
+    try:
+        with DrawingClient(server.url) as client:
+            drawing_id = client.submit(build_points(50), 5)["id"]
+
+            while client.status(drawing_id)["state"] != "failed":
+                time.sleep(0.01)
+
+            with pytest.raises(ProcessingFailed):
+                client.processed(drawing_id)
+
+            assert client.status(drawing_id)["attempts"] == MAX_ATTEMPTS
+
+            # Submitting it again gives it another go under the same id
+            monkeypatch.setattr("fourier_artist.standin.build_series", build_series)
+            assert client.submit(build_points(50), 5)["id"] == drawing_id
+            assert client.processed(drawing_id, wait=5) is not None
+    finally:
+        server.shutdown()
+
+
+def test_get_selects_fields_and_reuses_unchanged_drawings():
+    from fourier_artist.standin import StandInServer
+
+    server = StandInServer(("127.0.0.1", 0), workers=0).start()
+
+    try:
+        with DrawingClient(server.url) as client:
+            drawing_id = client.submit(build_points(50), 5)["id"]
+            statuses = []
+            send = client.session.request
+
+            def request(*args, **kwargs):
+                response = send(*args, **kwargs)
+                statuses.append(response.status_code)
+
+                return response
+
+            client.session.request = request
+            first = client.get(drawing_id, fields=("id", "state"))
+            second = client.get(drawing_id, fields=("id", "state"))
+            full = client.get(drawing_id)
+    finally:
+        server.shutdown()
+
+    assert first == second == {"id": drawing_id, "state": "pending"}
+    assert statuses == [200, 304, 200]
+    assert set(full) == {"id", "featured", "originalPoints", "drawVectors", "createdAt", "lastDrawVectorCalculatedAt"}
+
+
+def test_processed_can_wait_for_the_vectors():
+    from fourier_artist.standin import StandInServer
+
+    server = StandInServer(("127.0.0.1", 0), workers=1, delay=0.2).start()
+
+    try:
+        with DrawingClient(server.url) as client:
+            drawing_id = client.submit(build_points(50), 5)["id"]
+            drawing = client.processed(drawing_id, wait=10)
+    finally:
+        server.shutdown()
+
+    assert drawing["state"] == "done"
+    assert drawing["drawVectors"]
+    assert "originalPoints" not in drawing
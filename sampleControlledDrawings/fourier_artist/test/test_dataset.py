@@ -0,0 +1,104 @@
+import time
+
+import numpy as np
+import pytest
+
+from fourier_artist.cache import cache_key
+from fourier_artist.client import DrawingClient
+from fourier_artist.dataset import POINTS_FILE, DrawingDataset
+from fourier_artist.validation import InvalidSubmission
+
+from fourier_artist.test.conftest import build_points
+
+
+def test_drawings_are_read_back_from_the_memory_map(tmp_path):
+    dataset = DrawingDataset(str(tmp_path))
+    first = dataset.append(build_points(), name="circle", max_vectors=20)
+    dataset.append(build_points(500, turns=2))
+
+    reopened = DrawingDataset(str(tmp_path))
+    points = reopened.points(0)
+
+    assert len(reopened) == 2
+    assert reopened[0].name == "circle" and reopened[1].name == "drawing-1"
+    assert reopened[0].hash == first.hash == cache_key(build_points(), 20)
+    assert np.array_equal(points, build_points())
+    assert np.array_equal(reopened.points(1), build_points(500, turns=2))
+    # A view into the map, not a copy
+    assert isinstance(points.base, np.memmap) or isinstance(points, np.memmap)
+    assert not points.flags.writeable
+
+
+def test_invalid_drawings_are_not_stored(tmp_path):
+    dataset = DrawingDataset(str(tmp_path))
+
+    with pytest.raises(InvalidSubmission):
+        dataset.append(build_points()[::-1])
+
+    assert len(DrawingDataset(str(tmp_path))) == 0
+
+
+def test_a_partial_record_is_overwritten(tmp_path):
+    dataset = DrawingDataset(str(tmp_path))
+    dataset.append(build_points())
+
+    # An append interrupted after writing part of a record, before its index line
+    with open(tmp_path / POINTS_FILE, "ab") as f:
+        f.write(b"\x01" * 5)
+
+    dataset = DrawingDataset(str(tmp_path))
+    dataset.append(build_points(turns=3))
+
+    assert np.array_equal(DrawingDataset(str(tmp_path)).points(1), build_points(turns=3))
+
+
+def test_generate_runs_a_generator_once_per_parameter_set(tmp_path):
+    dataset = DrawingDataset(str(tmp_path))
+
+    spiral = dataset.generate("spiral.generate_spiral", 1000, {"num_turns": 4})
+    assert dataset.generate("spiral.generate_spiral", 1000, {"num_turns": 4}) is spiral
+    dataset.generate("spiral.generate_spiral", 1000, {"num_turns": 5})
+    dataset.generate("spiral.generate_spiral", 2000, {"num_turns": 4})
+
+    reopened = DrawingDataset(str(tmp_path))
+
+    assert len(reopened) == 3
+    assert reopened.lookup("spiral.generate_spiral", {"num_points": 1000, "num_turns": 4}).index == 0
+    assert [entry.index for entry in reopened.find(params={"num_turns": 4})] == [0, 2]
+    assert reopened[2].count == 2000
+
+
+def test_submitted_drawings_keep_their_ids_and_vectors(server, tmp_path):
+    dataset = DrawingDataset(str(tmp_path))
+
+    for turns in (1, 2, 3):
+        dataset.append(build_points(turns=turns), max_vectors=10)
+
+    with DrawingClient(server.url) as client:
+        dataset.submit(client, batch=2)
+        waiting = dataset.fetch(client)
+        deadline = time.monotonic() + 10
+
+        while waiting and time.monotonic() < deadline:
+            time.sleep(0.01)
+            waiting = dataset.fetch(client, waiting)
+
+        expected = client.get(2)["drawVectors"]
+
+    assert waiting == []
+    assert len(server.drawings) == 3
+
+    reopened = DrawingDataset(str(tmp_path))
+    vectors = reopened.vectors(1)
+
+    assert [entry.drawing_id for entry in reopened] == [1, 2, 3]
+    assert {entry.api_url for entry in reopened} == {server.url}
+    assert 0 < vectors.shape[0] == len(expected) <= 10
+    assert vectors["n"].tolist() == [vector["n"] for vector in expected]
+    assert vectors["real"].tolist() == [vector["real"] for vector in expected]
+
+    reopened.compact()
+    compacted = DrawingDataset(str(tmp_path))
+
+    assert (tmp_path / "index.jsonl").read_text().count("\n") == 3
+    assert [entry.vectors for entry in compacted] == [entry.vectors for entry in reopened]
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from fourier_artist.epicycles import (
+    GifWriter, epicycle_centers, export_animation, iter_epicycles, render_frames, trajectory, uniform_trajectory,
+)
+from fourier_artist.points import from_columns, uniform_time
+from fourier_artist.series import VECTOR_DTYPE, as_vector_array, build_series, normalize_time, to_api_vectors
+
+
+def build_vectors(count=40):
+    rng = np.random.default_rng(3)
+    vectors = np.empty(count, dtype=VECTOR_DTYPE)
+    vectors["n"] = [(k + 1) // 2 * (1 if k % 2 else -1) for k in range(count)]
+    vectors["real"] = rng.normal(0, 50, count) / (1 + np.arange(count))
+    vectors["imaginary"] = rng.normal(0, 50, count) / (1 + np.arange(count))
+
+    return vectors
+
+
+def calculate_output(time, vectors):
+    # One time at a time, as calculateOutput in series_builder.go does it
+    return sum(complex(real, imaginary) * np.exp(2j * np.pi * n * time) for n, real, imaginary in vectors.tolist())
+
+
+def test_matrix_product_and_ifft_match_calculate_output():
+    vectors = build_vectors()
+    times = np.arange(1000) / 1000
+
+    expected = np.array([calculate_output(time, vectors) for time in times[::37]])
+
+    np.testing.assert_allclose(trajectory(vectors, times)[::37], expected, atol=1e-9)
+    np.testing.assert_allclose(uniform_trajectory(vectors, 1000)[::37], expected, atol=1e-9)
+
+
+def test_ifft_handles_frequencies_beyond_the_grid():
+    vectors = build_vectors()
+    vectors["n"] *= 7
+
+    np.testing.assert_allclose(uniform_trajectory(vectors, 64), trajectory(vectors, np.arange(64) / 64), atol=1e-9)
+
+
+def test_reconstructs_a_built_series():
+    time = uniform_time(3000)
+    points = from_columns(time, 150 * np.cos(2 * np.pi * time), 80 * np.sin(4 * np.pi * time))
+    vectors = as_vector_array(to_api_vectors(build_series(points, 50)))
+
+    positions = trajectory(vectors, normalize_time(points["time"]))
+
+    assert np.abs(positions - (points["x"] + 1j * points["y"])).mean() < 1
+
+
+def test_epicycle_centers_end_at_the_trajectory():
+    vectors = build_vectors()
+    chunks = list(iter_epicycles(vectors, frames=10, chunk=4))
+    times = np.concatenate([times for times, _ in chunks])
+    centers = np.concatenate([centers for _, centers in chunks])
+
+    assert centers.shape == (10, len(vectors) + 1)
+    assert (centers[:, 0] == 0).all()
+    np.testing.assert_allclose(centers[:, -1], trajectory(vectors, times), atol=1e-9)
+    np.testing.assert_allclose(epicycle_centers(vectors, times[:1]), centers[:1])
+
+
+def test_pool_renders_the_same_frames_in_order():
+    vectors = build_vectors()
+
+    in_process = np.stack(list(render_frames(vectors, frames=12, size=64, workers=1, chunk=5)))
+    pooled = np.stack(list(render_frames(vectors, frames=12, size=64, workers=2, chunk=5)))
+
+    assert in_process.shape == (12, 64, 64, 3)
+    np.testing.assert_array_equal(in_process, pooled)
+    assert (in_process[0] != in_process[6]).any()
+
+
+def test_export_gif(tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    monkeypatch.setattr("fourier_artist.epicycles.open_writer", lambda filename, size, fps: GifWriter(filename, size, fps))
+    filename = str(tmp_path / "animation.gif")
+
+    frames = export_animation(build_vectors(), filename, fps=10, seconds=1, size=48, workers=1)
+
+    with Image.open(filename) as image:
+        assert frames == 10
+        assert image.n_frames == 10
+        assert image.size == (48, 48)
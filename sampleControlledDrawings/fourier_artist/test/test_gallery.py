@@ -0,0 +1,47 @@
+import numpy as np
+
+from fourier_artist.client import DrawingClient
+from fourier_artist.gallery import main, path_bounds, to_svg
+from fourier_artist.points import from_columns, uniform_time
+from fourier_artist.standin import PREVIEW_POINTS
+
+
+def spiral(count):
+    time = uniform_time(count)
+    angle = 40 * np.pi * time
+
+    return from_columns(time, 10 * angle * np.cos(angle), 10 * angle * np.sin(angle))
+
+
+def test_recent_returns_bounded_previews_newest_first(server):
+    with DrawingClient(server.url, cache=None) as client:
+        small = client.submit(spiral(50))["id"]
+        large = client.submit(spiral(50_000))["id"]
+
+        previews = client.recent()
+
+    assert [preview["id"] for preview in previews] == [large, small]
+    assert previews[1]["svgPath"].count("L ") == 49
+    assert previews[0]["svgPath"].count("L ") < PREVIEW_POINTS
+    assert previews[0]["svgPath"].startswith("M 0 0 L ")
+    assert previews[0]["svgPath"].endswith(" 1256 0 ")
+
+
+def test_svg_view_box_fits_the_path():
+    svg = to_svg("M -10 5 L 30 5 L 30 25 ")
+
+    assert path_bounds("M -10 5 L 30 5 L 30 25 ") == (-10, 5, 30, 25)
+    assert 'viewBox="-12 3 44 24"' in svg
+    assert 'd="M -10 5 L 30 5 L 30 25"' in svg
+
+
+def test_gallery_saves_one_svg_per_drawing(server, tmp_path, monkeypatch):
+    monkeypatch.setenv("FOURIER_ARTIST_CACHE", "off")
+
+    with DrawingClient(server.url, cache=None) as client:
+        ids = [client.submit(spiral(200 + i))["id"] for i in range(3)]
+
+    main(["--api-url", server.url, "--out", str(tmp_path)])
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"drawing-{i}.svg" for i in ids]
+    assert (tmp_path / f"drawing-{ids[0]}.svg").read_text().startswith("<svg ")
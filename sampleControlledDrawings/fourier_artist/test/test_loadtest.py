@@ -0,0 +1,99 @@
+import json
+
+import numpy as np
+import pytest
+
+from fourier_artist.client import DrawingClient
+from fourier_artist.loadtest import backlog_growth, read_corpus, run, workload
+from fourier_artist.points import from_columns, to_api_points, uniform_time
+from fourier_artist.standin import points_hash
+
+
+def build_points(count=500):
+    time = uniform_time(count)
+    angle = 2 * np.pi * time
+
+    return from_columns(time, 100 * np.cos(angle), 60 * np.sin(angle))
+
+
+def test_read_corpus_skips_lines_without_drawings(tmp_path):
+    payload = {"points": to_api_points(build_points(5)), "maxVectors": 20}
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text("\n".join([
+        json.dumps(payload),
+        json.dumps({"request_id": "r1", "body": json.dumps(payload)}),
+        json.dumps({"request_id": "r2", "title": "Not a drawing", "body": "Some text"}),
+        "not json",
+    ]))
+
+    drawings, skipped = read_corpus(str(corpus))
+
+    assert skipped == 2
+    assert len(drawings) == 2
+    assert drawings[0][1] == 20
+    assert drawings[1][0] == payload["points"]
+
+
+def test_workload_cycles_the_corpus():
+    assert list(workload(["a", "b"], count=5)) == ["a", "b", "a", "b", "a"]
+
+
+def test_unique_workload_nudges_later_passes():
+    points = build_points(50)
+    drawings = list(workload([(points, 20)], count=3, unique=True))
+
+    assert drawings[0] == (points, 20)
+    assert len({points_hash(replayed, 20) for replayed, _ in drawings}) == 3
+    np.testing.assert_array_equal(drawings[2][0][:-1], points[:-1])
+    assert 0 < drawings[2][0]["time"][-1] - points["time"][-1] < 1e-5
+
+
+def test_standin_deduplicates_like_the_api(server):
+    corpus = [(build_points(), 20), (build_points(300), None)]
+
+    run(workload(corpus, count=6), api_url=server.url, concurrency=3, poll_interval=0.02)
+    assert len(server.drawings) == 2
+
+    run(workload(corpus, count=6, unique=True), api_url=server.url, concurrency=3, poll_interval=0.02)
+    assert len(server.drawings) == 6
+
+
+def test_closed_loop_against_standin(server):
+    corpus = [(build_points(), 20), (build_points(300), None)]
+
+    summary = run(workload(corpus, count=6), api_url=server.url, concurrency=3, poll_interval=0.02)
+
+    assert summary["succeeded"] == 6
+    assert summary["error_rate"] == 0
+    assert set(summary["processing_latency"]) == {"p50", "p90", "p95", "p99"}
+    assert summary["backlog"]["max"] <= 3
+    assert summary["backlog"]["samples"][-1][1] == 0
+
+
+def test_open_loop_counts_errors(server):
+    # The second drawing does not start at time zero, so the client refuses to send it
+    invalid = [{"time": 0.5, "x": 0, "y": 0}]
+    corpus = [(build_points(), 20), (invalid, 20)]
+
+    summary = run(workload(corpus, count=4), api_url=server.url, rate=50, poll_interval=0.02)
+
+    assert summary["succeeded"] == 2
+    assert summary["error_rate"] == 0.5
+    assert summary["errors"] == {"InvalidSubmission": 2}
+    assert summary["offered_per_minute"] == 3000
+
+
+def test_standin_validates_like_the_api(server):
+    with DrawingClient(server.url) as client:
+        response = client.session.post(f"{server.url}/drawing", json={"points": [{"time": 0.5, "x": 0, "y": 0}]})
+        drawing_id = client.submit(build_points(), 20)["id"]
+
+    assert response.status_code == 400
+    assert response.json() == {"message": "The first point's time must be zero."}
+    assert server.get(drawing_id)["originalPoints"].shape == (500,)
+
+
+def test_backlog_growth_only_counts_the_submission_phase():
+    backlog = [(0, 0), (1, 2), (2, 4), (3, 6), (4, 0)]
+
+    assert backlog_growth(backlog, until=3) == pytest.approx(120)
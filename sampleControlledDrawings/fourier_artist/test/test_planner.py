@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from fourier_artist.planner import error_curve, plan
+from fourier_artist.points import from_columns, uniform_time
+from fourier_artist.series import coefficients, resample, vector_order
+
+
+def build_points(count=5000):
+    time = uniform_time(count)
+    angle = 2 * np.pi * time
+
+    return from_columns(time, 300 + 150 * np.cos(angle) + 30 * np.cos(9 * angle), 90 * np.sin(angle))
+
+
+def test_error_curve_matches_direct_reconstruction():
+    points = build_points()
+    samples = resample(points)
+    all_coefficients = coefficients(samples)
+    grid = np.arange(samples.shape[0]) / samples.shape[0]
+
+    rms_distance, _ = error_curve(points, 40)
+
+    for count in (1, 5, 19, 40):
+        order = vector_order(count)
+        series = np.exp(2j * np.pi * np.outer(grid, order)) @ all_coefficients[order % samples.shape[0]]
+
+        assert rms_distance[count - 1] == pytest.approx(np.sqrt(np.mean(np.abs(series - samples) ** 2)))
+
+
+def test_energy_fraction_ignores_the_offset():
+    _, fraction = error_curve(build_points(), 40)
+
+    # Vector 0 alone only places the drawing, n = 1 and n = -1 carry the ellipse
+    assert fraction[0] == 0
+    assert fraction[2] > 0.9
+    assert np.all(np.diff(fraction) >= 0)
+
+
+def test_plan_picks_the_smallest_count():
+    points = build_points()
+    rms_distance, fraction = error_curve(points)
+
+    result = plan(points, target_distance=1.0)
+
+    assert result.reached
+    assert rms_distance[result.max_vectors - 1] <= 1.0 < rms_distance[result.max_vectors - 2]
+    # n = 9 and n = -9 are needed for the ripple, the 18th and 19th vectors
+    assert result.max_vectors >= 19
+
+    assert plan(points, energy_fraction=0.5).max_vectors == 2
+    assert plan(points, target_distance=1.0, energy_fraction=0.5).max_vectors == result.max_vectors
+
+
+def test_unreachable_plan_uses_every_vector():
+    result = plan(build_points(), target_distance=0, max_vectors=10)
+
+    assert result.max_vectors == 10
+    assert not result.reached
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from fourier_artist.points import POINT_DTYPE, as_point_array, from_columns, to_api_points, uniform_time
+from fourier_artist.validation import InvalidSubmission
+
+
+def test_from_columns_truncates_towards_zero():
+    points = from_columns([0, 0.5, 1], [1.9, -1.9, 0.2], [-0.5, 2.5, 7])
+
+    assert points.dtype == POINT_DTYPE
+    assert points["x"].tolist() == [1, -1, 0]
+    assert points["y"].tolist() == [0, 2, 7]
+
+
+def test_from_columns_rejects_coordinates_int32_cannot_hold():
+    with pytest.raises(InvalidSubmission, match="between -2147483648 and 2147483647"):
+        from_columns([0, 0.5, 1], [0, 3e9, 1], [0, 0, 0])
+
+    with pytest.raises(InvalidSubmission, match="between"):
+        as_point_array([{"time": 0, "x": 0, "y": -2 ** 31 - 1}])
+
+    for bad in (np.nan, np.inf):
+        with pytest.raises(InvalidSubmission, match="not properly formatted"):
+            from_columns([0, 1], [0, bad], [0, 0])
+
+    # Truncated first, so the extremes and anything rounding into them fit
+    points = from_columns([0, 1], [-2 ** 31, 2 ** 31 - 0.5], [0, 0])
+    assert points["x"].tolist() == [-2 ** 31, 2 ** 31 - 1]
+
+
+def test_uniform_time():
+    assert uniform_time(5).tolist() == [0, 0.25, 0.5, 0.75, 1]
+    assert uniform_time(1).tolist() == [0]
+
+
+def test_api_points_round_trip():
+    api_points = [{"time": 0, "x": 4, "y": 5}, {"time": 0.5, "x": -5, "y": 1}]
+    points = as_point_array(api_points)
+
+    assert to_api_points(points) == api_points
+    assert as_point_array(points) is points
+    np.testing.assert_array_equal(as_point_array(np.array([[0, 4, 5], [0.5, -5, 1]])), points)
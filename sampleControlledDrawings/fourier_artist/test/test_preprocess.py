@@ -0,0 +1,45 @@
+import numpy as np
+
+from fourier_artist.points import from_columns, uniform_time
+from fourier_artist.preprocess import max_deviation, preprocess, resample_to_grid, simplify
+from fourier_artist.series import coefficients, resample
+
+
+def build_points(count=20000):
+    time = uniform_time(count)
+    angle = 2 * np.pi * time
+
+    return from_columns(time, 150 * np.cos(angle) + 20 * np.sin(7 * angle), 90 * np.sin(angle))
+
+
+def test_grid_keeps_coefficients_bit_identical():
+    points = build_points()
+    reduced = resample_to_grid(points)
+
+    assert reduced.shape == (1001,)
+    assert reduced["time"][-1] == 1
+    np.testing.assert_array_equal(coefficients(resample(reduced)), coefficients(resample(points)))
+
+
+def test_grid_leaves_small_drawings_alone():
+    points = build_points(800)
+
+    assert resample_to_grid(points) is points
+
+
+def test_simplify_stays_within_tolerance():
+    points = build_points()
+    reduced = simplify(points, tolerance=2.0)
+
+    assert reduced.shape[0] < points.shape[0] // 10
+    assert reduced["time"][0] == 0 and reduced["time"][-1] == points["time"][-1]
+    # The API truncates interpolated positions, which can add up to one unit on each axis
+    assert max_deviation(points, reduced) <= 2.0 + np.sqrt(2)
+
+
+def test_straight_line_simplifies_to_endpoints():
+    points = from_columns(uniform_time(1000), np.arange(1000), np.arange(1000) * 2)
+    reduced, deviation = preprocess(points, "simplify", tolerance=0.5)
+
+    assert reduced.shape == (2,)
+    assert deviation <= np.sqrt(2)
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from fourier_artist import profiling
+from fourier_artist.bulk import run
+from fourier_artist.cli import main
+from fourier_artist.points import from_columns, uniform_time
+
+
+@pytest.fixture
+def profiler():
+    yield profiling.enable()
+
+    profiling.disable()
+
+
+def test_phases_are_free_while_profiling_is_off():
+    assert profiling.active() is None
+
+    with profiling.phase("generate") as phase:
+        phase.set(points=10)
+
+    assert profiling.phase("encode") is profiling.phase("request")
+
+
+def test_phases_record_their_arguments_and_errors(profiler):
+    with profiling.phase("submit", points=3):
+        with profiling.phase("request", method="POST") as request:
+            request.set(status=201)
+
+    with pytest.raises(ValueError):
+        with profiling.phase("encode"):
+            raise ValueError
+
+    events = {event["name"]: event for event in profiler.profile()["events"]}
+
+    assert events["request"]["args"] == {"method": "POST", "status": 201}
+    assert events["encode"]["args"] == {"error": "ValueError"}
+    assert events["submit"]["start"] <= events["request"]["start"]
+    assert events["submit"]["duration"] >= events["request"]["duration"]
+    assert profiler.profile()["summary"]["submit"]["count"] == 1
+
+
+def test_nested_phases_see_the_peak_of_their_children():
+    profiler = profiling.enable(trace_memory=True)
+
+    try:
+        with profiling.phase("outer"):
+            with profiling.phase("inner"):
+                block = bytearray(8 * 1024 * 1024)
+                del block
+
+            with profiling.phase("small"):
+                pass
+    finally:
+        profiling.disable()
+
+    peaks = {event["name"]: event["peakTraced"] for event in profiler.events}
+
+    assert peaks["inner"] >= 8 * 1024 * 1024
+    assert peaks["small"] < 1024 * 1024
+    assert peaks["outer"] >= peaks["inner"]
+
+
+def test_profiles_add_up_across_runs(tmp_path):
+    path = str(tmp_path / "profile.json")
+
+    for _ in range(2):
+        profiling.enable()
+
+        with profiling.phase("generate"):
+            pass
+
+        profiling.finish(path, str(tmp_path / "trace.json"))
+
+    profile = profiling.read_profile(path)
+    trace = json.loads((tmp_path / "trace.json").read_text())
+
+    assert profile["runs"] == 2
+    assert profile["summary"]["generate"]["count"] == 2
+    assert [event["ph"] for event in trace["traceEvents"]] == ["X", "X"]
+    assert {"name", "ts", "dur", "pid", "tid", "args"} <= set(trace["traceEvents"][0])
+
+
+def test_a_script_run_is_profiled_phase_by_phase(server, tmp_path, monkeypatch):
+    monkeypatch.setenv("FOURIER_ARTIST_CACHE", "off")
+    path = str(tmp_path / "profile.json")
+
+    main(["ellipse", "--points", "2000", "--api-url", server.url, "--profile", path,
+          "--trace", str(tmp_path / "trace.json")])
+
+    summary = profiling.read_profile(path)["summary"]
+
+    assert profiling.active() is None
+    assert {"generate", "validate", "encode", "request", "submit"} <= set(summary)
+    assert summary["submit"]["total_ms"] >= summary["request"]["total_ms"]
+
+
+def test_bulk_runs_record_polling(server, profiler):
+    time = uniform_time(300)
+    drawings = [from_columns(time, 100 * time, 50 * time ** 2)]
+
+    run(drawings, api_url=server.url, max_vectors=5, poll_interval=0.01)
+
+    polls = [event for event in profiler.events if event["name"] == "poll"]
+    requests = [event for event in profiler.events if event["name"] == "request"]
+
+    assert len(polls) == 1 and polls[0]["args"]["drawing"] == 1
+    # The submission and every poll, the last of which brings the vectors
+    assert len(requests) == 1 + polls[0]["args"]["polls"]
+    assert sum(event["args"]["path"] == "/drawing/1" for event in requests) == polls[0]["args"]["polls"]
@@ -0,0 +1,73 @@
+import struct
+import zlib
+
+import numpy as np
+
+from fourier_artist.render import Canvas, hsv_gradient, start_render, stroke_segments, write_png
+
+
+def read_png(path):
+    """Decode the 8-bit RGB, unfiltered PNGs write_png produces"""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+
+    chunks = {}
+    offset = 8
+
+    while offset < len(data):
+        length, tag = struct.unpack_from(">I4s", data, offset)
+        chunks[tag] = data[offset + 8:offset + 8 + length]
+        offset += length + 12
+
+    width, height = struct.unpack_from(">II", chunks[b"IHDR"])
+    scanlines = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, -1)
+
+    return scanlines[:, 1:].reshape(height, width, 3)
+
+
+def test_stroke_segments_pairs_consecutive_points():
+    x = np.array([0, 1, 5, 2])
+    y = np.array([3, 4, 0, 9])
+
+    segments = stroke_segments(x, y)
+
+    assert segments.shape == (3, 2, 2)
+    assert np.shares_memory(segments, segments.base)
+    np.testing.assert_array_equal(segments[1], [[1, 4], [5, 0]])
+
+
+def test_hsv_gradient_starts_red():
+    colors = hsv_gradient(6)
+
+    np.testing.assert_array_equal(colors[0], [255, 0, 0])
+    np.testing.assert_array_equal(colors[2], [0, 255, 0])
+    np.testing.assert_array_equal(colors[4], [0, 0, 255])
+
+
+def test_png_round_trip(tmp_path):
+    pixels = np.random.default_rng(1).integers(0, 256, (7, 5, 3), dtype=np.uint8)
+
+    write_png(tmp_path / "image.png", pixels)
+
+    np.testing.assert_array_equal(read_png(tmp_path / "image.png"), pixels)
+
+
+def test_canvas_draws_a_connected_line(tmp_path):
+    canvas = Canvas((0, 10, 0, 10), size=11, margin=0)
+    canvas.polyline([0, 10], [0, 10], "white")
+    filename = canvas.save(tmp_path / "line.png")
+
+    lit = read_png(filename).any(axis=2)
+
+    # The diagonal from the bottom left to the top right corner, y pointing up
+    np.testing.assert_array_equal(lit, np.eye(11, dtype=bool)[::-1])
+
+
+def test_background_render_writes_the_file(tmp_path):
+    canvas = Canvas((0, 1, 0, 1), size=4)
+    rendering = start_render(write_png, str(tmp_path / "image.png"), canvas.pixels, background=True)
+
+    assert rendering.result(timeout=30) is None
+    assert read_png(tmp_path / "image.png").shape == (4, 4, 3)
@@ -0,0 +1,41 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from fourier_artist.points import from_columns
+from fourier_artist.series import SAMPLE_TIMES, build_series, resample, vector_order
+
+# Drawings with the vectors the Go draw_vector.BuildSeries produced for them
+with open(os.path.join(os.path.dirname(__file__), "fixtures", "build_series.json")) as f:
+    GO_SERIES = json.load(f)
+
+
+@pytest.mark.parametrize("name", sorted(GO_SERIES))
+def test_build_series_matches_go(name):
+    shape = GO_SERIES[name]
+    vectors = build_series(shape["points"], shape["maxVectors"])
+    expected = shape["vectors"]
+
+    assert vectors["n"].tolist() == [vector["n"] for vector in expected]
+    np.testing.assert_allclose(vectors["real"], [vector["real"] for vector in expected], rtol=0, atol=1e-9)
+    np.testing.assert_allclose(vectors["imaginary"], [vector["imaginary"] for vector in expected], rtol=0, atol=1e-9)
+
+
+def test_sample_grid():
+    assert SAMPLE_TIMES.shape == (1000,)
+    assert SAMPLE_TIMES[0] == 0
+
+
+def test_vector_order():
+    assert vector_order(7).tolist() == [0, 1, -1, 2, -2, 3, -3]
+
+
+def test_resample_interpolates_between_points():
+    points = from_columns([0, 0.5, 1], [0, 100, 0], [0, -100, 0])
+    samples = resample(points)
+
+    assert samples[0] == 0
+    assert samples[250] == 50 - 50j
+    assert samples[500] == 100 - 100j
@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+import pytest
+
+from fourier_artist.shapes import load_script
+from fourier_artist.standin import StandInServer
+from fourier_artist.sweep import (concentration, grid, parse_param, random_variants, submit_variants, superformula,
+                                  sweep, write_results, write_thumbnails)
+
+SPACE = {"0.m": [2, 3, 5, 6], "0.n1": (0.5, 2.0), "1.a": (0.2, 1.0)}
+
+
+def test_parse_param():
+    assert parse_param("0.m=2,3,5") == ("0.m", [2, 3, 5])
+    assert parse_param("n1=0.5:2") == ("n1", (0.5, 2))
+
+    with pytest.raises(ValueError):
+        parse_param("n1")
+
+
+def test_grid_expands_ranges():
+    variants = list(grid({"n_lobes": (3, 5), "b": [60, 120]}, steps=5))
+
+    assert len(variants) == 6
+    assert variants[0] == {"n_lobes": 3, "b": 60}
+    assert variants[-1] == {"n_lobes": 5, "b": 120}
+
+
+def test_random_variants_stay_in_the_space_and_repeat_with_a_seed():
+    variants = list(random_variants({"n_lobes": (3, 5), "b": (60.0, 120.0), "m": [2, 6]}, 50, seed=3))
+
+    assert variants == list(random_variants({"n_lobes": (3, 5), "b": (60.0, 120.0), "m": [2, 6]}, 50, seed=3))
+    assert {variant["n_lobes"] for variant in variants} == {3, 4, 5}
+    assert all(60 <= variant["b"] <= 120 and variant["m"] in (2, 6) for variant in variants)
+
+
+def test_superformula_defaults_match_the_script():
+    module = load_script("superformula_art")
+
+    np.testing.assert_array_equal(superformula(2000, {}), module.generate_layers(2000)[1])
+
+
+def test_pool_and_serial_sweeps_agree():
+    pooled = sweep("superformula", random_variants(SPACE, 40, seed=1), num_points=1000, top=5, workers=2, batch=16)
+    serial = sweep("superformula", random_variants(SPACE, 40, seed=1), num_points=1000, top=5, workers=1, batch=7)
+
+    assert [variant.index for variant in pooled] == [variant.index for variant in serial]
+    assert [variant.score for variant in pooled] == sorted((variant.score for variant in pooled), reverse=True)
+
+    for variant in pooled:
+        np.testing.assert_array_equal(variant.points, superformula(1000, variant.params))
+        assert variant.score == concentration(variant.points, 100)
+
+
+def test_undrawable_variants_are_left_out():
+    best = sweep("superformula", [{"scale": 1e300}, {}], num_points=500, top=2, workers=1)
+
+    assert [variant.params for variant in best] == [{}]
+
+
+def test_bad_parameter_names_fail_early():
+    with pytest.raises(ValueError, match="lobes"):
+        sweep("single_stroke", [{"lobes": 3}], num_points=500, workers=1)
+
+
+def test_thumbnails_results_and_submission(tmp_path):
+    best = sweep("single_stroke", grid({"n_lobes": [3, 4, 5]}), num_points=1000, top=2, workers=1)
+    server = StandInServer(("127.0.0.1", 0), workers=1).start()
+
+    try:
+        thumbnails = write_thumbnails(best, str(tmp_path), "single_stroke", size=64)
+        assert submit_variants(best, 20, server.url) == [1, 2]
+    finally:
+        server.shutdown()
+
+    assert all(open(thumbnail, "rb").read(8) == b"\x89PNG\r\n\x1a\n" for thumbnail in thumbnails)
+
+    results = json.load(open(write_results(best, str(tmp_path / "results.json"), "single_stroke", "concentration")))
+    assert [result["id"] for result in results["results"]] == [1, 2]
+    assert results["results"][0]["thumbnail"] == thumbnails[0]
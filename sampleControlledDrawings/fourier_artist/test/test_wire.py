@@ -0,0 +1,117 @@
+import gzip
+import json
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from fourier_artist.points import from_columns, to_api_points, uniform_time
+from fourier_artist.validation import InvalidSubmission
+from fourier_artist.wire import (BINARY_HEADER, FORMATS, decode_binary, decode_binary_batch, encode, encode_batch,
+                                 gzip_chunks, stream)
+
+
+def build_points():
+    return from_columns([0, 0, 0.5, 1], [4, -5, 2, 6], [5, 1, -3, 3])
+
+
+def test_binary_layout():
+    content_type, body = encode(build_points(), 20, "binary")
+
+    assert content_type == "application/vnd.drawing.points"
+    assert BINARY_HEADER.unpack_from(body) == (b"FPTS", 1, 0, 4, 20)
+    assert len(body) == 16 + 4 * 16
+    assert body[16 + 32:16 + 36] == (4).to_bytes(4, "little")
+
+
+def test_binary_round_trip():
+    points = build_points()
+    decoded, max_vectors = decode_binary(encode(points, 7, "binary")[1])
+
+    np.testing.assert_array_equal(decoded, points)
+    assert max_vectors == 7
+
+
+def test_columns_payload():
+    content_type, body = encode(build_points(), 20, "columns")
+
+    assert content_type == "application/vnd.drawing.columns+json"
+    assert json.loads(body) == {"time": [0, 0, 0.5, 1], "x": [4, -5, 2, 6], "y": [5, 1, -3, 3], "maxVectors": 20}
+
+
+def test_binary_batch_round_trip():
+    first = build_points()
+    second = from_columns([0, 1], [7, 8], [9, 10])
+    content_type, body = encode_batch([(first, 20), (second, 0)], "binary")
+    drawings = decode_binary_batch(body)
+
+    assert content_type == "application/vnd.drawing.points"
+    assert [max_vectors for _, max_vectors in drawings] == [20, 0]
+    np.testing.assert_array_equal(drawings[0][0], first)
+    np.testing.assert_array_equal(drawings[1][0], second)
+
+
+def test_json_batch_payload():
+    content_type, body = encode_batch([(from_columns([0], [1], [2]), 5)], "json")
+
+    assert content_type == "application/json"
+    assert json.loads(body) == {"drawings": [{"points": [{"time": 0, "x": 1, "y": 2}], "maxVectors": 5}]}
+
+
+def build_large_points(count):
+    time = uniform_time(count)
+
+    return from_columns(time, 300 * np.cos(40 * time), 200 * np.sin(7 * time))
+
+
+@pytest.mark.parametrize("wire_format", sorted(FORMATS))
+def test_streamed_bodies_match_the_encoders(wire_format):
+    points = build_large_points(1001)
+    content_type, chunks = stream(points, 33, wire_format, chunk_points=64)
+
+    assert (content_type, b"".join(chunks)) == encode(points, 33, wire_format)
+
+
+def test_point_iterables_stream():
+    points = build_large_points(1001)
+    rows = zip(points["time"].tolist(), points["x"].tolist(), points["y"].tolist())
+
+    assert b"".join(stream(iter(to_api_points(points)), 9, "json", chunk_points=97)[1]) == encode(points, 9, "json")[1]
+    assert b"".join(stream(rows, 9, "binary", chunk_points=97)[1]) == encode(points, 9, "binary")[1]
+
+
+def test_gzip_chunks():
+    points = build_large_points(1001)
+    body = b"".join(gzip_chunks(stream(points, 9, "json", chunk_points=100)[1]))
+
+    assert gzip.decompress(body) == encode(points, 9, "json")[1]
+
+
+def test_streamed_iterables_are_validated_across_chunks():
+    points = to_api_points(build_large_points(300))
+    points[200]["time"] = 0.1
+
+    with pytest.raises(InvalidSubmission, match="equal to or greater than the previous point"):
+        b"".join(stream(iter(points), 9, "json", chunk_points=100)[1])
+
+    with pytest.raises(InvalidSubmission, match="at least 1 point"):
+        b"".join(stream(iter([]), 9, "json")[1])
+
+
+def streaming_peak(points, wire_format):
+    tracemalloc.start()
+
+    for _ in gzip_chunks(stream(points, 9, wire_format, chunk_points=1024)[1]):
+        pass
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak
+
+
+@pytest.mark.parametrize("wire_format", sorted(FORMATS))
+def test_streaming_memory_does_not_grow_with_the_drawing(wire_format):
+    small, large = build_large_points(4_000), build_large_points(40_000)
+
+    assert streaming_peak(large, wire_format) < 1.5 * streaming_peak(small, wire_format)
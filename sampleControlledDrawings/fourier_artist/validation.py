@@ -0,0 +1,80 @@
+"""
+Client-side copy of the checks done by the SubmissionIsValid middleware, so an
+invalid drawing is rejected before it costs a round-trip.
+"""
+import numpy as np
+
+from .points import as_point_array
+
+DEFAULT_MAX_VECTORS = 100
+MAX_VECTORS = 500
+
+
+class InvalidSubmission(ValueError):
+    """Raised for a drawing the API would answer with 400 Bad Request"""
+
+
+def validate_points(points):
+    """
+    Check a drawing the same way the API does and return it as a point array.
+    The error messages are the ones the API responds with.
+    """
+    points = as_point_array(points)
+    time = points["time"]
+
+    if time.shape[0] == 0:
+        raise InvalidSubmission("There needs to be at least 1 point.")
+
+    # NaN and infinity cannot be encoded as JSON numbers
+    if not np.isfinite(time).all():
+        raise InvalidSubmission("The request is not properly formatted.")
+
+    if time[0] != 0:
+        raise InvalidSubmission("The first point's time must be zero.")
+
+    if (np.diff(time) < 0).any():
+        raise InvalidSubmission("Each point's time should be equal to or greater than the previous point.")
+
+    return points
+
+
+def validate_chunks(chunks):
+    """
+    validate_points for a drawing arriving as consecutive point array chunks,
+    yielding each chunk once it passed. The first problem raises
+    InvalidSubmission, possibly after earlier chunks were used.
+    """
+    last_time = None
+
+    for chunk in chunks:
+        time = chunk["time"]
+
+        if time.shape[0] == 0:
+            continue
+
+        if not np.isfinite(time).all():
+            raise InvalidSubmission("The request is not properly formatted.")
+
+        if last_time is None and time[0] != 0:
+            raise InvalidSubmission("The first point's time must be zero.")
+
+        if (last_time is not None and time[0] < last_time) or (np.diff(time) < 0).any():
+            raise InvalidSubmission("Each point's time should be equal to or greater than the previous point.")
+
+        last_time = time[-1]
+
+        yield chunk
+
+    if last_time is None:
+        raise InvalidSubmission("There needs to be at least 1 point.")
+
+
+def clamp_max_vectors(max_vectors):
+    """
+    Apply the API's maxVectors rules: missing or non-positive values fall back
+    to the default of 100 and anything above 500 is capped at 500.
+    """
+    if max_vectors is None or max_vectors <= 0:
+        return DEFAULT_MAX_VECTORS
+
+    return min(int(max_vectors), MAX_VECTORS)
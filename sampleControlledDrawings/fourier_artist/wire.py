@@ -0,0 +1,252 @@
+"""
+Encoders for the request bodies POST /drawing accepts.
+
+Besides the original list of point objects the API takes two compact
+formats (see app/drawing/wire): columnar JSON, and a binary layout that is
+written straight from the NumPy column buffers without creating a Python
+object per point. POST /drawings/batch takes the same formats for many
+drawings at once.
+
+Every format can also be streamed (`stream`): the body comes out as an
+iterator of chunks encoded from a slice of the drawing at a time, optionally
+gzipped on the fly, so a chunked HTTP request can send a drawing of any size
+without its whole body ever being in memory. The streamed bytes are the same
+as the ones the encode_* functions return.
+"""
+import itertools
+import json
+import struct
+import zlib
+from collections import deque
+
+import numpy as np
+
+from .points import POINT_DTYPE, as_point_array, from_columns, to_api_points
+from .validation import validate_chunks
+
+JSON_CONTENT_TYPE = "application/json"
+COLUMNS_CONTENT_TYPE = "application/vnd.drawing.columns+json"
+BINARY_CONTENT_TYPE = "application/vnd.drawing.points"
+
+# magic, version, reserved, point count, maxVectors
+BINARY_HEADER = struct.Struct("<4sHHIi")
+BINARY_MAGIC = b"FPTS"
+BINARY_VERSION = 1
+
+
+def encode_json(points, max_vectors):
+    payload = {"points": to_api_points(points), "maxVectors": max_vectors}
+
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def encode_columns(points, max_vectors):
+    payload = {
+        "time": points["time"].tolist(),
+        "x": points["x"].tolist(),
+        "y": points["y"].tolist(),
+        "maxVectors": max_vectors,
+    }
+
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def encode_binary(points, max_vectors):
+    header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, points.shape[0], max_vectors)
+
+    return b"".join([
+        header,
+        np.ascontiguousarray(points["time"], dtype="<f8").tobytes(),
+        np.ascontiguousarray(points["x"], dtype="<i4").tobytes(),
+        np.ascontiguousarray(points["y"], dtype="<i4").tobytes(),
+    ])
+
+
+def decode_binary(body):
+    """Inverse of encode_binary, returning (points, max_vectors). The columns are read without copying."""
+    points, max_vectors, end = _decode_binary_record(body, 0)
+
+    if end != len(body):
+        raise ValueError("Binary drawing body has the wrong length")
+
+    return points, max_vectors
+
+
+def decode_binary_batch(body):
+    """Decode back to back binary records into a list of (points, max_vectors)"""
+    drawings = []
+    offset = 0
+
+    while offset < len(body):
+        points, max_vectors, offset = _decode_binary_record(body, offset)
+        drawings.append((points, max_vectors))
+
+    return drawings
+
+
+def _decode_binary_record(body, offset):
+    if len(body) - offset < BINARY_HEADER.size:
+        raise ValueError("Binary drawing body has the wrong length")
+
+    magic, version, _, count, max_vectors = BINARY_HEADER.unpack_from(body, offset)
+
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError("Not a binary drawing body")
+
+    start = offset + BINARY_HEADER.size
+    end = start + count * POINT_DTYPE.itemsize
+
+    if len(body) < end:
+        raise ValueError("Binary drawing body has the wrong length")
+
+    time = np.frombuffer(body, dtype="<f8", count=count, offset=start)
+    x = np.frombuffer(body, dtype="<i4", count=count, offset=start + 8 * count)
+    y = np.frombuffer(body, dtype="<i4", count=count, offset=start + 12 * count)
+
+    return from_columns(time, x, y), max_vectors, end
+
+
+# Points encoded per streamed chunk, a few MB of Python objects for JSON points
+STREAM_CHUNK_POINTS = 1 << 13
+
+
+def point_chunks(points, chunk_points=STREAM_CHUNK_POINTS):
+    """
+    Yield a drawing as point arrays of at most chunk_points points. points is
+    a point array (sliced without copying) or any iterable of point dicts or
+    (time, x, y) rows, which is read once, a chunk at a time.
+    """
+    if isinstance(points, np.ndarray):
+        points = as_point_array(points)
+
+        for first in range(0, points.shape[0], chunk_points):
+            yield points[first:first + chunk_points]
+
+        return
+
+    points = iter(points)
+
+    while True:
+        chunk = list(itertools.islice(points, chunk_points))
+
+        if not chunk:
+            return
+
+        yield as_point_array(chunk if isinstance(chunk[0], dict) else np.asarray(chunk, dtype=np.float64))
+
+
+def _json_values(chunks):
+    # The elements of one JSON array, written a chunk at a time
+    separator = b""
+
+    for values in chunks:
+        if values:
+            yield separator + json.dumps(values, separators=(",", ":"))[1:-1].encode()
+            separator = b","
+
+
+def stream_json(chunks, max_vectors):
+    yield b'{"points":['
+    yield from _json_values(to_api_points(chunk) for chunk in chunks)
+    yield b'],"maxVectors":' + str(max_vectors).encode() + b"}"
+
+
+def stream_columns(points, max_vectors, chunk_points=STREAM_CHUNK_POINTS):
+    """Columnar JSON is column by column, so this needs the point array, not just chunks"""
+    for prefix, field in ((b'{"time":[', "time"), (b'],"x":[', "x"), (b'],"y":[', "y")):
+        yield prefix
+        yield from _json_values(chunk[field].tolist() for chunk in point_chunks(points, chunk_points))
+
+    yield b'],"maxVectors":' + str(max_vectors).encode() + b"}"
+
+
+def stream_binary(points, max_vectors, chunk_points=STREAM_CHUNK_POINTS):
+    """The binary header needs the point count and the columns follow each other, so this needs the point array"""
+    yield BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, points.shape[0], max_vectors)
+
+    for field, dtype in (("time", "<f8"), ("x", "<i4"), ("y", "<i4")):
+        for chunk in point_chunks(points, chunk_points):
+            yield np.ascontiguousarray(chunk[field], dtype=dtype).tobytes()
+
+
+def stream(points, max_vectors, wire_format="binary", chunk_points=STREAM_CHUNK_POINTS):
+    """
+    Stream the body for POST /drawing, returning (content type, iterator of
+    bytes).
+
+    A point array streams in every format and is validated up front. Any
+    other iterable streams as JSON points without ever being held whole,
+    validated as it is encoded, so an invalid drawing raises
+    InvalidSubmission while the body is read. The columnar and binary
+    formats need the whole drawing first and collect an iterable into a
+    point array (16 bytes per point).
+    """
+    content_type = FORMATS[wire_format][0]
+
+    if isinstance(points, np.ndarray) or wire_format != "json":
+        points = _collect(points, chunk_points)
+        # Chunk by chunk, so validating takes no more memory than encoding
+        deque(validate_chunks(point_chunks(points, chunk_points)), maxlen=0)
+        chunks = point_chunks(points, chunk_points)
+    else:
+        chunks = validate_chunks(point_chunks(points, chunk_points))
+
+    if wire_format == "json":
+        return content_type, stream_json(chunks, max_vectors)
+
+    if wire_format == "columns":
+        return content_type, stream_columns(points, max_vectors, chunk_points)
+
+    return content_type, stream_binary(points, max_vectors, chunk_points)
+
+
+def _collect(points, chunk_points):
+    if isinstance(points, np.ndarray):
+        return as_point_array(points)
+
+    chunks = list(point_chunks(points, chunk_points))
+
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=POINT_DTYPE)
+
+
+def gzip_chunks(chunks, level=5):
+    """Gzip a stream of byte chunks incrementally"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
+
+
+# Wire format name -> (content type, encoder)
+FORMATS = {
+    "json": (JSON_CONTENT_TYPE, encode_json),
+    "columns": (COLUMNS_CONTENT_TYPE, encode_columns),
+    "binary": (BINARY_CONTENT_TYPE, encode_binary),
+}
+
+
+def encode(points, max_vectors, wire_format="binary"):
+    """Encode a validated point array, returning (content type, body)"""
+    content_type, encoder = FORMATS[wire_format]
+
+    return content_type, encoder(points, max_vectors)
+
+
+def encode_batch(drawings, wire_format="binary"):
+    """
+    Encode (points, max_vectors) pairs for POST /drawings/batch, returning
+    (content type, body). Binary batches are the records back to back, the
+    JSON formats wrap the per-drawing objects in {"drawings": [...]}.
+    """
+    content_type, encoder = FORMATS[wire_format]
+    bodies = [encoder(points, max_vectors) for points, max_vectors in drawings]
+
+    if wire_format == "binary":
+        return content_type, b"".join(bodies)
+
+    return content_type, b'{"drawings":[' + b",".join(bodies) + b"]}"
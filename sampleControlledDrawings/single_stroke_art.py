@@ -1,25 +1,20 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import requests
-import json
-import math
 from datetime import datetime
 
-def generate_single_stroke_art(num_points=15000, scale=200, complexity=3):
+from fourier_artist.points import from_columns, uniform_time
+from fourier_artist.render import Canvas, hsv_gradient, pyplot, stroke_segments
+
+def generate_single_stroke_art(num_points=15000, scale=200, complexity=3, visualize=True,
+                               a=80, b=100, c=20, d=30, n_lobes=5, n_waves=8):
     """
     Generate a complex but continuous single-stroke drawing where
     the starting and ending points are the same.
     
-    Returns points in the API-expected format
-    """
-    points = []
-    
-    # Parameters for a complex continuous curve
-    a, b = 80, 100  # Base shape parameters
-    c, d = 20, 30   # Modulation parameters
-    n_lobes = 5     # Number of main lobes
-    n_waves = 8     # Number of waves per lobe
+    a, b shape the base curve, c, d its modulation, n_lobes is the number of
+    main lobes and n_waves the number of waves per lobe.
     
+    Returns points as a fourier_artist.points array
+    """
     # Use parametric equations to ensure a continuous closed curve
     t = np.linspace(0, 2*np.pi, num_points)
     
@@ -46,50 +41,43 @@ def generate_single_stroke_art(num_points=15000, scale=200, complexity=3):
     x = x * scale / 200
     y = y * scale / 200
     
-    # Create the API points (ensuring continuous path in time order)
-    for i in range(num_points):
-        # Time must start at 0 and increase sequentially
-        time = i / (num_points - 1)
-        
-        # Add point to the list for API
-        points.append({"time": time, "x": int(x[i]), "y": int(y[i])})
+    # Create the API points (time must start at 0 and increase sequentially)
+    points = from_columns(uniform_time(num_points), x, y)
     
     # Ensure the curve is closed (last point = first point)
     points[-1]["x"] = points[0]["x"]
     points[-1]["y"] = points[0]["y"]
     
     # Create PNG visualization
-    create_visualization(points, scale)
+    if visualize:
+        create_visualization(points, scale)
     
     return points
 
-def create_visualization(points, scale):
-    """Create a visualization of the drawing and save as PNG"""
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    filename = f"single_stroke_art_{timestamp}.png"
+def create_visualization(points, scale, filename=None, dpi=300):
+    """Create a visualization of the drawing and save as PNG (timestamped name by default)"""
+    if filename is None:
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        filename = f"single_stroke_art_{timestamp}.png"
+    
+    plt = pyplot()
+    from matplotlib.collections import LineCollection
     
-    x_vals = [p["x"] for p in points]
-    y_vals = [p["y"] for p in points]
+    x_vals = points["x"]
+    y_vals = points["y"]
     
     # Create a figure with a gradient background
     fig = plt.figure(figsize=(10, 10), facecolor='black')
     ax = fig.add_subplot(111)
     
-    # Create colored line segments that transition along the path
-    points_array = np.array(list(zip(x_vals, y_vals)))
-    
-    # Create a colorful visualization with gradient colors
-    segments = []
-    colors = []
-    for i in range(len(points)-1):
-        segments.append([points_array[i], points_array[i+1]])
-        # Color based on position in the drawing (creates a rainbow effect)
-        colors.append(i/len(points))
+    # Colored line segments between consecutive points, colored by position
+    # in the drawing (creates a rainbow effect)
+    segments = stroke_segments(x_vals, y_vals)
+    colors = np.arange(len(points) - 1) / len(points)
     
     # Plot the segments with a color gradient
-    from matplotlib.collections import LineCollection
     lc = LineCollection(segments, cmap='hsv', linewidth=2)
-    lc.set_array(np.array(colors))
+    lc.set_array(colors)
     ax.add_collection(lc)
     
     # Mark the starting point
@@ -97,63 +85,33 @@ def create_visualization(points, scale):
     
     # Set plot properties
     margin = scale * 0.2
-    ax.set_xlim(min(x_vals) - margin, max(x_vals) + margin)
-    ax.set_ylim(min(y_vals) - margin, max(y_vals) + margin)
+    ax.set_xlim(x_vals.min() - margin, x_vals.max() + margin)
+    ax.set_ylim(y_vals.min() - margin, y_vals.max() + margin)
     ax.set_aspect('equal')
     ax.set_title("Single Stroke Art", color='white', fontsize=16)
     ax.set_axis_off()
     
     # Save as PNG
-    plt.savefig(filename, dpi=300, bbox_inches='tight', facecolor='black')
+    plt.savefig(filename, dpi=dpi, bbox_inches='tight', facecolor='black')
     print(f"Saved visualization as {filename}")
     plt.close()
     
     return filename
 
-def send_drawing(points, max_vectors=150, api_url="http://localhost:8081"):
-    endpoint = f"{api_url}/drawing"
-    
-    # Prepare the request payload
-    payload = {
-        "points": points,
-        "maxVectors": max_vectors
-    }
-    
-    try:
-        # Send the POST request
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(endpoint, json=payload, headers=headers)
-        response.raise_for_status()  # Raise exception for HTTP errors
-        
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error sending request: {e}")
-        if hasattr(e, 'response') and e.response:
-            print(f"Response status code: {e.response.status_code}")
-            print(f"Response body: {e.response.text}")
-        return None
+def create_preview(points, filename=None, size=1000):
+    """Render the drawing with the NumPy rasterizer, much faster than create_visualization"""
+    if filename is None:
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        filename = f"single_stroke_art_{timestamp}_preview.png"
+    
+    canvas = Canvas.fit(points["x"], points["y"], size=size)
+    canvas.polyline(points["x"], points["y"], hsv_gradient(len(points) - 1), width=max(size // 500, 1))
+    canvas.save(filename)
+    print(f"Saved preview as {filename}")
+    
+    return filename
 
 if __name__ == "__main__":
-    # Install matplotlib if not already installed
-    try:
-        import matplotlib
-    except ImportError:
-        import pip
-        pip.main(['install', 'matplotlib'])
-        print("Installed matplotlib for visualization")
-    
-    # Generate the single stroke drawing
-    print("Generating 15000 points for a complex single-stroke drawing...")
-    points = generate_single_stroke_art(num_points=15000, scale=250, complexity=3)
-    
-    # Send the drawing to the API with higher vector count for better detail
-    print("Sending drawing to API...")
-    result = send_drawing(points, max_vectors=200)
-    
-    if result:
-        print("Success! API response:")
-        print(json.dumps(result, indent=2))
-        print(f"Drawing ID: {result.get('id')}")
-        print(f"Visit http://localhost:3000 to see your single stroke art")
-    else:
-        print("Failed to send drawing to API")
+    # Same as python -m fourier_artist single_stroke
+    from fourier_artist.cli import script_main
+    script_main("single_stroke")
@@ -1,98 +1,83 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import requests
-import json
-import os
-import math
 from datetime import datetime
 
+from fourier_artist.points import from_columns, uniform_time
+from fourier_artist.render import Canvas, pyplot
+
 def superformula(phi, a, b, m, n1, n2, n3):
     """
-    Calculates the superformula value for a given angle phi.
+    Calculates the superformula value for the angles phi.
     The superformula can generate a wide variety of natural-looking shapes.
+    Works on scalars and on NumPy arrays (parameters broadcast against phi).
     """
-    t1 = abs(math.cos(m * phi / 4) / a)
-    t2 = abs(math.sin(m * phi / 4) / b)
-    return math.pow(t1**n2 + t2**n3, -1/n1)
+    t1 = np.abs(np.cos(m * phi / 4) / a)
+    t2 = np.abs(np.sin(m * phi / 4) / b)
+    return np.power(t1**n2 + t2**n3, -1/n1)
 
-def generate_complex_drawing(num_points=15000, scale=200):
+def generate_complex_drawing(num_points=15000, scale=200, visualize=True):
     """
     Generate a complex drawing using multiple superformulas
-    Returns points in the API-expected format
+    Returns points as a fourier_artist.points array
     """
-    points = []
-    
-    # Create several layers with different parameters
-    layers = [
-        # Main shape
-        {"a": 1, "b": 1, "m": 6, "n1": 1, "n2": 7, "n3": 8, "weight": 1.0, "color": "blue"},
-        # First variation
-        {"a": 1, "b": 1, "m": 3, "n1": 2, "n2": 7, "n3": 4, "weight": 0.5, "color": "red"},
-        # Second variation
-        {"a": 1, "b": 1, "m": 5, "n1": 2, "n2": 13, "n3": 8, "weight": 0.3, "color": "green"},
-        # Animation components
-        {"a": 1, "b": 1, "m": 2, "n1": 0.7, "n2": 7, "n3": 15, "weight": 0.2, "color": "purple"}
-    ]
-    
-    # For visualization
-    vis_points = []
-    for layer in layers:
-        layer_points_x = []
-        layer_points_y = []
-        vis_points.append((layer_points_x, layer_points_y, layer["color"]))
-    
-    # Generate combined points for all layers
-    phi_values = np.linspace(0, 2 * np.pi, num_points)
-    
-    for i, phi in enumerate(phi_values):
-        x_combined = 0
-        y_combined = 0
-        
-        for j, layer in enumerate(layers):
-            # Calculate radius using superformula
-            r = superformula(
-                phi, 
-                layer["a"], 
-                layer["b"], 
-                layer["m"], 
-                layer["n1"], 
-                layer["n2"], 
-                layer["n3"]
-            ) * scale * layer["weight"]
-            
-            # Convert polar to cartesian coordinates
-            x = r * np.cos(phi)
-            y = r * np.sin(phi)
-            
-            # Add time-based animation (makes the drawing more dynamic)
-            time_factor = i / num_points
-            animation_factor = np.sin(time_factor * 2 * np.pi * 2) * 20
-            x += animation_factor * np.sin(phi * layer["m"])
-            y += animation_factor * np.cos(phi * layer["m"])
-            
-            # Add to combined point
-            x_combined += x
-            y_combined += y
-            
-            # Save for visualization
-            vis_points[j][0].append(x)
-            vis_points[j][1].append(y)
-        
-        # Time must start at 0 and increase sequentially
-        time = i / (num_points - 1)
-        
-        # Add combined point to the list for API
-        points.append({"time": time, "x": int(x_combined), "y": int(y_combined)})
+    vis_points, points = generate_layers(num_points, scale)
     
     # Create PNG visualization
-    create_visualization(vis_points, points, scale)
+    if visualize:
+        create_visualization(vis_points, points, scale)
     
     return points
 
-def create_visualization(vis_points, combined_points, scale):
-    """Create a visualization of the drawing and save as PNG"""
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    filename = f"superformula_art_{timestamp}.png"
+# The layers of the drawing, each with its own superformula parameters
+DEFAULT_LAYERS = [
+    # Main shape
+    {"a": 1, "b": 1, "m": 6, "n1": 1, "n2": 7, "n3": 8, "weight": 1.0, "color": "blue"},
+    # First variation
+    {"a": 1, "b": 1, "m": 3, "n1": 2, "n2": 7, "n3": 4, "weight": 0.5, "color": "red"},
+    # Second variation
+    {"a": 1, "b": 1, "m": 5, "n1": 2, "n2": 13, "n3": 8, "weight": 0.3, "color": "green"},
+    # Animation components
+    {"a": 1, "b": 1, "m": 2, "n1": 0.7, "n2": 7, "n3": 15, "weight": 0.2, "color": "purple"}
+]
+
+def generate_layers(num_points=15000, scale=200, layers=DEFAULT_LAYERS):
+    """
+    Evaluate every superformula layer (DEFAULT_LAYERS unless others are given).
+    Returns (vis_points, points): the (x, y, color) of each layer and their sum as a point array
+    """
+    # One row per layer, so every layer is evaluated over all angles at once
+    def column(key):
+        return np.array([layer[key] for layer in layers], dtype=np.float64)[:, np.newaxis]
+    
+    m = column("m")
+    phi = np.linspace(0, 2 * np.pi, num_points)
+    
+    # Calculate radius using superformula
+    r = superformula(phi, column("a"), column("b"), m, column("n1"), column("n2"), column("n3"))
+    r = r * scale * column("weight")
+    
+    # Convert polar to cartesian coordinates
+    x = r * np.cos(phi)
+    y = r * np.sin(phi)
+    
+    # Add time-based animation (makes the drawing more dynamic)
+    time_factor = np.arange(num_points) / num_points
+    animation_factor = np.sin(time_factor * 2 * np.pi * 2) * 20
+    x += animation_factor * np.sin(phi * m)
+    y += animation_factor * np.cos(phi * m)
+    
+    # Layers are kept for the visualization, their sum is the drawing
+    vis_points = [(x[j], y[j], layer["color"]) for j, layer in enumerate(layers)]
+    points = from_columns(uniform_time(num_points), x.sum(axis=0), y.sum(axis=0))
+    
+    return vis_points, points
+
+def create_visualization(vis_points, combined_points, scale, filename=None, dpi=300):
+    """Create a visualization of the drawing and save as PNG (timestamped name by default)"""
+    if filename is None:
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        filename = f"superformula_art_{timestamp}.png"
+    
+    plt = pyplot()
     
     plt.figure(figsize=(10, 10), facecolor='black')
     
@@ -101,9 +86,7 @@ def create_visualization(vis_points, combined_points, scale):
         plt.plot(x_vals, y_vals, color=color, alpha=0.5, linewidth=0.8)
     
     # Plot combined points
-    combined_x = [p["x"] for p in combined_points]
-    combined_y = [p["y"] for p in combined_points]
-    plt.plot(combined_x, combined_y, color='white', linewidth=1.5)
+    plt.plot(combined_points["x"], combined_points["y"], color='white', linewidth=1.5)
     
     # Set plot properties
     plt.axis('equal')
@@ -114,56 +97,32 @@ def create_visualization(vis_points, combined_points, scale):
     plt.axis('off')
     
     # Save as PNG
-    plt.savefig(filename, dpi=300, bbox_inches='tight', facecolor='black')
+    plt.savefig(filename, dpi=dpi, bbox_inches='tight', facecolor='black')
     print(f"Saved visualization as {filename}")
     plt.close()
     
     return filename
 
-def send_drawing(points, max_vectors=150, api_url="http://localhost:8081"):
-    endpoint = f"{api_url}/drawing"
-    
-    # Prepare the request payload
-    payload = {
-        "points": points,
-        "maxVectors": max_vectors
-    }
-    
-    try:
-        # Send the POST request
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(endpoint, json=payload, headers=headers)
-        response.raise_for_status()  # Raise exception for HTTP errors
-        
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error sending request: {e}")
-        if hasattr(e, 'response') and e.response:
-            print(f"Response status code: {e.response.status_code}")
-            print(f"Response body: {e.response.text}")
-        return None
+def create_preview(vis_points, combined_points, scale, filename=None, size=1000):
+    """Render the drawing with the NumPy rasterizer, much faster than create_visualization"""
+    if filename is None:
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        filename = f"superformula_art_{timestamp}_preview.png"
+    
+    width = max(size // 500, 1)
+    canvas = Canvas((-scale*1.5, scale*1.5, -scale*1.5, scale*1.5), size=size, margin=0)
+    
+    # Each layer with its color, then the combined points on top
+    for x_vals, y_vals, color in vis_points:
+        canvas.polyline(x_vals, y_vals, color, width=width, alpha=0.5)
+    
+    canvas.polyline(combined_points["x"], combined_points["y"], "white", width=2 * width)
+    canvas.save(filename)
+    print(f"Saved preview as {filename}")
+    
+    return filename
 
 if __name__ == "__main__":
-    # Install matplotlib if not already installed
-    try:
-        import matplotlib
-    except ImportError:
-        import pip
-        pip.main(['install', 'matplotlib'])
-        print("Installed matplotlib for visualization")
-    
-    # Generate the complex drawing
-    print("Generating 15000 points for a complex superformula drawing...")
-    points = generate_complex_drawing(num_points=15000)
-    
-    # Send the drawing to the API with higher vector count for better detail
-    print("Sending drawing to API...")
-    result = send_drawing(points, max_vectors=150)
-    
-    if result:
-        print("Success! API response:")
-        print(json.dumps(result, indent=2))
-        print(f"Drawing ID: {result.get('id')}")
-        print(f"Visit http://localhost:3000 to see your complex drawing")
-    else:
-        print("Failed to send drawing to API")
+    # Same as python -m fourier_artist superformula
+    from fourier_artist.cli import script_main
+    script_main("superformula")
@@ -10,12 +10,20 @@ import (
 )
 
 func Request(method string, uri string, payload string) *Response {
+	return RequestWithHeaders(method, uri, payload, map[string]string{})
+}
+
+func RequestWithHeaders(method string, uri string, payload string, headers map[string]string) *Response {
 	e := app.New()
 
 	payloadReader := strings.NewReader(payload)
 	request := httptest.NewRequest(method, uri, payloadReader)
 	responseRecorder := httptest.NewRecorder()
 
+	for name, value := range headers {
+		request.Header.Set(name, value)
+	}
+
 	e.ServeHTTP(responseRecorder, request)
 
 	response := &Response{responseRecorder}
@@ -31,6 +39,10 @@ func Post(uri string, payload string) *Response {
 	return Request(echo.POST, uri, payload)
 }
 
+func PostWithHeaders(uri string, payload string, headers map[string]string) *Response {
+	return RequestWithHeaders(echo.POST, uri, payload, headers)
+}
+
 type Response struct {
 	ResponseRecorder *httptest.ResponseRecorder
 }